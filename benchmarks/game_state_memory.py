@@ -0,0 +1,63 @@
+"""Memory held by game states kept alive at the same time (search trees, replay buffers)
+
+    python -m benchmarks.game_state_memory [nb_state]
+
+Prints the bytes per game state for
+  - restored  : states restored from serialization (nothing is shared)
+  - copied    : copies made by deepcopy_game_state (structure is shared)
+  - cards     : Card objects of the hole cards and community cards of a state
+Needs python3 (tracemalloc).
+"""
+import sys
+import tracemalloc
+
+from pypokerengine.api.emulator import Emulator
+from pypokerengine.engine.table import Table
+from pypokerengine.utils.game_state_utils import deepcopy_game_state
+
+NB_PLAYER = 6
+NB_STATE = 10000
+
+
+def gen_flop_game_state():
+    emulator = Emulator()
+    emulator.set_game_rule(NB_PLAYER, 10, 5, 0)
+    players_info = {"uuid-%d" % i: {"name": "p%d" % i, "stack": 100} for i in range(NB_PLAYER)}
+    game_state = emulator.generate_initial_game_state(players_info)
+    game_state, _ = emulator.start_new_round(game_state, headless=True)
+    while game_state["street"] == 0:
+        game_state, _ = emulator.apply_action(game_state, "call", 10, headless=True)
+    return game_state
+
+
+def restore_state(game_state):
+    state = dict(game_state)
+    state["table"] = Table.deserialize(game_state["table"].serialize())
+    return state
+
+
+def materialize_cards(game_state):
+    table = game_state["table"]
+    return [player.hole_card for player in table.seats.players] + [table.get_community_card()]
+
+
+def measure(gen_object, nb_state):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [gen_object() for _ in range(nb_state)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / float(len(objects))
+
+
+def main(nb_state):
+    game_state = gen_flop_game_state()
+    restored = restore_state(game_state)
+    print("%d players on the flop, %d states" % (NB_PLAYER, nb_state))
+    print("restored : %8.1f bytes/state" % measure(lambda: restore_state(game_state), nb_state))
+    print("copied   : %8.1f bytes/state" % measure(lambda: deepcopy_game_state(restored), nb_state))
+    print("cards    : %8.1f bytes/state" % measure(lambda: materialize_cards(restored), nb_state))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else NB_STATE)
@@ -1,7 +1,7 @@
 from pypokerengine.players import BasePokerPlayer
 from pypokerengine.api.emulator import Emulator
 from pypokerengine.utils.card_utils import gen_cards
-from pypokerengine.utils.game_state_utils import restore_game_state, attach_hole_card, attach_hole_card_from_deck
+from pypokerengine.utils.game_state_utils import GameStateTemplate, attach_hole_cards_from_deck
 
 NB_SIMULATION = 1000
 DEBUG_MODE = True
@@ -33,11 +33,12 @@ class EmulatorPlayer(BasePokerPlayer):
         action_results = [0 for i in range(len(try_actions))]
 
         log("hole_card of emulator player is %s" % hole_card)
+        template = GameStateTemplate(round_state)
         for action in try_actions:
             self.my_model.set_action(action)
             simulation_results = []
             for i in range(NB_SIMULATION):
-                game_state = self._setup_game_state(round_state, hole_card)
+                game_state = self._setup_game_state(template, hole_card)
                 round_finished_state, _events = self.emulator.run_until_round_finish(game_state)
                 my_stack = [player for player in round_finished_state['table'].seats.players if player.uuid == self.uuid][0].stack
                 simulation_results.append(my_stack)
@@ -50,16 +51,9 @@ class EmulatorPlayer(BasePokerPlayer):
         self.my_model.set_action(best_action)
         return self.my_model.declare_action(valid_actions, hole_card, round_state)
 
-    def _setup_game_state(self, round_state, my_hole_card):
-        game_state = restore_game_state(round_state)
-        game_state['table'].deck.shuffle()
-        player_uuids = [player_info['uuid'] for player_info in round_state['seats']]
-        for uuid in player_uuids:
-            if uuid == self.uuid:
-                game_state = attach_hole_card(game_state, uuid, gen_cards(my_hole_card))  # attach my holecard
-            else:
-                game_state = attach_hole_card_from_deck(game_state, uuid)  # attach opponents holecard at random
-        return game_state
+    # attach my holecard and opponents holecard at random (on a copy of template)
+    def _setup_game_state(self, template, my_hole_card):
+        return attach_hole_cards_from_deck(template.game_state, {self.uuid: gen_cards(my_hole_card)})
 
     def receive_round_start_message(self, round_count, hole_card, seats):
         pass
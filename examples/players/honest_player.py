@@ -1,5 +1,5 @@
 from pypokerengine.players import BasePokerPlayer
-from pypokerengine.utils.card_utils import gen_cards, estimate_hole_card_win_rate
+from pypokerengine.utils.card_utils import gen_cards, estimate_hole_card_win_rate_adaptive
 
 NB_SIMULATION = 1000
 
@@ -7,11 +7,12 @@ class HonestPlayer(BasePokerPlayer):
 
     def declare_action(self, valid_actions, hole_card, round_state):
         community_card = round_state['community_card']
-        win_rate = estimate_hole_card_win_rate(
-                nb_simulation=NB_SIMULATION,
+        win_rate, _, _ = estimate_hole_card_win_rate_adaptive(
+                max_simulation=NB_SIMULATION,
                 nb_player=self.nb_player,
                 hole_card=gen_cards(hole_card),
-                community_card=gen_cards(community_card)
+                community_card=gen_cards(community_card),
+                threshold=1.0 / self.nb_player
                 )
         if win_rate >= 1.0 / self.nb_player:
             action = valid_actions[1]  # fetch CALL action info
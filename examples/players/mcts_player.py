@@ -0,0 +1,28 @@
+from pypokerengine.players import BasePokerPlayer
+from pypokerengine.api.mcts import MCTS
+
+TIME_LIMIT = 0.5  # seconds to search each action
+
+class MCTSPlayer(BasePokerPlayer):
+
+    def __init__(self, time_limit=TIME_LIMIT, seed=None):
+        self.time_limit = time_limit
+        self.mcts = MCTS(seed=seed)
+
+    def declare_action(self, valid_actions, hole_card, round_state):
+        return self.mcts.search_round_state(round_state, hole_card, time_limit=self.time_limit)
+
+    def receive_game_start_message(self, game_info):
+        pass
+
+    def receive_round_start_message(self, round_count, hole_card, seats):
+        pass
+
+    def receive_street_start_message(self, street, round_state):
+        pass
+
+    def receive_game_update_message(self, new_action, round_state):
+        pass
+
+    def receive_round_result_message(self, winners, hand_info, round_state):
+        pass
@@ -1,3 +1,5 @@
+import random
+
 from pypokerengine.engine.table import Table
 from pypokerengine.engine.seats import Seats
 from pypokerengine.engine.card import Card
@@ -14,10 +16,13 @@ from pypokerengine.utils.game_state_utils import deepcopy_game_state
 
 class Emulator(object):
 
-    def __init__(self):
+    # With seed, every deck shuffled by this emulator (in generate_initial_game_state
+    # and start_new_round, also of restored game states) uses a random.Random of the seed.
+    def __init__(self, seed=None):
         self.game_rule = {}
         self.blind_structure = {}
         self.players_holder = {}
+        self.rng = random.Random(seed) if seed is not None else None
 
     def set_game_rule(self, player_num, max_round, small_blind_amount, ante_amount):
         self.game_rule["player_num"] = player_num
@@ -37,7 +42,7 @@ class Emulator(object):
         return self.players_holder[uuid]
 
     def generate_initial_game_state(self, players_info):
-        table = Table()
+        table = Table(rng=self.rng)
         for uuid, info in players_info.items():
             table.seats.sitdown(Player(uuid, info["stack"], info["name"]))
 
@@ -56,24 +61,31 @@ class Emulator(object):
         sb_amount = game_state["small_blind_amount"]
         return ActionChecker.legal_actions(players, player_pos, sb_amount)
 
-    def apply_action(self, game_state, action, bet_amount=0):
+    # headless=True skips building messages (so no events are returned) which
+    # is enough for rollouts interested only in the resulting game_state.
+    def apply_action(self, game_state, action, bet_amount=0, headless=False):
         if game_state["street"] == Const.Street.FINISHED:
-            game_state, events = self._start_next_round(game_state)
-        updated_state, messages = RoundManager.apply_action(game_state, action, bet_amount)
+            game_state, events = self._start_next_round(game_state, headless)
+        updated_state, messages = RoundManager.apply_action(game_state, action, bet_amount, headless=headless)
+        if headless: return updated_state, []
         events = [self.create_event(message[1]["message"]) for message in messages]
         events = [e for e in events if e]
         if self._is_last_round(updated_state, self.game_rule):
             events += self._generate_game_result_event(updated_state)
         return updated_state, events
 
-    def _start_next_round(self, game_state):
+    def _start_next_round(self, game_state, headless=False):
         game_finished = game_state["round_count"] == self.game_rule["max_round"]
-        game_state, events = self.start_new_round(game_state)
-        if Event.GAME_FINISH == events[-1]["type"] or game_finished:
+        game_state, events = self.start_new_round(game_state, headless)
+        if headless:
+            game_finished |= self._is_game_finished(game_state)
+        else:
+            game_finished |= Event.GAME_FINISH == events[-1]["type"]
+        if game_finished:
             raise Exception("Failed to apply action. Because game is already finished.")
         return game_state, events
 
-    def run_until_round_finish(self, game_state):
+    def run_until_round_finish(self, game_state, headless=False):
         mailbox = []
         while game_state["street"] != Const.Street.FINISHED:
             next_player_pos = game_state["next_player"]
@@ -82,15 +94,17 @@ class Emulator(object):
             msg = MessageBuilder.build_ask_message(next_player_pos, game_state)["message"]
             action, amount = next_player_algorithm.declare_action(\
                     msg["valid_actions"], msg["hole_card"], msg["round_state"])
-            game_state, messages = RoundManager.apply_action(game_state, action, amount)
+            game_state, messages = RoundManager.apply_action(game_state, action, amount, headless=headless)
             mailbox += messages
+        if headless: return game_state, []
         events = [self.create_event(message[1]["message"]) for message in mailbox]
         events = [e for e in events if e]
         if self._is_last_round(game_state, self.game_rule):
             events += self._generate_game_result_event(game_state)
         return game_state, events
 
-    def run_until_game_finish(self, game_state):
+    def run_until_game_finish(self, game_state, headless=False):
+        if headless: return self._run_until_game_finish_headless(game_state)
         mailbox = []
         event_box= []
         if game_state["street"] != Const.Street.FINISHED:
@@ -106,20 +120,30 @@ class Emulator(object):
         event_box = [e for e in event_box if e]
         return game_state, event_box
 
+    def _run_until_game_finish_headless(self, game_state):
+        if game_state["street"] != Const.Street.FINISHED:
+            game_state, _ = self.run_until_round_finish(game_state, headless=True)
+        while not self._is_last_round(game_state, self.game_rule):
+            game_state, _ = self.start_new_round(game_state, headless=True)
+            if self._is_game_finished(game_state): break
+            game_state, _ = self.run_until_round_finish(game_state, headless=True)
+        return game_state, []
+
 
-    def start_new_round(self, game_state):
+    def start_new_round(self, game_state, headless=False):
         round_count = game_state["round_count"] + 1
         ante, sb_amount = self.game_rule["ante"], self.game_rule["sb_amount"]
         deepcopy = deepcopy_game_state(game_state)
         deepcopy_table = deepcopy["table"]
+        if self.rng is not None: deepcopy_table.deck.rng = self.rng
         deepcopy_table.shift_dealer_btn()
 
         ante, sb_amount = update_blind_level(ante, sb_amount, round_count, self.blind_structure)
         deepcopy_table = exclude_short_of_money_players(deepcopy_table, ante, sb_amount)
-        is_game_finished = len([1 for p in deepcopy_table.seats.players if p.is_active()])==1
-        if is_game_finished: return deepcopy, self._generate_game_result_event(deepcopy)
+        if self._is_game_finished(deepcopy):
+            return deepcopy, [] if headless else self._generate_game_result_event(deepcopy)
 
-        new_state, messages = RoundManager.start_new_round(round_count, sb_amount, ante, deepcopy_table)
+        new_state, messages = RoundManager.start_new_round(round_count, sb_amount, ante, deepcopy_table, headless)
         events = [self.create_event(message[1]["message"]) for message in messages]
         events = [e for e in events if e]
         return new_state, events
@@ -135,6 +159,18 @@ class Emulator(object):
         if MessageBuilder.ROUND_RESULT_MESSAGE == message_type:
             return Event.create_round_finish_event(message)
 
+    # True when the round of game_state is finished and it was the last round of
+    # the game (max_round is reached or only one player has chips).
+    def is_last_round(self, game_state):
+        return self._is_last_round(game_state, self.game_rule)
+
+    # True when only one player is left (e.g. start_new_round excluded the others).
+    def is_game_finished(self, game_state):
+        return self._is_game_finished(game_state)
+
+    def _is_game_finished(self, game_state):
+        return len([1 for p in game_state["table"].seats.players if p.is_active()])==1
+
     def _is_last_round(self, game_state, game_rule):
         is_round_finished = game_state["street"] == Const.Street.FINISHED
         is_final_round = game_state["round_count"] == game_rule["max_round"]
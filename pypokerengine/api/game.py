@@ -1,34 +1,122 @@
+import multiprocessing
+import random
+
 from pypokerengine.engine.dealer import Dealer
 from pypokerengine.players import BasePokerPlayer
 
-def setup_config(max_round, initial_stack, small_blind_amount, ante=0):
-    return Config(max_round, initial_stack, small_blind_amount, ante)
+def setup_config(max_round, initial_stack, small_blind_amount, ante=0, seed=None):
+    return Config(max_round, initial_stack, small_blind_amount, ante, seed)
+
+# seed overrides config.seed. The same seed, config and player decisions play the same game.
+def start_poker(config, verbose=2, seed=None):
+    dealer = _setup_dealer(config, verbose, seed)
+    result_message = dealer.start_game(config.max_round)
+    return _format_result(result_message, dealer)
+
+# Plays the game of start_poker again from its seed and result["action_log"]
+# without asking the registered algorithms for actions.
+def replay_poker(config, action_log, verbose=0, seed=None):
+    dealer = _setup_dealer(config, verbose, seed)
+    if dealer.rng is None:
+        raise ValueError("seed is needed to replay the game")
+    result_message = dealer.replay_game(config.max_round, action_log)
+    return _format_result(result_message, dealer, action_log)
+
+# Plays n_games independent games on a pool of workers processes and returns the
+# stack delta (final stack - initial stack) statistics of each player name :
+#   { name: { "n": games, "mean": mean, "variance": unbiased variance } }
+# config_factory is called in the worker for every game, so each game gets new
+# player algorithms. It has to be picklable (e.g. a module level function), and
+# each player of its config needs a unique name (ValueError otherwise).
+# callback(game_index, result) receives the result of each game as it finishes.
+def run_many(config_factory, n_games, workers=None, seed=None, callback=None, with_action_log=False):
+    stats = {}
+    for game_index, result in imap_poker(config_factory, n_games, workers, seed, with_action_log):
+        if callback: callback(game_index, result)
+        for name, delta in result["stack_deltas"].items():
+            _update_stats(stats.setdefault(name, [0, 0.0, 0.0]), delta)
+    return { name: _summarize_stats(s) for name, s in stats.items() }
+
+# Yields (game_index, result) in the order the games finish. result is the one of
+# start_poker with "seed" of the game and "stack_deltas" by player name.
+# "action_log" is kept only when with_action_log is True.
+# Game seeds are drawn from seed, so each game can be replayed by replay_poker.
+# The global random module (e.g. of RandomPlayer) is seeded by the game seed before
+# each game, so seed reproduces the games whatever the number of workers.
+# workers=1 plays the games in this process.
+def imap_poker(config_factory, n_games, workers=None, seed=None, with_action_log=False):
+    rng = random.Random(seed)
+    tasks = ((config_factory, game_index, rng.getrandbits(32), with_action_log) for game_index in range(n_games))
+    if workers == 1:
+        for task in tasks: yield _play_game(task)
+        return
+    workers = workers or multiprocessing.cpu_count()
+    chunksize = max(1, min(64, n_games // (workers * 8)))
+    pool = multiprocessing.Pool(workers)
+    try:
+        for game_result in pool.imap_unordered(_play_game, tasks, chunksize):
+            yield game_result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
 
-def start_poker(config, verbose=2):
+def _play_game(task):
+    config_factory, game_index, seed, with_action_log = task
+    random.seed(seed)
+    config = config_factory()
+    _check_unique_names(config)
+    result = start_poker(config, verbose=0, seed=seed)
+    result["seed"] = seed
+    result["stack_deltas"] = { player["name"]: player["stack"] - config.initial_stack for player in result["players"] }
+    if not with_action_log: del result["action_log"]
+    return game_index, result
+
+# stack_deltas and the stats are keyed by name, so players of the same name would be merged
+def _check_unique_names(config):
+    names = [info["name"] for info in config.players_info]
+    duplicated = sorted(set([name for name in names if names.count(name) > 1]))
+    if duplicated:
+        raise ValueError("Each player needs a unique name to be counted separately (duplicated: %s)" % ", ".join(duplicated))
+
+# stats format : [n, mean, sum of squared deviations] (Welford's algorithm)
+def _update_stats(stats, value):
+    stats[0] += 1
+    diff = value - stats[1]
+    stats[1] += diff / float(stats[0])
+    stats[2] += diff * (value - stats[1])
+
+def _summarize_stats(stats):
+    n, mean, m2 = stats
+    return { "n": n, "mean": mean, "variance": m2 / (n - 1) if n > 1 else 0.0 }
+
+def _setup_dealer(config, verbose, seed):
     config.validation()
-    dealer = Dealer(config.sb_amount, config.initial_stack, config.ante)
+    seed = config.seed if seed is None else seed
+    dealer = Dealer(config.sb_amount, config.initial_stack, config.ante, seed)
     dealer.set_verbose(verbose)
     dealer.set_blind_structure(config.blind_structure)
     for info in config.players_info:
         dealer.register_player(info["name"], info["algorithm"])
-    result_message = dealer.start_game(config.max_round)
-    return _format_result(result_message)
+    return dealer
 
-def _format_result(result_message):
+def _format_result(result_message, dealer, action_log=None):
     return {
             "rule": result_message["message"]["game_information"]["rule"],
-            "players": result_message["message"]["game_information"]["seats"]
+            "players": result_message["message"]["game_information"]["seats"],
+            "action_log": dealer.action_log if action_log is None else action_log
             }
 
 class Config(object):
 
-    def __init__(self, max_round, initial_stack, sb_amount, ante):
+    def __init__(self, max_round, initial_stack, sb_amount, ante, seed=None):
         self.players_info = []
         self.blind_structure = {}
         self.max_round = max_round
         self.initial_stack = initial_stack
         self.sb_amount = sb_amount
         self.ante = ante
+        self.seed = seed
 
     def register_player(self, name, algorithm):
         if not isinstance(algorithm, BasePokerPlayer):
@@ -0,0 +1,198 @@
+import math
+import random
+import time
+
+from pypokerengine.engine.action_checker import ActionChecker
+from pypokerengine.engine.poker_constants import PokerConstants as Const
+from pypokerengine.engine.round_manager import RoundManager
+from pypokerengine.engine.message_builder import MessageBuilder
+from pypokerengine.utils.card_utils import gen_cards
+from pypokerengine.utils.game_state_utils import restore_game_state, attach_hole_card,\
+        attach_hole_cards_from_deck, deepcopy_game_state
+
+
+class MCTS(object):
+    """Information set Monte Carlo tree search over the rest of a round
+
+    search(game_state) looks for the action of the player who is asked in
+    game_state (the searcher). Each iteration
+        1. samples a determinization: the hole cards of the other players and
+           the order of the deck are dealt at random from the cards which the
+           searcher cannot see (one copy of the root state)
+        2. selects actions by UCT from the root down to a state which is not in
+           the tree yet, and adds it to the tree
+        3. plays the round to the end by rollout_policy
+        4. backs up the stack change of every seat (divided by the chips in play)
+    Actions are applied on the sampled state in place, so nothing else is copied.
+
+    The tree is a transposition table (self.nodes) keyed by the public state
+    (street, next player, community cards and chips of every seat). Action
+    sequences which lead to the same state share the node, and a node is shared
+    by every determinization (the hole cards of the opponents are not in the key).
+
+    action_abstraction(game_state) returns the (action, amount) pairs tried at a
+    state (see gen_abstract_actions). rollout_policy(game_state, actions, rng)
+    returns the (action, amount) to apply in rollouts (see random_rollout_policy,
+    call_rollout_policy and gen_player_rollout_policy).
+    """
+
+    def __init__(self, exploration=1.4, rollout_policy=None, action_abstraction=None, seed=None):
+        self.exploration = exploration
+        self.rollout_policy = rollout_policy or random_rollout_policy
+        self.action_abstraction = action_abstraction or gen_abstract_actions
+        self.rng = random.Random(seed)
+        self.nodes = {}
+        self.root_actions = []
+        self.root_key = None
+
+    # round_state and hole_card are the arguments of BasePokerPlayer.declare_action
+    def search_round_state(self, round_state, hole_card, iterations=None, time_limit=None):
+        game_state = restore_game_state(round_state)
+        uuid = round_state["seats"][round_state["next_player"]]["uuid"]
+        game_state = attach_hole_card(game_state, uuid, gen_cards(hole_card))
+        return self.search(game_state, iterations, time_limit)
+
+    # Runs iterations until either budget (number of iterations or seconds) runs out
+    # and returns the most visited (action, amount) of the root.
+    def search(self, game_state, iterations=None, time_limit=None):
+        if iterations is None and time_limit is None:
+            raise ValueError("Pass iterations or time_limit to bound the search")
+        if game_state["street"] == Const.Street.FINISHED:
+            raise ValueError("The round of passed game_state is already finished")
+        root = self.__gen_root_state(game_state)
+        players = root["table"].seats.players
+        reward_scale = float(sum([player.stack + player.pay_info.amount for player in players]))
+        self.nodes = {}
+        self.root_key = _gen_info_set_key(root)
+        self.root_actions = self.action_abstraction(root)
+        deadline = time.time() + time_limit if time_limit is not None else None
+        count = 0
+        while iterations is None or count < iterations:
+            if deadline is not None and time.time() >= deadline: break
+            self.__run_iteration(root, reward_scale)
+            count += 1
+        return self.best_action()
+
+    def best_action(self):
+        stats = self.action_stats()
+        if not stats:
+            raise ValueError("No iteration has been run")
+        action, amount, _, _ = max(stats, key=lambda stat: (stat[2], stat[3]))
+        return action, amount
+
+    # [(action, amount, visit count, mean reward)] of the root actions in the last search
+    def action_stats(self):
+        node = self.nodes.get(self.root_key)
+        if node is None: return []
+        return [(action, amount, visit, value / visit if visit else 0.0) for (action, amount), visit, value\
+                in zip(self.root_actions, node.visits, node.values)]
+
+    def __run_iteration(self, root, reward_scale):
+        state = attach_hole_cards_from_deck(root, rng=self.rng)
+        players = state["table"].seats.players
+        start_stacks = [player.stack for player in players]
+        path = []
+        while state["street"] != Const.Street.FINISHED:
+            key = _gen_info_set_key(state)
+            node = self.nodes.get(key)
+            is_new_node = node is None
+            actions = self.action_abstraction(state)
+            if is_new_node:
+                node = self.nodes[key] = _Node(len(actions))
+            action_idx = node.select(self.exploration, self.rng)
+            path.append((node, action_idx, state["next_player"]))
+            action, amount = actions[action_idx]
+            state, _ = RoundManager.apply_action(state, action, amount, in_place=True, headless=True, record_undo=False)
+            if is_new_node: break
+        self.__rollout(state)
+        rewards = [(player.stack - stack) / reward_scale for player, stack in zip(players, start_stacks)]
+        for node, action_idx, player_pos in path:
+            node.update(action_idx, rewards[player_pos])
+
+    def __rollout(self, state):
+        while state["street"] != Const.Street.FINISHED:
+            action, amount = self.rollout_policy(state, self.action_abstraction(state), self.rng)
+            RoundManager.apply_action(state, action, amount, in_place=True, headless=True, record_undo=False)
+
+    # Copy of game_state where the searcher can see only its own hole card and the
+    # community cards. The other cards are in the deck to be dealt at random.
+    def __gen_root_state(self, game_state):
+        root = deepcopy_game_state(game_state)
+        table = root["table"]
+        searcher = table.seats.players[root["next_player"]]
+        if len(searcher.hole_card_ids) == 0:
+            raise ValueError('The hole card of the searching player "%s" is not attached' % searcher.uuid)
+        for player in table.seats.players:
+            if player is not searcher: player.clear_holecard()
+        visible_ids = set(searcher.hole_card_ids + table._community_card)
+        table.deck.deck = [card_id for card_id in range(1, 53) if card_id not in visible_ids]
+        return root
+
+
+class _Node(object):
+    """Statistics of the actions tried at a state (visits and sum of rewards of the asked player)"""
+
+    __slots__ = ["total", "visits", "values"]
+
+    def __init__(self, nb_action):
+        self.total = 0
+        self.visits = [0] * nb_action
+        self.values = [0.0] * nb_action
+
+    # untried action at random, then UCB1
+    def select(self, exploration, rng):
+        untried = [idx for idx, visit in enumerate(self.visits) if visit == 0]
+        if untried: return rng.choice(untried)
+        log_total = math.log(self.total)
+        ucb = lambda idx: self.values[idx] / self.visits[idx] + exploration * math.sqrt(log_total / self.visits[idx])
+        return max(range(len(self.visits)), key=ucb)
+
+    def update(self, action_idx, reward):
+        self.total += 1
+        self.visits[action_idx] += 1
+        self.values[action_idx] += reward
+
+
+# fold (only when the player has to pay to call), call, and raise by min, pot and allin amount
+def gen_abstract_actions(game_state):
+    players, player_pos = game_state["table"].seats.players, game_state["next_player"]
+    _, call, raise_ = ActionChecker.legal_actions(players, player_pos, game_state["small_blind_amount"])
+    player = players[player_pos]
+    actions = [] if call["amount"] <= player.paid_sum() else [("fold", 0)]
+    actions.append(("call", call["amount"]))
+    min_raise, max_raise = raise_["amount"]["min"], raise_["amount"]["max"]
+    if min_raise != -1:
+        pot = sum([p.pay_info.amount for p in players])
+        pot_raise = call["amount"] + pot + call["amount"] - player.paid_sum()
+        raise_amounts = [min_raise] + ([pot_raise] if min_raise < pot_raise < max_raise else []) + [max_raise]
+        actions += [("raise", amount) for amount in sorted(set(raise_amounts))]
+    return actions
+
+def random_rollout_policy(game_state, actions, rng):
+    return rng.choice(actions)
+
+# checks or calls till the showdown
+def call_rollout_policy(game_state, actions, rng):
+    return next(action for action in actions if action[0] == "call")
+
+# rollout policy which asks the BasePokerPlayer registered on emulator (e.g. an opponent model)
+def gen_player_rollout_policy(emulator):
+    def player_rollout_policy(game_state, actions, rng):
+        player_pos = game_state["next_player"]
+        uuid = game_state["table"].seats.players[player_pos].uuid
+        msg = MessageBuilder.build_ask_message(player_pos, game_state)["message"]
+        return emulator.fetch_player(uuid).declare_action(msg["valid_actions"], msg["hole_card"], msg["round_state"])
+    return player_rollout_policy
+
+# Public state which decides the rest of the round (except the cards to be dealt).
+# paid_sum, the number of actions and the last raise of the current street decide
+# legal actions and when the street ends.
+def _gen_info_set_key(game_state):
+    table = game_state["table"]
+    seats = tuple([(player.stack, player.pay_info.status, player.paid_sum(), len(player.action_histories),
+        _fetch_raise_amounts(player)) for player in table.seats.players])
+    return (game_state["street"], game_state["next_player"], tuple(table._community_card), seats)
+
+def _fetch_raise_amounts(player):
+    raise_ = player.last_raise()
+    return (raise_["amount"], raise_["add_amount"]) if raise_ else None
@@ -0,0 +1,134 @@
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # numpy is needed only by VectorEnv
+    np = None
+
+from pypokerengine.api.emulator import Emulator
+from pypokerengine.engine.action_checker import ActionChecker
+from pypokerengine.engine.poker_constants import PokerConstants as Const
+from pypokerengine.engine.round_manager import RoundManager
+from pypokerengine.utils.observation_utils import encode_game_states
+
+FOLD, CALL, RAISE = 0, 1, 2
+NB_ACTION = 3
+
+# fields of pypokerengine.utils.observation_utils which are passed as observations
+_RECORD_FIELDS = ["player", "street", "stacks", "paid", "pot", "hole_cards", "board"]
+
+
+class VectorEnv(object):
+    """N independent tables stepped together by arrays of actions
+
+    Every seat of every table is played by the caller (self play). Each step
+    applies actions[i] for the player who is asked on table i:
+        FOLD (0), CALL (1), RAISE (2) to amounts[i] (clipped into the legal
+        raise range, min raise when amounts is None)
+    Illegal actions are corrected by the engine (e.g. raise when it is not
+    allowed is treated as fold).
+
+    An episode is one game of max_round rounds. rewards[i] holds the stack
+    change of each seat over the rounds which finished in the step. A table
+    whose game finished is done and starts a new game in the same step, so
+    its observation is the one of the new game.
+
+    Observations are numpy arrays whose first axis is the table (P = nb_player).
+    The first ones are the fields of observation_utils.encode_game_states:
+        player        (N,)    int8     seat which is asked
+        street        (N,)    int8     PokerConstants.Street
+        stacks        (N, P)  float32  stack of each seat
+        paid          (N, P)  float32  chips each seat paid in this round
+        pot           (N,)    float32  sum of paid
+        hole_cards    (N, 2)  int8     card ids (see Card.to_id) of the asked player
+        board         (N, 5)  int8     card ids of community cards (0 = not dealt)
+        call_amount   (N,)    float32  amount to call
+        raise_range   (N, 2)  float32  min and max raise amount (-1 if raise is illegal)
+        legal_actions (N, 3)  bool     legal action mask of FOLD, CALL and RAISE
+    """
+
+    def __init__(self, nb_env, nb_player, max_round=1, initial_stack=100, small_blind_amount=5, ante=0, seed=None):
+        if np is None:
+            raise ImportError("numpy is required for VectorEnv")
+        if initial_stack <= small_blind_amount * 2 + ante:
+            raise ValueError("initial_stack has to be more than big blind + ante")
+        self.nb_env = nb_env
+        self.nb_player = nb_player
+        self.initial_stack = initial_stack
+        self.emulator = Emulator(seed=seed)
+        self.emulator.set_game_rule(nb_player, max_round, small_blind_amount, ante)
+        self.states = [None] * nb_env
+        self.round_start_stacks = np.zeros((nb_env, nb_player), dtype=np.float32)
+
+    def reset(self):
+        self.states = [self.__start_game(env_idx) for env_idx in range(self.nb_env)]
+        return self.observe()
+
+    # returns (observations, rewards (N, P) float32, dones (N,) bool)
+    def step(self, actions, amounts=None):
+        rewards = np.zeros((self.nb_env, self.nb_player), dtype=np.float32)
+        dones = np.zeros(self.nb_env, dtype=bool)
+        for env_idx, state in enumerate(self.states):
+            amount = None if amounts is None else amounts[env_idx]
+            action, bet_amount = self.__to_engine_action(state, actions[env_idx], amount)
+            state, _ = RoundManager.apply_action(state, action, bet_amount, headless=True)
+            self.states[env_idx] = self.__forward_finished_round(env_idx, state, rewards, dones)
+        return self.observe(), rewards, dones
+
+    def observe(self):
+        records = encode_game_states(self.states, self.nb_player)
+        obs = OrderedDict((field, np.ascontiguousarray(records[field])) for field in _RECORD_FIELDS)
+        obs["call_amount"] = np.zeros(self.nb_env, dtype=np.float32)
+        obs["raise_range"] = np.zeros((self.nb_env, 2), dtype=np.float32)
+        obs["legal_actions"] = np.zeros((self.nb_env, NB_ACTION), dtype=bool)
+        for env_idx, state in enumerate(self.states):
+            players, player_pos = state["table"].seats.players, state["next_player"]
+            _, call, raise_ = ActionChecker.legal_actions(players, player_pos, state["small_blind_amount"])
+            obs["call_amount"][env_idx] = call["amount"]
+            obs["raise_range"][env_idx] = [raise_["amount"]["min"], raise_["amount"]["max"]]
+        obs["legal_actions"][:, FOLD] = True
+        obs["legal_actions"][:, CALL] = True
+        obs["legal_actions"][:, RAISE] = obs["raise_range"][:, 0] != -1
+        return obs
+
+    def __to_engine_action(self, state, action, amount):
+        players, player_pos = state["table"].seats.players, state["next_player"]
+        _, call, raise_ = ActionChecker.legal_actions(players, player_pos, state["small_blind_amount"])
+        if action == FOLD:
+            return "fold", 0
+        elif action == CALL:
+            return "call", call["amount"]
+        elif action == RAISE:
+            min_raise, max_raise = raise_["amount"]["min"], raise_["amount"]["max"]
+            amount = min_raise if amount is None else int(min(max(amount, min_raise), max_raise))
+            return "raise", amount
+        else:
+            raise ValueError("Unknown action id [%s] is passed" % action)
+
+    # Pays rewards of the finished round and starts the next round (or a new game)
+    def __forward_finished_round(self, env_idx, state, rewards, dones):
+        emulator = self.emulator
+        while state["street"] == Const.Street.FINISHED:
+            stacks = self.__fetch_stacks(state)
+            rewards[env_idx] += stacks - self.round_start_stacks[env_idx]
+            if emulator.is_last_round(state):
+                dones[env_idx] = True
+                return self.__start_game(env_idx)
+            self.round_start_stacks[env_idx] = stacks
+            state, _ = emulator.start_new_round(state, headless=True)
+            if emulator.is_game_finished(state):
+                dones[env_idx] = True
+                return self.__start_game(env_idx)
+        return state
+
+    def __start_game(self, env_idx):
+        players_info = OrderedDict(
+            ("uuid-%d" % pos, { "name": "player%d" % pos, "stack": self.initial_stack })
+            for pos in range(self.nb_player))
+        state = self.emulator.generate_initial_game_state(players_info)
+        self.round_start_stacks[env_idx] = self.initial_stack
+        state, _ = self.emulator.start_new_round(state, headless=True)
+        return state
+
+    def __fetch_stacks(self, state):
+        return np.array([player.stack for player in state["table"].seats.players], dtype=np.float32)
@@ -1,5 +1,3 @@
-from functools import reduce
-
 class ActionChecker:
 
   @classmethod
@@ -78,11 +76,10 @@ class ActionChecker:
 
   @classmethod
   def __fetch_last_raise(self, players):
-    all_histories = [p.action_histories for p in players]
-    all_histories = reduce(lambda acc, e: acc + e, all_histories)  # flatten
-    raise_histories = [h for h in all_histories if h["action"] in ["RAISE", "SMALLBLIND", "BIGBLIND"]]
-    if len(raise_histories) == 0:
-      return None
-    else:
-      return max(raise_histories, key=lambda h: h["amount"])  # maxby
+    last_raise = None
+    for player in players:
+      raise_ = player.last_raise()
+      if raise_ and (last_raise is None or raise_["amount"] > last_raise["amount"]):
+        last_raise = raise_
+    return last_raise
 
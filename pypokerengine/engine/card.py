@@ -1,4 +1,6 @@
-class Card:
+class Card(object):
+
+  __slots__ = ["suit", "rank"]
 
   CLUB = 2
   DIAMOND = 4
@@ -28,6 +30,9 @@ class Card:
       14 : 'A'
   }
 
+  SUIT_INDEX_MAP = { 2: 0, 4: 1, 8: 2, 16: 3 }
+  STR_SUIT_MAP = { v: k for k, v in SUIT_MAP.items() }
+  STR_RANK_MAP = { v: k for k, v in RANK_MAP.items() }
 
   def __init__(self, suit, rank):
     self.suit = suit
@@ -43,28 +48,26 @@ class Card:
 
   def to_id(self):
     rank = 1 if self.rank == 14 else self.rank
-    num = 0
-    tmp = self.suit >> 1
-    while tmp&1 != 1:
-      num += 1
-      tmp >>= 1
-
-    return rank + 13 * num
+    return rank + 13 * self.SUIT_INDEX_MAP[self.suit]
 
+  # Cards of the 52 valid ids are shared instances (see _INTERNED_CARDS). Do not change them in place.
   @classmethod
   def from_id(cls, card_id):
-    suit, rank = 2, card_id
-    while rank > 13:
-      suit <<= 1
-      rank -= 13
-
-    return cls(suit, rank)
+    card = _INTERNED_CARDS.get(card_id) if cls is Card else None
+    return card if card else cls._new_from_id(card_id)
 
   @classmethod
   def from_str(cls, str_card):
     assert(len(str_card)==2)
-    inverse = lambda hsh: {v:k for k,v in hsh.items()}
-    suit = inverse(cls.SUIT_MAP)[str_card[0].upper()]
-    rank = inverse(cls.RANK_MAP)[str_card[1]]
-    return cls(suit, rank)
+    suit = cls.STR_SUIT_MAP[str_card[0].upper()]
+    rank = cls.STR_RANK_MAP[str_card[1]]
+    return cls.from_id((1 if rank == 14 else rank) + 13 * cls.SUIT_INDEX_MAP[suit])
+
+  @classmethod
+  def _new_from_id(cls, card_id):
+    suit_index, rank = divmod(card_id - 1, 13)
+    return cls(2 << suit_index, rank + 1)
+
+
+_INTERNED_CARDS = { card_id: Card._new_from_id(card_id) for card_id in range(1, 53) }
 
@@ -0,0 +1,98 @@
+from pypokerengine.engine.card import Card
+
+class CardSet:
+  """Immutable set of cards held in one integer bitmask
+
+  Bit n of the mask is the card whose id is n (see Card.to_id), so a set
+  of 52 cards fits in 64 bits and set operations are single int operations.
+  Ids of the same suit are contiguous: suit i uses bits 13*i+1 .. 13*i+13
+  from ace to king.
+  """
+
+  FULL_MASK = ((1 << 52) - 1) << 1
+
+  def __init__(self, mask=0):
+    self.mask = mask
+
+  @classmethod
+  def full(cls):
+    return cls(cls.FULL_MASK)
+
+  @classmethod
+  def from_ids(cls, card_ids):
+    mask = 0
+    for card_id in card_ids:
+      mask |= 1 << card_id
+    return cls(mask)
+
+  @classmethod
+  def from_cards(cls, cards):
+    return cls.from_ids([card.to_id() for card in cards])
+
+  @classmethod
+  def from_str(cls, str_cards):
+    return cls.from_ids([_STR_TO_ID[s[0].upper() + s[1]] for s in str_cards])
+
+  def union(self, other):
+    return CardSet(self.mask | other.mask)
+
+  def difference(self, other):
+    return CardSet(self.mask & ~other.mask)
+
+  def intersection(self, other):
+    return CardSet(self.mask & other.mask)
+
+  __or__ = union
+  __sub__ = difference
+  __and__ = intersection
+
+  def add(self, card_id):
+    return CardSet(self.mask | 1 << card_id)
+
+  def remove(self, card_id):
+    return CardSet(self.mask & ~(1 << card_id))
+
+  def size(self):
+    return bin(self.mask).count("1")
+
+  __len__ = size
+
+  def suit_masks(self):
+    return [self.mask >> (13 * i + 1) & 8191 for i in range(4)]
+
+  def to_ids(self):
+    return list(self)
+
+  def to_cards(self):
+    return [Card.from_id(card_id) for card_id in self]
+
+  def to_str(self):
+    return [_ID_TO_STR[card_id] for card_id in self]
+
+  def __iter__(self):
+    mask = self.mask
+    while mask:
+      low_bit = mask & -mask
+      yield low_bit.bit_length() - 1
+      mask ^= low_bit
+
+  def __contains__(self, card_id):
+    return self.mask >> card_id & 1 == 1
+
+  def __eq__(self, other):
+    return isinstance(other, CardSet) and self.mask == other.mask
+
+  def __ne__(self, other):
+    return not self == other
+
+  def __hash__(self):
+    return hash(self.mask)
+
+  def __str__(self):
+    return "[%s]" % ", ".join(self.to_str())
+
+  __repr__ = __str__
+
+
+_ID_TO_STR = [None] + [str(Card.from_id(card_id)) for card_id in range(1, 53)]
+_STR_TO_ID = { s: card_id for card_id, s in enumerate(_ID_TO_STR) if s }
@@ -1,4 +1,8 @@
 from functools import reduce
+try:
+  from collections.abc import Mapping
+except ImportError:
+  from collections import Mapping
 
 from pypokerengine.engine.pay_info import PayInfo
 from pypokerengine.engine.poker_constants import PokerConstants as Const
@@ -29,9 +33,10 @@ class DataEncoder:
         "seats": [self.encode_player(player) for player in seats.players]
         }
 
+  # table shares the pot structure with GameEvaluator (see GameEvaluator.create_pot)
   @classmethod
-  def encode_pot(self, players):
-    pots = GameEvaluator.create_pot(players)
+  def encode_pot(self, players, table=None):
+    pots = GameEvaluator.create_pot(players, table)
     main = { "amount": pots[0]["amount"] }
     gen_hsh = lambda sidepot: \
             { "amount": sidepot["amount"], "eligibles": [p.uuid for p in sidepot["eligibles"]] }
@@ -79,11 +84,15 @@ class DataEncoder:
 
   @classmethod
   def encode_action_histories(self, table):
-    all_street_histories = [[player.round_action_histories[street] for player in table.seats.players] for street in range(4)]
+    return self._encode_action_histories_of(table.seats.players, table.sb_pos())
+
+  @classmethod
+  def _encode_action_histories_of(self, players, sb_pos):
+    all_street_histories = [[player.round_action_histories[street] for player in players] for street in range(4)]
     past_street_histories = [histories for histories in all_street_histories if any([e is not None for e in histories])]
-    current_street_histories = [player.action_histories for player in table.seats.players]
+    current_street_histories = [player.action_histories for player in players]
     street_histories = past_street_histories + [current_street_histories]
-    street_histories = [self.__order_histories(table.sb_pos(), histories) for histories in street_histories]
+    street_histories = [self.__order_histories(sb_pos, histories) for histories in street_histories]
     street_name = ["preflop", "flop", "turn", "river"]
     action_histories = { name:histories for name, histories in zip(street_name, street_histories) }
     return { "action_histories": action_histories }
@@ -92,11 +101,13 @@ class DataEncoder:
   def encode_winners(self, winners):
     return { "winners": self.__encode_players(winners) }
 
+  # Returns read-only RoundStateView. "pot", "seats" and "action_histories" are
+  # encoded on first access and shared with the views of the same table state.
+  # MessageBuilder puts its to_dict() in messages, so they stay plain dicts.
   @classmethod
   def encode_round_state(self, state):
     hsh = {
         "street": self.__street_to_str(state["street"]),
-        "pot": self.encode_pot(state["table"].seats.players),
         "community_card": [str(card) for card in state["table"].get_community_card()],
         "dealer_btn": state["table"].dealer_btn,
         "next_player": state["next_player"],
@@ -105,9 +116,32 @@ class DataEncoder:
         "round_count": state["round_count"],
         "small_blind_amount": state["small_blind_amount"]
     }
-    hsh.update(self.encode_seats(state["table"].seats))
-    hsh.update(self.encode_action_histories(state["table"]))
-    return hsh
+    return RoundStateView(hsh, self.__fetch_table_payload(state["table"]))
+
+  # Same as encode_action_histories but as a view sharing the encoded histories with round_state
+  @classmethod
+  def encode_lazy_action_histories(self, table):
+    return RoundStateView({}, self.__fetch_table_payload(table), ["action_histories"])
+
+  # The payload of the last version is kept on the table (and shared by its copies)
+  @classmethod
+  def __fetch_table_payload(self, table):
+    version = self.__table_version(table)
+    if table._encoded_payload is not None and table._encoded_payload[0] == version:
+      return table._encoded_payload[1]
+    payload = TablePayload(table)
+    table._encoded_payload = (version, payload)
+    return payload
+
+  # changes whenever the encoded pot, seats or action histories of the table may change
+  # (history entries are kept alive by the payload, so their ids are not reused)
+  @classmethod
+  def __table_version(self, table):
+    return (table.sb_pos(), tuple([(
+      player.uuid, player.stack, player.pay_info.status, player.pay_info.amount, len(player.action_histories),
+      id(player.action_histories[-1]) if player.action_histories else None,
+      len([h for h in player.round_action_histories if h is not None])
+      ) for player in table.seats.players]))
 
 
   @classmethod
@@ -152,3 +186,55 @@ class DataEncoder:
     return lst
 
 
+class TablePayload(object):
+  """Lazily encoded pot, seats and action_histories of a snapshot of the table"""
+
+  def __init__(self, table):
+    self.table = table
+    self.players = [player.copy() for player in table.seats.players]
+    self.sb_pos = table.sb_pos()
+    self.encoded = {}
+
+  def get(self, key):
+    if key not in self.encoded:
+      self.encoded[key] = self.__encode(key)
+    return self.encoded[key]
+
+  def __encode(self, key):
+    if key == "pot":
+      return DataEncoder.encode_pot(self.players, self.table)
+    if key == "seats":
+      return [DataEncoder.encode_player(player) for player in self.players]
+    if key == "action_histories":
+      return DataEncoder._encode_action_histories_of(self.players, self.sb_pos)["action_histories"]
+
+
+class RoundStateView(Mapping):
+  """Read-only round_state which encodes the items of TablePayload on first access"""
+
+  LAZY_KEYS = ["pot", "seats", "action_histories"]
+
+  def __init__(self, items, payload, lazy_keys=LAZY_KEYS):
+    self.__items = items
+    self.__payload = payload
+    self.__lazy_keys = lazy_keys
+
+  def __getitem__(self, key):
+    if key in self.__items:
+      return self.__items[key]
+    if key in self.__lazy_keys:
+      return self.__payload.get(key)
+    raise KeyError(key)
+
+  def __iter__(self):
+    return iter(list(self.__items) + self.__lazy_keys)
+
+  def __len__(self):
+    return len(self.__items) + len(self.__lazy_keys)
+
+  # plain dict (e.g. for json) which shares the encoded items with this view
+  def to_dict(self):
+    return dict(self)
+
+  def __repr__(self):
+    return repr(self.to_dict())
@@ -9,15 +9,19 @@ from pypokerengine.engine.message_builder import MessageBuilder
 
 class Dealer:
 
-  def __init__(self, small_blind_amount=None, initial_stack=None, ante=None):
+  # With seed, uuids and deck shuffles are drawn from a random.Random of the seed
+  # instead of the global random module, so the same seed deals the same game.
+  def __init__(self, small_blind_amount=None, initial_stack=None, ante=None, seed=None):
     self.small_blind_amount = small_blind_amount
     self.ante = ante if ante else 0
     self.initial_stack = initial_stack
+    self.rng = random.Random(seed) if seed is not None else None
     self.uuid_list = self.__generate_uuid_list()
     self.message_handler = MessageHandler()
     self.message_summarizer = MessageSummarizer(verbose=0)
-    self.table = Table()
+    self.table = Table(rng=self.rng)
     self.blind_structure = {}
+    self.action_log = []
 
   def register_player(self, player_name, algorithm):
     self.__config_check()
@@ -29,15 +33,19 @@ class Dealer:
       self.message_summarizer.verbose = verbose
 
   def start_game(self, max_round):
-    table = self.table
     self.__notify_game_start(max_round)
-    ante, sb_amount = self.ante, self.small_blind_amount
-    for round_count in range(1, max_round+1):
-      ante, sb_amount = self.__update_forced_bet_amount(ante, sb_amount, round_count, self.blind_structure)
-      table = self.__exclude_short_of_money_players(table, ante, sb_amount)
-      if self.__is_game_finished(table): break
-      table = self.play_round(round_count, sb_amount, ante, table)
-      table.shift_dealer_btn()
+    table = self.__play_rounds(max_round, self.play_round)
+    return self.__generate_game_result(max_round, table.seats)
+
+  # Plays the game again by the actions recorded in action_log of a dealer which
+  # has the same seed, rule and players. Registered algorithms are not asked.
+  def replay_game(self, max_round, action_log):
+    actions = iter(action_log)
+    replay_round = lambda round_count, blind_amount, ante, table:\
+        self.__replay_round(round_count, blind_amount, ante, table, actions)
+    table = self.__play_rounds(max_round, replay_round)
+    if next(actions, None) is not None:
+      raise ValueError(self.__unused_action_msg)
     return self.__generate_game_result(max_round, table.seats)
 
   def play_round(self, round_count, blind_amount, ante, table):
@@ -46,6 +54,7 @@ class Dealer:
       self.__message_check(msgs, state["street"])
       if state["street"] != Const.Street.FINISHED:  # continue the round
         action, bet_amount = self.__publish_messages(msgs)
+        self.__record_action(state, action, bet_amount)
         state, msgs = RoundManager.apply_action(state, action, bet_amount)
       else:  # finish the round after publish round result
         self.__publish_messages(msgs)
@@ -62,6 +71,35 @@ class Dealer:
   def set_blind_structure(self, blind_structure):
     self.blind_structure = blind_structure
 
+  def __play_rounds(self, max_round, play_round):
+    table = self.table
+    ante, sb_amount = self.ante, self.small_blind_amount
+    for round_count in range(1, max_round+1):
+      ante, sb_amount = self.__update_forced_bet_amount(ante, sb_amount, round_count, self.blind_structure)
+      table = self.__exclude_short_of_money_players(table, ante, sb_amount)
+      if self.__is_game_finished(table): break
+      table = play_round(round_count, sb_amount, ante, table)
+      table.shift_dealer_btn()
+    return table
+
+  def __replay_round(self, round_count, blind_amount, ante, table, actions):
+    state, _ = RoundManager.start_new_round(round_count, blind_amount, ante, table, headless=True)
+    while state["street"] != Const.Street.FINISHED:
+      record = next(actions, None)
+      if record is None:
+        raise ValueError(self.__short_action_log_msg % round_count)
+      uuid, action, bet_amount = record
+      next_player = state["table"].seats.players[state["next_player"]]
+      if next_player.uuid != uuid:
+        raise ValueError(self.__wrong_action_owner_msg % (uuid, round_count, next_player.uuid))
+      state, _ = RoundManager.apply_action(state, action, bet_amount, headless=True)
+    return state["table"]
+
+  # action_log format : [(uuid, action, bet_amount), ...] as declared by the players
+  def __record_action(self, state, action, bet_amount):
+    next_player = state["table"].seats.players[state["next_player"]]
+    self.action_log.append((next_player.uuid, action, bet_amount))
+
   def __update_forced_bet_amount(self, ante, sb_amount, round_count, blind_structure):
     if round_count in blind_structure:
       update_info = blind_structure[round_count]
@@ -165,6 +203,10 @@ class Dealer:
       raise Exception("initial_stack is not set!!\
           You need to call 'dealer.set_initial_stack' before.")
 
+  __short_action_log_msg = "action_log ran out in round %d"
+  __wrong_action_owner_msg = "action_log has the action of %s in round %d but %s is asked"
+  __unused_action_msg = "action_log has actions after the game finished"
+
   def __fetch_uuid(self):
     return self.uuid_list.pop()
 
@@ -174,7 +216,8 @@ class Dealer:
   def __generate_uuid(self):
     uuid_size = 22
     chars = [chr(code) for code in range(97,123)]
-    return "".join([random.choice(chars) for _ in range(uuid_size)])
+    rng = random if self.rng is None else self.rng
+    return "".join([rng.choice(chars) for _ in range(uuid_size)])
 
 class MessageHandler:
 
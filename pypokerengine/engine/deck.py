@@ -1,47 +1,121 @@
-from functools import reduce
+from array import array
+import random
 
 from pypokerengine.engine.card import Card
-import random
 
-class Deck:
+class Deck(object):
 
-  def __init__(self, deck_ids=None, cheat=False, cheat_card_ids=[]):
+  __slots__ = ["cheat", "cheat_card_ids", "rng", "_cards", "_size", "_shared"]
+
+  # Card ids (see Card.to_id) are held in an array and the first self._size of them
+  # are left in the deck. Cards are drawn from the end by moving the cursor, so drawing
+  # never changes the array and Card objects are created only by draw_card(s).
+  # rng is anything which has shuffle(x) (e.g. random.Random or numpy.random.Generator).
+  # The global random module is used when rng is None.
+  def __init__(self, deck_ids=None, cheat=False, cheat_card_ids=[], rng=None):
     self.cheat = cheat
     self.cheat_card_ids = cheat_card_ids
-    self.deck = [Card.from_id(cid) for cid in deck_ids] if deck_ids else self.__setup()
+    self.rng = rng
+    self._cards = array("b", deck_ids) if deck_ids else self.__setup()
+    self._size = len(self._cards)
+    self._shared = False
+
+  # card ids left in the deck. The top of the deck is the last element.
+  # The returned list is a copy, so assign the changed list to change the deck
+  # (e.g. deck.deck = deck.deck + [card_id]).
+  @property
+  def deck(self):
+    return self._cards[:self._size].tolist()
+
+  @deck.setter
+  def deck(self, deck_ids):
+    self._cards = array("b", deck_ids)
+    self._size = len(self._cards)
+    self._shared = False
 
   def draw_card(self):
-    return self.deck.pop()
+    return Card.from_id(self.draw_card_id())
 
   def draw_cards(self, num):
-    return reduce(lambda acc, _: acc + [self.draw_card()], range(num), [])
+    return [Card.from_id(card_id) for card_id in self.draw_card_ids(num)]
+
+  def draw_card_id(self):
+    if self._size == 0:
+      raise IndexError(self.__empty_deck_msg % (1, 0))
+    self._size -= 1
+    return self._cards[self._size]
+
+  def draw_card_ids(self, num):
+    if self._size < num:
+      raise IndexError(self.__empty_deck_msg % (num, self._size))
+    cards, size = self._cards, self._size
+    self._size = size - num
+    return [cards[i] for i in range(size - 1, self._size - 1, -1)]
 
   def size(self):
-    return len(self.deck)
+    return self._size
 
+  # fills the array in place unless it is shared with a copy
   def restore(self):
-    self.deck = self.__setup()
+    template = self.__setup() if self.cheat else _FULL_DECK
+    if self._shared:
+      self._cards = array("b", template)
+      self._shared = False
+    else:
+      self._cards[:] = template
+    self._size = len(template)
 
+  # in-place Fisher-Yates shuffle of the cards left in the deck by self.rng
   def shuffle(self):
     if not self.cheat:
-      random.shuffle(self.deck)
+      self.__own_deck()
+      (random if self.rng is None else self.rng).shuffle(self._cards)
+
+  # The copy shares the card array (and rng) with this deck. Drawing only moves
+  # the cursor, so the array is copied only when either of them shuffles or restores.
+  def copy(self):
+    deck = self.__class__.__new__(self.__class__)
+    deck.cheat = self.cheat
+    deck.cheat_card_ids = self.cheat_card_ids
+    deck.rng = self.rng
+    deck._cards = self._cards
+    deck._size = self._size
+    deck._shared = self._shared = True
+    return deck
+
+  # state of the deck to go back to by rollback(snapshot)
+  def snapshot(self):
+    self._shared = True
+    return (self._cards, self._size)
+
+  def rollback(self, snapshot):
+    self._cards, self._size = snapshot
+    self._shared = True
 
   # serialize format : [cheat_flg, chat_card_ids, deck_card_ids]
   def serialize(self):
-    return [self.cheat, self.cheat_card_ids, [card.to_id() for card in self.deck]]
+    return [self.cheat, self.cheat_card_ids, self._cards[:self._size].tolist()]
 
   @classmethod
   def deserialize(self, serial):
     cheat, cheat_card_ids, deck_ids = serial
     return self(deck_ids=deck_ids, cheat=cheat, cheat_card_ids=cheat_card_ids)
 
-  def __setup(self):
-    return self.__setup_cheat_deck() if self.cheat else self.__setup_52_cards()
+  __empty_deck_msg = "Failed to draw %d cards. Because the deck has only %d cards"
 
-  def __setup_52_cards(self):
-    return [Card.from_id(cid) for cid in range(1,53)]
+  # makes the array private to this deck and drops the drawn cards from it
+  def __own_deck(self):
+    if self._shared:
+      self._cards = self._cards[:self._size]
+      self._shared = False
+    elif self._size != len(self._cards):
+      del self._cards[self._size:]
+
+  def __setup(self):
+    return array("b", self.__setup_cheat_deck() if self.cheat else _FULL_DECK)
 
   def __setup_cheat_deck(self):
-    cards = [Card.from_id(cid) for cid in self.cheat_card_ids]
-    return cards[::-1]
+    return list(self.cheat_card_ids)[::-1]
+
 
+_FULL_DECK = array("b", range(1, 53))
@@ -6,29 +6,36 @@ from pypokerengine.engine.pay_info import PayInfo
 
 class GameEvaluator:
 
+  # Each active player's hand is evaluated once and the scores (held by position)
+  # are shared by the winners, hand info and every pot.
   @classmethod
   def judge(self, table):
-    winners = self.__find_winners_from(table.get_community_card(), table.seats.players)
-    hand_info = self.__gen_hand_info_if_needed(table.seats.players, table.get_community_card())
-    prize_map = self.__calc_prize_distribution(table.get_community_card(), table.seats.players)
+    players = table.seats.players
+    scores = self.__score_players(players, table.get_community_card())
+    winners = [players[pos] for pos in self.__find_winner_positions(scores, range(len(players)))]
+    hand_info = self.__gen_hand_info_if_needed(players, scores)
+    prize_map = self.__calc_prize_distribution(table, scores)
     return winners, hand_info, prize_map
 
+  # The pot structure depends only on the pay infos of the players by position.
+  # With table, it is kept on the table (and its copies) for the last pay infos,
+  # so the pots of the same table state are built only once.
   @classmethod
-  def create_pot(self, players):
-    side_pots = self.__get_side_pots(players)
-    main_pot = self.__get_main_pot(players, side_pots)
-    return side_pots + [main_pot]
+  def create_pot(self, players, table=None):
+    players = list(players)
+    return [{ "amount": amount, "eligibles": [players[pos] for pos in eligibles] }\
+        for amount, eligibles in self.__fetch_pot_structure(players, table)]
 
 
   @classmethod
-  def __calc_prize_distribution(self, community_card, players):
+  def __calc_prize_distribution(self, table, scores):
+    players = table.seats.players
     prize_map = self.__create_prize_map(len(players))
-    pots = self.create_pot(players)
-    for pot in pots:
-      winners = self.__find_winners_from(community_card, pot["eligibles"])
-      prize = int(pot["amount"] / len(winners))
-      for winner in winners:
-        prize_map[players.index(winner)] += prize
+    for amount, eligibles in self.__fetch_pot_structure(players, table):
+      winners = self.__find_winner_positions(scores, eligibles)
+      prize = int(amount / len(winners))
+      for pos in winners:
+        prize_map[pos] += prize
     return prize_map
 
   @classmethod
@@ -36,61 +43,63 @@ class GameEvaluator:
     def update(d, other): d.update(other); return d
     return reduce(update, [{i:0} for i in range(player_num)], {})
 
+  # score of each player by position (None for folded player)
   @classmethod
-  def __find_winners_from(self, community_card, players):
+  def __score_players(self, players, community_card):
     score_player = lambda player: HandEvaluator.eval_hand(player.hole_card, community_card)
+    return [score_player(player) if player.is_active() else None for player in players]
 
-    active_players = [player for player in players if player.is_active()]
-    scores = [score_player(player) for player in active_players]
-    best_score = max(scores)
-    score_with_players = [(score, player) for score, player in zip(scores, active_players)]
-    winners = [s_p[1] for s_p in score_with_players if s_p[0] == best_score]
-    return winners
+  @classmethod
+  def __find_winner_positions(self, scores, positions):
+    active_positions = [pos for pos in positions if scores[pos] is not None]
+    best_score = max([scores[pos] for pos in active_positions])
+    return [pos for pos in active_positions if scores[pos] == best_score]
 
   @classmethod
-  def __gen_hand_info_if_needed(self, players, community):
-    active_players = [player for player in players if player.is_active()]
-    gen_hand_info = lambda player: { "uuid": player.uuid, "hand" : HandEvaluator.gen_hand_rank_info(player.hole_card, community) }
-    return [] if len(active_players) == 1 else [gen_hand_info(player) for player in active_players]
+  def __gen_hand_info_if_needed(self, players, scores):
+    gen_hand_info = lambda pos: { "uuid": players[pos].uuid, "hand" : HandEvaluator.gen_hand_rank_info_from_score(scores[pos]) }
+    active_positions = [pos for pos, score in enumerate(scores) if score is not None]
+    return [] if len(active_positions) == 1 else [gen_hand_info(pos) for pos in active_positions]
 
+  @classmethod
+  def __fetch_pot_structure(self, players, table=None):
+    pay_state = tuple([(player.pay_info.amount, player.pay_info.status) for player in players])
+    if table is not None and table._pot_cache is not None and table._pot_cache[0] == pay_state:
+      return table._pot_cache[1]
+    side_pots = self.__get_side_pots(players)
+    structure = side_pots + [self.__get_main_pot(players, side_pots)]
+    if table is not None: table._pot_cache = (pay_state, structure)
+    return structure
+
+  # pots are held as (amount, positions of eligible players)
   @classmethod
   def __get_main_pot(self, players, sidepots):
     max_pay = max([pay.amount for pay in self.__get_payinfo(players)])
-    return {
-        "amount": self.__get_players_pay_sum(players) - self.__get_sidepots_sum(sidepots),
-        "eligibles": [player for player in players if player.pay_info.amount == max_pay]
-    }
+    return (
+        self.__get_players_pay_sum(players) - sum([amount for amount, _ in sidepots]),
+        [pos for pos, player in enumerate(players) if player.pay_info.amount == max_pay]
+    )
 
   @classmethod
   def __get_players_pay_sum(self, players):
     return sum([pay.amount for pay in self.__get_payinfo(players)])
 
+  # Each all-in amount (in ascending order) closes a side pot which holds the chips
+  # paid between the previous all-in amount and it.
   @classmethod
   def __get_side_pots(self, players):
-    pay_amounts = [payinfo.amount for payinfo in self.__fetch_allin_payinfo(players)]
-    gen_sidepots = lambda sidepots, allin_amount: sidepots + [self.__create_sidepot(players, sidepots, allin_amount)]
-    return reduce(gen_sidepots, pay_amounts, [])
-
-  @classmethod
-  def __create_sidepot(self, players, smaller_side_pots, allin_amount):
-    return {
-        "amount": self.__calc_sidepot_size(players, smaller_side_pots, allin_amount),
-        "eligibles" : self.__select_eligibles(players, allin_amount)
-    }
-
-  @classmethod
-  def __calc_sidepot_size(self, players, smaller_side_pots, allin_amount):
-    add_chip_for_pot = lambda pot, player: pot + min(allin_amount, player.pay_info.amount)
-    target_pot_size = reduce(add_chip_for_pot, players, 0)
-    return target_pot_size - self.__get_sidepots_sum(smaller_side_pots)
-
-  @classmethod
-  def __get_sidepots_sum(self, sidepots):
-    return reduce(lambda sum_, sidepot: sum_ + sidepot["amount"], sidepots, 0)
-
-  @classmethod
-  def __select_eligibles(self, players, allin_amount):
-    return [player for player in players if self.__is_eligible(player, allin_amount)]
+    side_pots, lower_amount = [], 0
+    for allin_amount in [payinfo.amount for payinfo in self.__fetch_allin_payinfo(players)]:
+      side_pots.append(self.__create_sidepot(players, lower_amount, allin_amount))
+      lower_amount = allin_amount
+    return side_pots
+
+  @classmethod
+  def __create_sidepot(self, players, lower_amount, allin_amount):
+    return (
+        sum([max(0, min(allin_amount, player.pay_info.amount) - lower_amount) for player in players]),
+        [pos for pos, player in enumerate(players) if self.__is_eligible(player, allin_amount)]
+    )
 
   @classmethod
   def __is_eligible(self, player, allin_amount):
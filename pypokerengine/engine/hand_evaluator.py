@@ -1,5 +1,8 @@
 from functools import reduce
-from itertools import groupby
+from itertools import groupby, combinations_with_replacement
+
+from pypokerengine.engine.card import Card
+from pypokerengine.engine.card_set import CardSet
 
 class HandEvaluator:
 
@@ -27,7 +30,11 @@ class HandEvaluator:
 
   @classmethod
   def gen_hand_rank_info(self, hole, community):
-    hand = self.eval_hand(hole, community)
+    return self.gen_hand_rank_info_from_score(self.eval_hand(hole, community))
+
+  # hand is the score returned by eval_hand
+  @classmethod
+  def gen_hand_rank_info_from_score(self, hand):
     row_strength = self.__mask_hand_strength(hand)
     strength = self.HAND_STRENGTH_MAP[row_strength]
     hand_high = self.__mask_hand_high_rank(hand)
@@ -49,6 +56,26 @@ class HandEvaluator:
 
   @classmethod
   def eval_hand(self, hole, community):
+    ranks = sorted([card.rank for card in hole])
+    hole_flg = ranks[1] << 4 | ranks[0]
+    hand_flg = HandRankTable.eval_cards(hole + community)
+    if hand_flg is None:  # same card is passed twice
+      hand_flg = self.__calc_hand_info_flg(hole, community)
+    return (hand_flg or hole_flg) << 8 | hole_flg
+
+  # Same as eval_hand but receives card ids (see Card.to_id) instead of Card objects
+  @classmethod
+  def eval_hand_ids(self, hole_ids, community_ids):
+    ranks = sorted([_RANK_OF_ID[cid] for cid in hole_ids])
+    hole_flg = ranks[1] << 4 | ranks[0]
+    card_set = CardSet.from_ids(hole_ids + community_ids)
+    if card_set.size() != len(hole_ids) + len(community_ids):
+      return self.eval_hand([Card.from_id(cid) for cid in hole_ids], [Card.from_id(cid) for cid in community_ids])
+    return (HandRankTable.eval_mask(card_set.mask) or hole_flg) << 8 | hole_flg
+
+  # Rule based implementation of eval_hand which HandRankTable must agree with.
+  @classmethod
+  def _eval_hand_by_rule(self, hole, community):
     ranks = sorted([card.rank for card in hole])
     hole_flg = ranks[1] << 4 | ranks[0]
     hand_flg = self.__calc_hand_info_flg(hole, community) << 8
@@ -258,3 +285,116 @@ class HandEvaluator:
     mask = 15
     return bit & mask
 
+
+
+class HandRankTable:
+  """Lookup tables which return the hand info flg of eval_hand in O(1)
+
+  Cards are split into four 13-bit suit masks (bit 0 is ace, bit 12 is king),
+  which is the layout of CardSet.mask shifted per suit.
+  The flush table maps a suit mask to its flash/straight flash flg and the
+  rank table maps the rank multiset (base-5 digit per rank) to the flg of the
+  other hands. HIGHCARD is stored as 0 because it depends on the hole card.
+  eval_cards returns None when the same card is passed twice.
+  """
+
+  SUIT_INDEX = { 2: 0, 4: 1, 8: 2, 16: 3 }
+
+  @classmethod
+  def eval_cards(self, cards):
+    masks = [0, 0, 0, 0]
+    for card in cards:
+      suit, bit = self.SUIT_INDEX[card.suit], 1 << (card.rank - 1 if card.rank != 14 else 0)
+      if masks[suit] & bit: return None
+      masks[suit] |= bit
+    return self.eval_suit_masks(masks)
+
+  @classmethod
+  def eval_mask(self, mask):
+    return self.eval_suit_masks([mask >> 1 & 8191, mask >> 14 & 8191, mask >> 27 & 8191, mask >> 40 & 8191])
+
+  @classmethod
+  def eval_suit_masks(self, masks):
+    rank_key = 0
+    flush_flg = 0
+    for mask in masks:
+      rank_key += _RANK_KEY_OF_MASK[mask]
+      flush_flg |= _FLUSH_FLG_OF_MASK[mask]
+    rank_flg = _RANK_FLG.get(rank_key)
+    if rank_flg is None:
+      rank_flg = _RANK_FLG[rank_key] = self._calc_rank_flg(self.__decode_rank_key(rank_key))
+    return max(flush_flg, rank_flg)
+
+  @classmethod
+  def rank_flg_table(self):
+    """Return (sorted rank keys, flgs) of every 7 card rank multiset"""
+    if not _SEVEN_CARD_RANK_KEYS:
+      for ranks in combinations_with_replacement(range(2, 15), 7):
+        counts = [0] * 15
+        for r in ranks: counts[r] += 1
+        if max(counts) > 4: continue
+        rank_key = sum([5 ** (r-2) for r in ranks])
+        if rank_key not in _RANK_FLG:
+          _RANK_FLG[rank_key] = self._calc_rank_flg(counts)
+        _SEVEN_CARD_RANK_KEYS.append(rank_key)
+      _SEVEN_CARD_RANK_KEYS.sort()
+    return _SEVEN_CARD_RANK_KEYS[::], [_RANK_FLG[key] for key in _SEVEN_CARD_RANK_KEYS]
+
+  @classmethod
+  def rank_key_of_mask(self):
+    return _RANK_KEY_OF_MASK[::]
+
+  @classmethod
+  def flush_flg_of_mask(self):
+    return _FLUSH_FLG_OF_MASK[::]
+
+  @classmethod
+  def _calc_flush_flg(self, mask):
+    if bin(mask).count("1") < 5: return 0
+    rank_bits = (mask & 1) << 14 | (mask >> 1) << 2
+    straight = self.__search_straight(rank_bits)
+    if straight != -1: return HandEvaluator.STRAIGHTFLASH | straight << 4
+    return HandEvaluator.FLASH | (rank_bits.bit_length() - 1) << 4
+
+  # counts[r] is the number of cards whose rank is r (2 <= r <= 14)
+  @classmethod
+  def _calc_rank_flg(self, counts):
+    ranks = range(2, 15)
+    four_card_ranks = [r for r in ranks if counts[r] >= 4]
+    if four_card_ranks: return HandEvaluator.FOURCARD | four_card_ranks[0] << 4
+    three_card_ranks = [r for r in ranks if counts[r] >= 3]
+    two_pair_ranks = [r for r in ranks if counts[r] >= 2 and not r in three_card_ranks]
+    if len(three_card_ranks) == 2: two_pair_ranks.append(min(three_card_ranks))
+    if three_card_ranks and two_pair_ranks:
+      return HandEvaluator.FULLHOUSE | max(three_card_ranks) << 4 | max(two_pair_ranks)
+    straight = self.__search_straight(sum([1 << r for r in ranks if counts[r] > 0]))
+    if straight != -1: return HandEvaluator.STRAIGHT | straight << 4
+    if three_card_ranks: return HandEvaluator.THREECARD | max(three_card_ranks) << 4
+    pair_ranks = sorted([r for r in ranks for _ in range(counts[r] - 1)])[::-1][:2]
+    if len(pair_ranks) == 2: return HandEvaluator.TWOPAIR | pair_ranks[0] << 4 | pair_ranks[1]
+    if len(pair_ranks) == 1: return HandEvaluator.ONEPAIR | pair_ranks[0] << 4
+    return 0
+
+  # rank_bits has bit r on when a card of rank r exists
+  @classmethod
+  def __search_straight(self, rank_bits):
+    for r in range(10, 1, -1):
+      if rank_bits >> r & 31 == 31: return r
+    return -1
+
+  @classmethod
+  def __decode_rank_key(self, rank_key):
+    counts = [0, 0]
+    for _ in range(13):
+      rank_key, count = divmod(rank_key, 5)
+      counts.append(count)
+    return counts
+
+
+_RANK_KEY_OF_MASK = [0]
+for _bit in range(13):
+  _RANK_KEY_OF_MASK += [key + 5 ** (12 if _bit == 0 else _bit - 1) for key in _RANK_KEY_OF_MASK]
+_FLUSH_FLG_OF_MASK = [HandRankTable._calc_flush_flg(mask) for mask in range(1 << 13)]
+_RANK_FLG = {}
+_RANK_OF_ID = [None] + [Card.from_id(cid).rank for cid in range(1, 53)]
+_SEVEN_CARD_RANK_KEYS = []
@@ -35,7 +35,7 @@ class MessageBuilder:
   def build_street_start_message(self, state):
     message = {
         "message_type": self.STREET_START_MESSAGE,
-        "round_state": DataEncoder.encode_round_state(state)
+        "round_state": DataEncoder.encode_round_state(state).to_dict()
         }
     message.update(DataEncoder.encode_street(state["street"]))
     return self.__build_notification_message(message)
@@ -50,8 +50,8 @@ class MessageBuilder:
         "message_type" : self.ASK_MESSAGE,
         "hole_card": hole_card,
         "valid_actions": valid_actions,
-        "round_state": DataEncoder.encode_round_state(state),
-        "action_histories": DataEncoder.encode_action_histories(state["table"])
+        "round_state": DataEncoder.encode_round_state(state).to_dict(),
+        "action_histories": DataEncoder.encode_lazy_action_histories(state["table"]).to_dict()
     }
     return self.__build_ask_message(message)
 
@@ -61,8 +61,8 @@ class MessageBuilder:
     message = {
         "message_type": self.GAME_UPDATE_MESSAGE,
         "action": DataEncoder.encode_action(player, action, amount),
-        "round_state": DataEncoder.encode_round_state(state),
-        "action_histories": DataEncoder.encode_action_histories(state["table"])
+        "round_state": DataEncoder.encode_round_state(state).to_dict(),
+        "action_histories": DataEncoder.encode_lazy_action_histories(state["table"]).to_dict()
     }
     return self.__build_notification_message(message)
 
@@ -72,7 +72,7 @@ class MessageBuilder:
         "message_type": self.ROUND_RESULT_MESSAGE,
         "round_count": round_count,
         "hand_info"  : hand_info,
-        "round_state": DataEncoder.encode_round_state(state)
+        "round_state": DataEncoder.encode_round_state(state).to_dict()
     }
     message.update(DataEncoder.encode_winners(winners))
     return self.__build_notification_message(message)
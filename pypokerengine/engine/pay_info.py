@@ -1,4 +1,6 @@
-class PayInfo:
+class PayInfo(object):
+
+  __slots__ = ["amount", "status"]
 
   PAY_TILL_END = 0
   ALLIN  = 1
@@ -3,7 +3,12 @@ from pypokerengine.engine.card import Card
 from pypokerengine.engine.poker_constants import PokerConstants as Const
 
 
-class Player:
+class Player(object):
+
+  __slots__ = [
+      "name", "uuid", "hole_card_ids", "stack", "round_action_histories",
+      "action_histories", "pay_info", "__street_summary"
+  ]
 
   ACTION_FOLD_STR = "FOLD"
   ACTION_CALL_STR = "CALL"
@@ -15,23 +20,36 @@ class Player:
   def __init__(self, uuid, initial_stack, name="No Name"):
     self.name = name
     self.uuid = uuid
-    self.hole_card = []
+    self.hole_card_ids = []
     self.stack = initial_stack
     self.round_action_histories = self.__init_round_action_histories()
     self.action_histories = []
     self.pay_info = PayInfo()
+    self.__street_summary = None
+
+  # hole card is held as card ids. Card objects are created only when accessed through this property.
+  @property
+  def hole_card(self):
+    return [Card.from_id(card_id) for card_id in self.hole_card_ids]
+
+  @hole_card.setter
+  def hole_card(self, cards):
+    self.hole_card_ids = [card.to_id() for card in cards]
 
   def add_holecard(self, cards):
-    if len(self.hole_card) != 0:
-      raise ValueError(self.__dup_hole_msg)
-    if len(cards) != 2:
-      raise ValueError(self.__wrong_num_hole_msg % (len(cards)))
     if not all([isinstance(card, Card) for card in cards]):
       raise ValueError(self.__wrong_type_hole_msg)
-    self.hole_card = cards
+    self.add_holecard_ids([card.to_id() for card in cards])
+
+  def add_holecard_ids(self, card_ids):
+    if len(self.hole_card_ids) != 0:
+      raise ValueError(self.__dup_hole_msg)
+    if len(card_ids) != 2:
+      raise ValueError(self.__wrong_num_hole_msg % (len(card_ids)))
+    self.hole_card_ids = card_ids
 
   def clear_holecard(self):
-    self.hole_card = []
+    self.hole_card_ids = []
 
   def append_chip(self, amount):
     self.stack += amount
@@ -78,12 +96,28 @@ class Player:
     self.pay_info = PayInfo()
 
   def paid_sum(self):
-    pay_history = [h for h in self.action_histories if h["action"] not in ["FOLD", "ANTE"]]
-    last_pay_history = pay_history[-1] if len(pay_history)!=0 else None
-    return last_pay_history["amount"] if last_pay_history else 0
+    return self.__fetch_street_summary()[2]
+
+  # the raise (or blind) history of this street which has the largest amount
+  def last_raise(self):
+    return self.__fetch_street_summary()[3]
+
+  # Copy which shares the hole card and the histories of past streets with this
+  # player (they are replaced but never changed in place).
+  def copy(self):
+    player = self.__class__.__new__(self.__class__)
+    player.name = self.name
+    player.uuid = self.uuid
+    player.hole_card_ids = self.hole_card_ids
+    player.stack = self.stack
+    player.round_action_histories = self.round_action_histories[::]
+    player.action_histories = self.action_histories[::]
+    player.pay_info = PayInfo(self.pay_info.amount, self.pay_info.status)
+    player.__street_summary = None
+    return player
 
   def serialize(self):
-    hole = [card.to_id() for card in self.hole_card]
+    hole = self.hole_card_ids[::]
     return [
         self.name, self.uuid, self.stack, hole,\
             self.action_histories[::], self.pay_info.serialize(), self.round_action_histories[::]
@@ -91,9 +125,9 @@ class Player:
 
   @classmethod
   def deserialize(self, serial):
-    hole = [Card.from_id(cid) for cid in serial[3]]
+    hole = serial[3]
     player = self(serial[1], serial[2], serial[0])
-    if len(hole)!=0: player.add_holecard(hole)
+    if len(hole)!=0: player.add_holecard_ids(hole[::])
     player.action_histories = serial[4]
     player.pay_info = PayInfo.deserialize(serial[5])
     player.round_action_histories = serial[6]
@@ -106,6 +140,24 @@ class Player:
   __wrong_type_hole_msg = "You passed not Card object as hole card"
   __collect_err_msg = "Failed to collect %d chips. Because he has only %d chips"
 
+  # Running totals of this street : [action_histories, number of folded histories, paid_sum, last_raise].
+  # Histories appended since the last call are folded into the totals. They are
+  # recalculated only when action_histories is replaced by another list.
+  def __fetch_street_summary(self):
+    histories = self.action_histories
+    summary = self.__street_summary
+    if summary is None or summary[0] is not histories or summary[1] > len(histories):
+      summary = self.__street_summary = [histories, 0, 0, None]
+    for history in histories[summary[1]:]:
+      action = history["action"]
+      if action not in [self.ACTION_FOLD_STR, self.ACTION_ANTE]:
+        summary[2] = history["amount"]
+      if action in [self.ACTION_RAISE_STR, self.ACTION_SMALL_BLIND, self.ACTION_BIG_BLIND]:
+        if summary[3] is None or history["amount"] > summary[3]["amount"]:
+          summary[3] = history
+    summary[1] = len(histories)
+    return summary
+
   def __init_round_action_histories(self):
     return [None for _ in range(4)]  # 4 == len(["preflop", "flop", "turn", "river"])
 
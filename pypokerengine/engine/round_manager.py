@@ -1,6 +1,5 @@
 from functools import reduce
 
-from pypokerengine.engine.table import Table
 from pypokerengine.engine.player import Player
 from pypokerengine.engine.pay_info import PayInfo
 from pypokerengine.engine.poker_constants import PokerConstants as Const
@@ -10,8 +9,11 @@ from pypokerengine.engine.message_builder import MessageBuilder
 
 class RoundManager:
 
+  # headless=True advances the game without building any message and returns an
+  # empty message list. Messages of the current state can be built on demand
+  # (e.g. MessageBuilder.build_ask_message(state["next_player"], state)).
   @classmethod
-  def start_new_round(self, round_count, small_blind_amount, ante_amount, table):
+  def start_new_round(self, round_count, small_blind_amount, ante_amount, table, headless=False):
     _state = self.__gen_initial_state(round_count, small_blind_amount, table)
     state = self.__deep_copy_state(_state)
     table = state["table"]
@@ -20,26 +22,56 @@ class RoundManager:
     self.__correct_ante(ante_amount, table.seats.players)
     self.__correct_blind(small_blind_amount, table)
     self.__deal_holecard(table.deck, table.seats.players)
-    start_msg = self.__round_start_message(round_count, table)
-    state, street_msgs = self.__start_street(state)
+    start_msg = [] if headless else self.__round_start_message(round_count, table)
+    state, street_msgs = self.__start_street(state, headless)
     return state, start_msg + street_msgs
 
+  # in_place=True updates original_state itself instead of its copy and pushes
+  # an undo record on state["undo_log"] to rewind the action by undo(state).
+  # record_undo=False skips the record (e.g. for a throwaway rollout state).
   @classmethod
-  def apply_action(self, original_state, action, bet_amount):
-    state = self.__deep_copy_state(original_state)
+  def apply_action(self, original_state, action, bet_amount, in_place=False, headless=False, record_undo=True):
+    if in_place:
+      state = original_state
+      if record_undo:
+        state.setdefault("undo_log", []).append(self.__gen_undo_record(state))
+    else:
+      state = self.__deep_copy_state(original_state)
     state = self.__update_state_by_action(state, action, bet_amount)
-    update_msg = self.__update_message(state, action, bet_amount)
+    update_msg = [] if headless else [self.__update_message(state, action, bet_amount)]
     if self.__is_everyone_agreed(state):
       [player.save_street_action_histories(state["street"]) for player in state["table"].seats.players]
       state["street"] += 1
-      state, street_msgs = self.__start_street(state)
-      return state, [update_msg] + street_msgs
+      state, street_msgs = self.__start_street(state, headless)
+      return state, update_msg + street_msgs
     else:
       state["next_player"] = state["table"].next_ask_waiting_player_pos(state["next_player"])
+      if headless: return state, []
       next_player_pos = state["next_player"]
       next_player = state["table"].seats.players[next_player_pos]
       ask_message = (next_player.uuid, MessageBuilder.build_ask_message(next_player_pos, state))
-      return state, [update_msg, ask_message]
+      return state, update_msg + [ask_message]
+
+  # restores the state to before the last action applied with in_place=True
+  @classmethod
+  def undo(self, state):
+    if not state.get("undo_log"):
+      raise ValueError("No action to undo")
+    street, next_player, table_record, player_records = state["undo_log"].pop()
+    state["street"] = street
+    state["next_player"] = next_player
+    table = state["table"]
+    deck_snapshot, community_card, community_size = table_record
+    table.deck.rollback(deck_snapshot)
+    table._community_card = community_card[:community_size]
+    for player, record in zip(table.seats.players, player_records):
+      stack, hole_card_ids, pay_amount, pay_status, histories, history_size, round_histories = record
+      player.stack = stack
+      player.hole_card_ids = hole_card_ids
+      player.pay_info = PayInfo(pay_amount, pay_status)
+      player.action_histories = histories[:history_size]
+      player.round_action_histories = round_histories
+    return state
 
   @classmethod
   def __correct_ante(self, ante_amount, players):
@@ -66,56 +98,57 @@ class RoundManager:
   @classmethod
   def __deal_holecard(self, deck, players):
     for player in players:
-      player.add_holecard(deck.draw_cards(2))
+      player.add_holecard_ids(deck.draw_card_ids(2))
 
   @classmethod
-  def __start_street(self, state):
+  def __start_street(self, state, headless=False):
     next_player_pos = state["table"].next_ask_waiting_player_pos(state["table"].sb_pos()-1)
     state["next_player"] = next_player_pos
     street = state["street"]
     if street == Const.Street.PREFLOP:
-      return self.__preflop(state)
+      return self.__preflop(state, headless)
     elif street == Const.Street.FLOP:
-      return self.__flop(state)
+      return self.__flop(state, headless)
     elif street == Const.Street.TURN:
-      return self.__turn(state)
+      return self.__turn(state, headless)
     elif street == Const.Street.RIVER:
-      return self.__river(state)
+      return self.__river(state, headless)
     elif street == Const.Street.SHOWDOWN:
-      return self.__showdown(state)
+      return self.__showdown(state, headless)
     else:
       raise ValueError("Street is already finished [street = %d]" % street)
 
   @classmethod
-  def __preflop(self, state):
+  def __preflop(self, state, headless):
     for i in range(2):
       state["next_player"] = state["table"].next_ask_waiting_player_pos(state["next_player"])
-    return self.__forward_street(state)
+    return self.__forward_street(state, headless)
 
   @classmethod
-  def __flop(self, state):
-    for card in state["table"].deck.draw_cards(3):
-      state["table"].add_community_card(card)
-    return self.__forward_street(state)
+  def __flop(self, state, headless):
+    for card_id in state["table"].deck.draw_card_ids(3):
+      state["table"].add_community_card_id(card_id)
+    return self.__forward_street(state, headless)
 
   @classmethod
-  def __turn(self, state):
-    state["table"].add_community_card(state["table"].deck.draw_card())
-    return self.__forward_street(state)
+  def __turn(self, state, headless):
+    state["table"].add_community_card_id(state["table"].deck.draw_card_id())
+    return self.__forward_street(state, headless)
 
   @classmethod
-  def __river(self, state):
-    state["table"].add_community_card(state["table"].deck.draw_card())
-    return self.__forward_street(state)
+  def __river(self, state, headless):
+    state["table"].add_community_card_id(state["table"].deck.draw_card_id())
+    return self.__forward_street(state, headless)
 
   @classmethod
-  def __showdown(self, state):
+  def __showdown(self, state, headless):
     winners, hand_info, prize_map = GameEvaluator.judge(state["table"])
     self.__prize_to_winners(state["table"].seats.players, prize_map)
-    result_message = MessageBuilder.build_round_result_message(state["round_count"], winners, hand_info, state)
+    result_message = [] if headless else\
+        [(-1, MessageBuilder.build_round_result_message(state["round_count"], winners, hand_info, state))]
     state["table"].reset()
     state["street"] += 1
-    return state, [(-1, result_message)]
+    return state, result_message
 
   @classmethod
   def __prize_to_winners(self, players, prize_map):
@@ -129,14 +162,16 @@ class RoundManager:
     return reduce(lambda acc, idx: acc + [gen_msg(idx)], range(len(players)), [])
 
   @classmethod
-  def __forward_street(self, state):
+  def __forward_street(self, state, headless):
     table = state["table"]
-    street_start_msg = [(-1, MessageBuilder.build_street_start_message(state))]
+    street_start_msg = [] if headless else [(-1, MessageBuilder.build_street_start_message(state))]
     if table.seats.count_active_players() == 1: street_start_msg = []
     if table.seats.count_ask_wait_players() <= 1:
       state["street"] += 1
-      state, messages = self.__start_street(state)
+      state, messages = self.__start_street(state, headless)
       return state, street_start_msg + messages
+    elif headless:
+      return state, []
     else:
       next_player_pos = state["next_player"]
       next_player = table.seats.players[next_player_pos]
@@ -219,9 +254,23 @@ class RoundManager:
         "table": table
     }
 
+  # An action changes the players and draws at most 5 cards (all-in run out) from
+  # the deck. Lists which the action may append to or replace (e.g. by table.reset)
+  # are kept by reference with their size. undo rebuilds them instead of changing
+  # the recorded lists, which copies of the state taken later may share.
+  @classmethod
+  def __gen_undo_record(self, state):
+    table = state["table"]
+    table_record = (table.deck.snapshot(), table._community_card, len(table._community_card))
+    player_records = [(
+      player.stack, player.hole_card_ids, player.pay_info.amount, player.pay_info.status,
+      player.action_histories, len(player.action_histories), player.round_action_histories[::]
+      ) for player in table.seats.players]
+    return (state["street"], state["next_player"], table_record, player_records)
+
   @classmethod
   def __deep_copy_state(self, state):
-    table_deepcopy = Table.deserialize(state["table"].serialize())
+    table_deepcopy = state["table"].copy()
     return {
         "round_count": state["round_count"],
         "small_blind_amount": state["small_blind_amount"],
@@ -1,7 +1,9 @@
 from pypokerengine.engine.pay_info import PayInfo
 from pypokerengine.engine.player import Player
 
-class Seats:
+class Seats(object):
+
+  __slots__ = ["players"]
 
   def __init__(self):
     self.players = []
@@ -18,6 +20,11 @@ class Seats:
   def count_ask_wait_players(self):
     return len([p for p in self.players if p.is_waiting_ask()])
 
+  def copy(self):
+    seats = self.__class__()
+    seats.players = [player.copy() for player in self.players]
+    return seats
+
   def serialize(self):
     return [player.serialize() for player in self.players]
 
@@ -2,14 +2,20 @@ from pypokerengine.engine.card import Card
 from pypokerengine.engine.seats import Seats
 from pypokerengine.engine.deck import Deck
 
-class Table:
+class Table(object):
 
-  def __init__(self, cheat_deck=None):
+  __slots__ = ["dealer_btn", "_blind_pos", "seats", "deck", "_community_card", "_pot_cache",
+      "_encoded_payload"]
+
+  # rng is used to shuffle the deck (see Deck). It is ignored when cheat_deck is passed.
+  def __init__(self, cheat_deck=None, rng=None):
     self.dealer_btn = 0
     self._blind_pos = None
     self.seats = Seats()
-    self.deck = cheat_deck if cheat_deck else Deck()
+    self.deck = cheat_deck if cheat_deck else Deck(rng=rng)
     self._community_card = []
+    self._pot_cache = None  # (pay infos, pot structure) of GameEvaluator
+    self._encoded_payload = None  # (table version, TablePayload) of DataEncoder
 
   def set_blind_pos(self, sb_pos, bb_pos):
     self._blind_pos = [sb_pos, bb_pos]
@@ -22,17 +28,26 @@ class Table:
     if self._blind_pos is None: raise Exception("blind position is not yet set")
     return self._blind_pos[1]
 
+  # community card is held as card ids (see Card.to_id)
   def get_community_card(self):
+    return [Card.from_id(card_id) for card_id in self._community_card]
+
+  def get_community_card_ids(self):
     return self._community_card[::]
 
   def add_community_card(self, card):
+    self.add_community_card_id(card.to_id())
+
+  def add_community_card_id(self, card_id):
     if len(self._community_card) == 5:
       raise ValueError(self.__exceed_card_size_msg)
-    self._community_card.append(card)
+    self._community_card.append(card_id)
 
   def reset(self):
     self.deck.restore()
     self._community_card = []
+    self._pot_cache = None
+    self._encoded_payload = None
     for player in self.seats.players:
       player.clear_holecard()
       player.clear_action_histories()
@@ -47,17 +62,27 @@ class Table:
   def next_ask_waiting_player_pos(self, start_pos):
     return self.__find_entitled_player_pos(start_pos, lambda player: player.is_waiting_ask())
 
+  # Copy without serialization. The deck is shared until it is drawn or shuffled.
+  def copy(self):
+    table = self.__class__(cheat_deck=self.deck.copy())
+    table.dealer_btn = self.dealer_btn
+    table.seats = self.seats.copy()
+    table._community_card = self._community_card[::]
+    table._blind_pos = self._blind_pos
+    table._pot_cache = self._pot_cache
+    table._encoded_payload = self._encoded_payload
+    return table
+
   def serialize(self):
-    community_card = [card.to_id() for card in self._community_card]
     return [
         self.dealer_btn, Seats.serialize(self.seats),
-        Deck.serialize(self.deck), community_card, self._blind_pos
+        Deck.serialize(self.deck), self._community_card[::], self._blind_pos
     ]
 
   @classmethod
   def deserialize(self, serial):
     deck = Deck.deserialize(serial[2])
-    community_card = [Card.from_id(cid) for cid in serial[3]]
+    community_card = serial[3][::]
     table = self(cheat_deck=deck)
     table.dealer_btn = serial[0]
     table.seats = Seats.deserialize(serial[1])
@@ -1,26 +1,328 @@
+import atexit
+import bisect
+import hashlib
+import json
+import math
+import os
 import random
+from collections import OrderedDict
+from itertools import combinations, permutations, product
+
+try:
+    import numpy as np
+except ImportError:  # numpy is needed only by the batch mode
+    np = None
 
 from pypokerengine.engine.card import Card
+from pypokerengine.engine.card_set import CardSet
 from pypokerengine.engine.deck import Deck
-from pypokerengine.engine.hand_evaluator import HandEvaluator
+from pypokerengine.engine.hand_evaluator import HandEvaluator, HandRankTable
 
 def gen_cards(cards_str):
     return [Card.from_str(s) for s in cards_str]
 
-def estimate_hole_card_win_rate(nb_simulation, nb_player, hole_card, community_card=None):
+EXACT_ENUMERATION_BUDGET = 50000
+
+# batch=True draws every simulation at once as numpy arrays and evaluates them by
+# array lookups. rng (seed, random.Random or numpy.random.Generator in batch mode)
+# makes the result reproducible. Without rng the random module is used.
+# exact=True returns calc_hole_card_equity instead of sampling when the number of
+# outcomes to enumerate is not more than exact_budget. Otherwise a tie counts as
+# a win, but with exact=True the sampled ties are split as calc_hole_card_equity does.
+# On preflop the win rate is read from the preflop equity table when it has the
+# entry (pass preflop_table=False to always simulate).
+# cache (EquityCache) memoizes the result by suit isomorphic situation.
+def estimate_hole_card_win_rate(nb_simulation, nb_player, hole_card, community_card=None,
+        batch=False, rng=None, exact=False, exact_budget=EXACT_ENUMERATION_BUDGET, preflop_table=True, cache=None):
+    if not community_card: community_card = []
+    use_exact = exact and count_equity_combinations(nb_player, hole_card, community_card) <= exact_budget
+    if cache is not None:
+        mode = ("exact",) if use_exact else ("batch" if batch else "montecarlo", nb_simulation, exact)
+        key = (gen_canonical_key(hole_card, community_card), nb_player, mode)
+        win_rate = cache.get(key)
+        if win_rate is None:
+            win_rate = estimate_hole_card_win_rate(nb_simulation, nb_player, hole_card, community_card,
+                    batch=batch, rng=rng, exact=exact, exact_budget=exact_budget, preflop_table=preflop_table)
+            cache.put(key, win_rate)
+        return win_rate
+    if use_exact:
+        return calc_hole_card_equity(nb_player, hole_card, community_card)[0]
+    if preflop_table and len(community_card) == 0:
+        win_rate = lookup_preflop_win_rate(nb_player, hole_card)
+        if win_rate is not None: return win_rate
+    count_win = _count_win_by_batches if batch else _count_win_by_montecarlo
+    return 1.0 * count_win(nb_simulation, nb_player, hole_card, community_card, rng, split_ties=exact) / nb_simulation
+
+ADAPTIVE_CHUNK_SIZE = 100
+
+# Runs the simulation in chunks of chunk_size trials and stops when the Wilson
+# score interval of the win rate (at the given confidence) gets narrower than
+# width or stops containing threshold (e.g. 1.0 / nb_player), or when
+# max_simulation trials are done.
+# Returns (win_rate, (lower, upper), nb_trial). On preflop the win rate of the
+# preflop equity table is returned as (win_rate, (win_rate, win_rate), 0).
+def estimate_hole_card_win_rate_adaptive(max_simulation, nb_player, hole_card, community_card=None,
+        threshold=None, width=0.02, confidence=0.95, chunk_size=ADAPTIVE_CHUNK_SIZE, batch=False, rng=None,
+        preflop_table=True):
     if not community_card: community_card = []
-    win_count = sum([_montecarlo_simulation(nb_player, hole_card, community_card) for _ in range(nb_simulation)])
+    if max_simulation <= 0: raise ValueError("max_simulation must be positive")
+    if preflop_table and len(community_card) == 0:
+        win_rate = lookup_preflop_win_rate(nb_player, hole_card)
+        if win_rate is not None: return win_rate, (win_rate, win_rate), 0
+    z = _normal_quantile(0.5 + confidence / 2.0)
+    if batch:
+        _check_numpy()
+        rng = np.random.default_rng(rng)
+        hole_ids = [card.to_id() for card in hole_card]
+        community_ids = [card.to_id() for card in community_card]
+        unused_ids = (CardSet.full() - CardSet.from_ids(hole_ids + community_ids)).to_ids()
+        count_win = lambda nb_trial: _count_win_by_batch(nb_trial, nb_player, hole_ids, community_ids, unused_ids, rng)
+    else:
+        rng = _to_random(rng)
+        count_win = lambda nb_trial: sum([_montecarlo_simulation(nb_player, hole_card, community_card, rng) for _ in range(nb_trial)])
+    win_count = nb_done = 0
+    while nb_done < max_simulation:
+        nb_trial = min(chunk_size, max_simulation - nb_done)
+        win_count += count_win(nb_trial)
+        nb_done += nb_trial
+        lower, upper = _wilson_interval(win_count, nb_done, z)
+        if upper - lower <= width: break
+        if threshold is not None and not lower <= threshold <= upper: break
+    return 1.0 * win_count / nb_done, (lower, upper), nb_done
+
+PARALLEL_CHUNK_SIZE = 1000
+
+# Trials are split into chunks of chunk_size and each chunk draws from its own
+# random stream derived from (seed, chunk index). So the result for a seed does
+# not depend on the number of workers.
+def estimate_hole_card_win_rate_parallel(nb_simulation, nb_player, hole_card, community_card=None,
+        workers=None, seed=None, batch=False, chunk_size=PARALLEL_CHUNK_SIZE):
+    if not community_card: community_card = []
+    if seed is None: seed = int(hashlib.sha256(os.urandom(16)).hexdigest()[:16], 16)
+    hole_ids = [card.to_id() for card in hole_card]
+    community_ids = [card.to_id() for card in community_card]
+    tasks = []
+    for chunk_index, start in enumerate(range(0, nb_simulation, chunk_size)):
+        nb_trial = min(chunk_size, nb_simulation - start)
+        chunk_seed = _derive_chunk_seed(seed, chunk_index)
+        tasks.append((nb_trial, nb_player, hole_ids, community_ids, batch, chunk_seed))
+    win_count = sum(_get_worker_pool(workers).map(_simulate_chunk, tasks))
     return 1.0 * win_count / nb_simulation
 
+def shutdown_worker_pool():
+    for pool in _WORKER_POOLS.values():
+        pool.shutdown()
+    _WORKER_POOLS.clear()
+
+def calc_hole_card_equity(nb_player, hole_card, community_card=None):
+    """Enumerate every board completion and opponents hole card combination
+
+    Returns (equity, nb_combination). Ties are counted as split pots, so
+    equity is the expected share of the pot against nb_player-1 random hands.
+    """
+    if not community_card: community_card = []
+    hole_ids = [card.to_id() for card in hole_card]
+    community_ids = [card.to_id() for card in community_card]
+    unused_ids = (CardSet.full() - CardSet.from_ids(hole_ids + community_ids)).to_ids()
+    all_hands = [(CardSet.from_ids(hand).mask, _hole_flg(hand)) for hand in combinations(unused_ids, 2)]
+    equity, nb_combination = 0.0, 0
+    for fill_ids in combinations(unused_ids, 5 - len(community_ids)):
+        board_ids = community_ids + list(fill_ids)
+        board_mask = CardSet.from_ids(board_ids).mask
+        my_score = HandEvaluator.eval_hand_ids(hole_ids, board_ids)
+        hands, scores = [], []
+        for hand_mask, hole_flg in all_hands:
+            if hand_mask & board_mask: continue
+            hands.append(hand_mask)
+            scores.append((HandRankTable.eval_mask(board_mask | hand_mask) or hole_flg) << 8 | hole_flg)
+        for opponents in _gen_disjoint_hands(hands, nb_player - 1):
+            nb_combination += 1
+            best_score = max([scores[i] for i in opponents])
+            if my_score > best_score:
+                equity += 1
+            elif my_score == best_score:
+                equity += 1.0 / (1 + [scores[i] for i in opponents].count(best_score))
+    return equity / nb_combination, nb_combination
+
+def count_equity_combinations(nb_player, hole_card, community_card=None):
+    nb_fill = 5 - len(community_card or [])
+    nb_unused = 52 - len(hole_card) - (5 - nb_fill)
+    nb_combination = _comb(nb_unused, nb_fill)
+    nb_rest = nb_unused - nb_fill
+    for i in range(nb_player - 1):
+        nb_combination *= _comb(nb_rest - 2 * i, 2)
+    for i in range(2, nb_player):
+        nb_combination //= i
+    return nb_combination
+
+# Returns (hole card strs, community card strs) which is the same for every
+# situation that differs only by a permutation of suits (and the card order).
+def gen_canonical_key(hole_card, community_card=None):
+    hole_ids = [card.to_id() for card in hole_card]
+    community_ids = [card.to_id() for card in community_card or []]
+    canonical = None
+    for suit_order in _SUIT_PERMUTATIONS:
+        permute = lambda cid: suit_order[(cid - 1) // 13] * 13 + (cid - 1) % 13 + 1
+        candidate = (tuple(sorted([permute(cid) for cid in hole_ids])), tuple(sorted([permute(cid) for cid in community_ids])))
+        if canonical is None or candidate < canonical: canonical = candidate
+    return tuple([tuple([str(Card.from_id(cid)) for cid in ids]) for ids in canonical])
+
+_SUIT_PERMUTATIONS = list(permutations(range(4)))
+
+DEFAULT_EQUITY_CACHE_SIZE = 10000
+
+class EquityCache(object):
+    """Bounded LRU cache of equity estimation results
+
+    hits, misses and evictions count the cache usage since creation (or clear).
+    """
+
+    def __init__(self, maxsize=DEFAULT_EQUITY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.clear()
+
+    def get(self, key):
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        value = self.entries.pop(key)
+        self.entries[key] = value
+        return value
+
+    def put(self, key, value):
+        if key in self.entries:
+            self.entries.pop(key)
+        elif len(self.entries) >= self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        self.entries[key] = value
+
+    def clear(self):
+        self.entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self.entries),
+                "maxsize": self.maxsize
+                }
+
+EQUITY_CACHE = EquityCache()
+
+PREFLOP_EQUITY_TABLE_PATH = os.path.join(os.path.dirname(__file__), "data", "preflop_equity.json")
+PREFLOP_EQUITY_TABLE_FORMAT = "pypokerengine-preflop-equity"
+PREFLOP_EQUITY_TABLE_VERSION = 1
+HAND_CLASS_RANKS = "AKQJT98765432"
+
+# 169 starting hand classes like "AA", "AKs" (suited) and "AKo" (offsuit)
+def gen_hand_classes():
+    classes = []
+    for i, high in enumerate(HAND_CLASS_RANKS):
+        for low in HAND_CLASS_RANKS[i:]:
+            classes += [high + low] if high == low else [high + low + "s", high + low + "o"]
+    return classes
+
+def hand_class(hole_card):
+    high, low = sorted(hole_card, key=lambda card: card.rank, reverse=True)
+    ranks = Card.RANK_MAP[high.rank] + Card.RANK_MAP[low.rank]
+    if high.rank == low.rank: return ranks
+    return ranks + ("s" if high.suit == low.suit else "o")
+
+def lookup_preflop_win_rate(nb_player, hole_card):
+    table = _load_default_preflop_table()
+    return table["win_rate"].get(str(nb_player), {}).get(hand_class(hole_card))
+
+def gen_preflop_equity_table(nb_simulation, nb_players=range(2, 11), seed=None, batch=None):
+    """Simulate the win rate of every hand class for each number of players
+
+    The shipped table was generated by
+      save_preflop_equity_table(gen_preflop_equity_table(50000, seed=1), PREFLOP_EQUITY_TABLE_PATH)
+    """
+    if batch is None: batch = np is not None
+    rng = np.random.default_rng(seed) if batch else random.Random(seed)
+    win_rate = {}
+    for nb_player in nb_players:
+        win_rate[str(nb_player)] = { hand: estimate_hole_card_win_rate(
+            nb_simulation, nb_player, _representative_hole_card(hand),
+            batch=batch, rng=rng, preflop_table=False) for hand in gen_hand_classes() }
+    return {
+            "format": PREFLOP_EQUITY_TABLE_FORMAT,
+            "version": PREFLOP_EQUITY_TABLE_VERSION,
+            "nb_simulation": nb_simulation,
+            "win_rate": win_rate
+            }
+
+def save_preflop_equity_table(table, path):
+    with open(path, "w") as f:
+        json.dump(table, f, indent=1, sort_keys=True)
+
+def load_preflop_equity_table(path):
+    with open(path) as f:
+        table = json.load(f)
+    if table.get("format") != PREFLOP_EQUITY_TABLE_FORMAT or table.get("version") != PREFLOP_EQUITY_TABLE_VERSION:
+        raise ValueError("%s is not a preflop equity table of version %d" % (path, PREFLOP_EQUITY_TABLE_VERSION))
+    return table
+
+# table=None restores the shipped table
+def set_preflop_equity_table(table):
+    _PREFLOP_TABLE.clear()
+    if table: _PREFLOP_TABLE.update(table)
+
+# A hand range maps hole card combos (pair of card strs like ("SA", "HA")) to
+# their weights. hands are hand classes like "AA", "AKs", "AKo" or "AK" (both).
+def gen_hand_range(hands, weight=1.0):
+    hand_range = {}
+    for hand in hands:
+        high, low, suited = hand[0], hand[1], hand[2:]
+        if high not in HAND_CLASS_RANKS or low not in HAND_CLASS_RANKS or suited not in ("", "s", "o"):
+            raise ValueError("unknown hand class %s" % hand)
+        for high_suit, low_suit in product("CDHS", repeat=2):
+            if high == low and high_suit >= low_suit: continue
+            if suited == "s" and high_suit != low_suit: continue
+            if suited == "o" and high_suit == low_suit: continue
+            hand_range[(high_suit + high, low_suit + low)] = weight
+    return hand_range
+
+def calc_range_equity(hand_ranges, community_card=None, dead_card=None, nb_simulation=10000,
+        exact_budget=EXACT_ENUMERATION_BUDGET, batch=None, rng=None):
+    """Equity of each player whose hole card is drawn from its hand range
+
+    Combos blocked by community_card and dead_card are removed and the rest of
+    the weights are renormalized (combos of different players which share a
+    card are never dealt together). Every outcome is enumerated when there are
+    not more than exact_budget of them, otherwise nb_simulation deals are
+    sampled (as numpy arrays when batch, which defaults to numpy is installed).
+    Ties are counted as split pots. Returns the list of equities.
+    """
+    community_ids = [card.to_id() for card in community_card or []]
+    dead_mask = CardSet.from_ids(community_ids + [card.to_id() for card in dead_card or []]).mask
+    ranges = [_gen_range_combos(hand_range, dead_mask) for hand_range in hand_ranges]
+    nb_fill = 5 - len(community_ids)
+    nb_outcome = _comb(52 - CardSet(dead_mask).size() - 2 * len(ranges), nb_fill)
+    for combos in ranges:
+        nb_outcome *= len(combos)
+    if nb_outcome <= exact_budget:
+        return _calc_range_equity_exact(ranges, community_ids, dead_mask)
+    if batch is None: batch = np is not None
+    if batch:
+        return _calc_range_equity_by_batch(ranges, community_ids, dead_mask, nb_simulation, rng)
+    return _calc_range_equity_by_simulation(ranges, community_ids, dead_mask, nb_simulation, rng)
+
+MAX_RANGE_REJECTION_RATE = 100
+
 def gen_deck(exclude_cards=None):
-    deck_ids = range(1, 53)
+    deck_ids = CardSet.full()
     if exclude_cards:
         assert isinstance(exclude_cards, list)
         if isinstance(exclude_cards[0], str):
-            exclude_cards = [Card.from_str(s) for s in exclude_cards]
-        exclude_ids = [card.to_id() for card in exclude_cards]
-        deck_ids = [i for i in deck_ids if not i in exclude_ids]
-    return Deck(deck_ids)
+            deck_ids -= CardSet.from_str(exclude_cards)
+        else:
+            deck_ids -= CardSet.from_cards(exclude_cards)
+    return Deck(deck_ids.to_ids())
 
 def evaluate_hand(hole_card, community_card):
     assert len(hole_card)==2 and len(community_card)==5
@@ -30,21 +332,298 @@ def evaluate_hand(hole_card, community_card):
             "strength": HandEvaluator.eval_hand(hole_card, community_card)
             }
 
-def _montecarlo_simulation(nb_player, hole_card, community_card):
-    community_card = _fill_community_card(community_card, used_card=hole_card+community_card)
-    unused_cards = _pick_unused_card((nb_player-1)*2, hole_card + community_card)
+# 1 for a win and 0 for a loss. A tie is a win, or the share of the pot with split_ties.
+def _montecarlo_simulation(nb_player, hole_card, community_card, rng=random, split_ties=False):
+    community_card = _fill_community_card(community_card, used_card=hole_card+community_card, rng=rng)
+    unused_cards = _pick_unused_card((nb_player-1)*2, hole_card + community_card, rng)
     opponents_hole = [unused_cards[2*i:2*i+2] for i in range(nb_player-1)]
     opponents_score = [HandEvaluator.eval_hand(hole, community_card) for hole in opponents_hole]
     my_score = HandEvaluator.eval_hand(hole_card, community_card)
+    if split_ties and my_score == max(opponents_score):
+        return 1.0 / (1 + opponents_score.count(my_score))
     return 1 if my_score >= max(opponents_score) else 0
 
-def _fill_community_card(base_cards, used_card):
+def _count_win_by_montecarlo(nb_simulation, nb_player, hole_card, community_card, rng, split_ties=False):
+    rng = _to_random(rng)
+    return sum([_montecarlo_simulation(nb_player, hole_card, community_card, rng, split_ties) for _ in range(nb_simulation)])
+
+# yields index lists of nb_hand mutually disjoint hand masks (each set of hands only once)
+def _gen_disjoint_hands(hand_masks, nb_hand, start=0, used_mask=0):
+    if nb_hand == 0:
+        yield []
+        return
+    for i in range(start, len(hand_masks)):
+        hand_mask = hand_masks[i]
+        if used_mask & hand_mask: continue
+        for rest in _gen_disjoint_hands(hand_masks, nb_hand - 1, i + 1, used_mask | hand_mask):
+            yield [i] + rest
+
+def _hole_flg(hole_ids):
+    ranks = sorted([Card.from_id(cid).rank for cid in hole_ids])
+    return ranks[1] << 4 | ranks[0]
+
+def _comb(n, k):
+    if k < 0 or k > n: return 0
+    result = 1
+    for i in range(k):
+        result = result * (n - i) // (i + 1)
+    return result
+
+# returns [(hole_ids, hand_mask, weight)] of unblocked combos whose weights sum to 1
+def _gen_range_combos(hand_range, dead_mask):
+    combos = {}
+    for hole_card, weight in hand_range.items():
+        hole_ids = tuple([Card.from_str(s).to_id() for s in hole_card])
+        hand_mask = CardSet.from_ids(hole_ids).mask
+        if len(hole_ids) != 2 or CardSet(hand_mask).size() != 2:
+            raise ValueError("invalid hole card combo %s" % (hole_card,))
+        if hand_mask & dead_mask or weight <= 0: continue
+        combos[hand_mask] = (hole_ids, hand_mask, weight)
+    total_weight = sum([weight for _, _, weight in combos.values()])
+    if total_weight == 0:
+        raise ValueError("every combo of the hand range is blocked")
+    return [(hole_ids, hand_mask, 1.0 * weight / total_weight) for hole_ids, hand_mask, weight in sorted(combos.values())]
+
+def _calc_range_equity_exact(ranges, community_ids, dead_mask):
+    equity, total_weight = [0.0] * len(ranges), 0.0
+    for combos in product(*ranges):
+        used_mask, weight = dead_mask, 1.0
+        for _, hand_mask, combo_weight in combos:
+            if used_mask & hand_mask: break
+            used_mask |= hand_mask
+            weight *= combo_weight
+        else:
+            unused_ids = CardSet(CardSet.FULL_MASK & ~used_mask).to_ids()
+            fills = list(combinations(unused_ids, 5 - len(community_ids)))
+            for fill_ids in fills:
+                board_ids = community_ids + list(fill_ids)
+                scores = [HandEvaluator.eval_hand_ids(list(hole_ids), board_ids) for hole_ids, _, _ in combos]
+                _split_pot(equity, scores, weight / len(fills))
+            total_weight += weight
+    if total_weight == 0:
+        raise ValueError("hand ranges have no combination without shared cards")
+    return [e / total_weight for e in equity]
+
+def _calc_range_equity_by_simulation(ranges, community_ids, dead_mask, nb_simulation, rng):
+    rng = _to_random(rng)
+    cum_weights = [_accumulate([weight for _, _, weight in combos]) for combos in ranges]
+    equity, nb_done, nb_reject = [0.0] * len(ranges), 0, 0
+    while nb_done < nb_simulation:
+        combos = [combos[min(bisect.bisect(cum, rng.random() * cum[-1]), len(combos) - 1)]
+                for combos, cum in zip(ranges, cum_weights)]
+        used_mask = dead_mask
+        for _, hand_mask, _ in combos:
+            if used_mask & hand_mask: break
+            used_mask |= hand_mask
+        else:
+            unused_ids = CardSet(CardSet.FULL_MASK & ~used_mask).to_ids()
+            board_ids = community_ids + rng.sample(unused_ids, 5 - len(community_ids))
+            _split_pot(equity, [HandEvaluator.eval_hand_ids(list(hole_ids), board_ids) for hole_ids, _, _ in combos])
+            nb_done += 1
+            continue
+        nb_reject += 1
+        _check_range_rejection(nb_reject, nb_simulation)
+    return [e / nb_simulation for e in equity]
+
+def _split_pot(equity, scores, weight=1.0):
+    best_score = max(scores)
+    winners = [i for i, score in enumerate(scores) if score == best_score]
+    for i in winners:
+        equity[i] += weight / len(winners)
+
+def _accumulate(values):
+    total, accumulated = 0.0, []
+    for value in values:
+        total += value
+        accumulated.append(total)
+    return accumulated
+
+def _check_range_rejection(nb_reject, nb_simulation):
+    if nb_reject > MAX_RANGE_REJECTION_RATE * nb_simulation:
+        raise ValueError("hand ranges (almost) always share cards")
+
+def _representative_hole_card(hand):
+    low_suit = "S" if hand.endswith("s") else "H"
+    return gen_cards(["S" + hand[0], low_suit + hand[1]])
+
+def _load_default_preflop_table():
+    if not _PREFLOP_TABLE:
+        if os.path.exists(PREFLOP_EQUITY_TABLE_PATH):
+            _PREFLOP_TABLE.update(load_preflop_equity_table(PREFLOP_EQUITY_TABLE_PATH))
+        else:
+            _PREFLOP_TABLE.update({ "win_rate": {} })
+    return _PREFLOP_TABLE
+
+_PREFLOP_TABLE = {}
+
+def _fill_community_card(base_cards, used_card, rng=random):
     need_num = 5 - len(base_cards)
-    return base_cards + _pick_unused_card(need_num, used_card)
+    return base_cards + _pick_unused_card(need_num, used_card, rng)
 
-def _pick_unused_card(card_num, used_card):
-    used = [card.to_id() for card in used_card]
-    unused = [card_id for card_id in range(1, 53) if card_id not in used]
-    choiced = random.sample(unused, card_num)
+def _pick_unused_card(card_num, used_card, rng=random):
+    unused = (CardSet.full() - CardSet.from_cards(used_card)).to_ids()
+    choiced = rng.sample(unused, card_num)
     return [Card.from_id(card_id) for card_id in choiced]
 
+# None draws from the random module (so random.seed reproduces the result),
+# an int is a seed and random.Random-like objects are used as they are.
+def _to_random(rng):
+    if rng is None: return random
+    return rng if hasattr(rng, "sample") else random.Random(rng)
+
+def _wilson_interval(win_count, nb_trial, z):
+    p = 1.0 * win_count / nb_trial
+    denominator = 1 + z * z / nb_trial
+    center = (p + z * z / (2 * nb_trial)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / nb_trial + z * z / (4.0 * nb_trial * nb_trial)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+# inverse of the standard normal cdf (solved by bisection)
+def _normal_quantile(p):
+    lower, upper = -10.0, 10.0
+    for _ in range(64):
+        mid = (lower + upper) / 2
+        if 0.5 * (1 + math.erf(mid / math.sqrt(2))) < p:
+            lower = mid
+        else:
+            upper = mid
+    return (lower + upper) / 2
+
+def _simulate_chunk(task):
+    nb_trial, nb_player, hole_ids, community_ids, batch, chunk_seed = task
+    hole_card = [Card.from_id(cid) for cid in hole_ids]
+    community_card = [Card.from_id(cid) for cid in community_ids]
+    count_win = _count_win_by_batches if batch else _count_win_by_montecarlo
+    return count_win(nb_trial, nb_player, hole_card, community_card, chunk_seed)
+
+def _derive_chunk_seed(seed, chunk_index):
+    digest = hashlib.sha256(("%s:%d" % (seed, chunk_index)).encode("utf-8")).hexdigest()
+    return int(digest[:16], 16)
+
+def _get_worker_pool(workers):
+    if workers not in _WORKER_POOLS:
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+        except ImportError:  # Python 2 needs the futures backport only for the parallel mode
+            raise ImportError("concurrent.futures is required for estimate_hole_card_win_rate_parallel")
+        _WORKER_POOLS[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _WORKER_POOLS[workers]
+
+_WORKER_POOLS = {}
+atexit.register(shutdown_worker_pool)
+
+
+BATCH_CHUNK_SIZE = 10000
+
+def eval_hand_ids_batch(hole_ids, community_ids):
+    """Vectorized HandEvaluator.eval_hand_ids for 7 card hands
+
+    hole_ids is (N, 2) and community_ids is (N, 5) int array of card ids.
+    Returns (N,) int array which equals eval_hand of each row.
+    """
+    _check_numpy()
+    tables = _np_tables()
+    hole_ids, community_ids = np.asarray(hole_ids), np.asarray(community_ids)
+    card_ids = np.concatenate([hole_ids, community_ids], axis=-1)
+    mask = np.bitwise_or.reduce(np.left_shift(1, card_ids, dtype=np.int64), axis=-1)
+    rank_key = np.zeros(mask.shape, dtype=np.int64)
+    hand_flg = np.zeros(mask.shape, dtype=np.int64)
+    for suit in range(4):
+        suit_mask = (mask >> (13 * suit + 1)) & 8191
+        rank_key += tables["rank_key_of_mask"][suit_mask]
+        hand_flg = np.maximum(hand_flg, tables["flush_flg_of_mask"][suit_mask])
+    rank_pos = np.searchsorted(tables["rank_keys"], rank_key)
+    hand_flg = np.maximum(hand_flg, tables["rank_flgs"][rank_pos])
+    hole_ranks = tables["rank_of_id"][hole_ids]
+    hole_flg = hole_ranks.max(axis=-1) << 4 | hole_ranks.min(axis=-1)
+    return np.where(hand_flg == 0, hole_flg, hand_flg) << 8 | hole_flg
+
+def _count_win_by_batches(nb_simulation, nb_player, hole_card, community_card, rng, split_ties=False):
+    _check_numpy()
+    rng = np.random.default_rng(rng)
+    hole_ids = [card.to_id() for card in hole_card]
+    community_ids = [card.to_id() for card in community_card]
+    unused_ids = (CardSet.full() - CardSet.from_ids(hole_ids + community_ids)).to_ids()
+    win_count = 0
+    for start in range(0, nb_simulation, BATCH_CHUNK_SIZE):
+        nb_trial = min(BATCH_CHUNK_SIZE, nb_simulation - start)
+        win_count += _count_win_by_batch(nb_trial, nb_player, hole_ids, community_ids, unused_ids, rng, split_ties)
+    return win_count
+
+def _count_win_by_batch(nb_trial, nb_player, hole_ids, community_ids, unused_ids, rng, split_ties=False):
+    drawn = _draw_unused_ids_batch(rng, unused_ids, nb_trial, 5 - len(community_ids) + 2 * (nb_player - 1))
+    win_count = _count_win_batch(nb_player, hole_ids, community_ids, drawn, split_ties).sum()
+    return float(win_count) if split_ties else int(win_count)
+
+def _calc_range_equity_by_batch(ranges, community_ids, dead_mask, nb_simulation, rng):
+    _check_numpy()
+    rng = np.random.default_rng(rng)
+    hole_ids = [np.array([combo[0] for combo in combos], dtype=np.int64) for combos in ranges]
+    hand_masks = [np.array([combo[1] for combo in combos], dtype=np.int64) for combos in ranges]
+    weights = [np.array([combo[2] for combo in combos]) for combos in ranges]
+    deck = np.array(CardSet(CardSet.FULL_MASK & ~dead_mask).to_ids(), dtype=np.int64)
+    nb_fill = 5 - len(community_ids)
+    equity, nb_done, nb_reject = np.zeros(len(ranges)), 0, 0
+    while nb_done < nb_simulation:
+        nb_trial = min(BATCH_CHUNK_SIZE, nb_simulation - nb_done)
+        picks = [rng.choice(len(w), size=nb_trial, p=w / w.sum()) for w in weights]
+        masks = np.stack([m[pick] for m, pick in zip(hand_masks, picks)], axis=1)
+        used_mask = np.zeros(nb_trial, dtype=np.int64)
+        valid = np.ones(nb_trial, dtype=bool)
+        for i in range(len(ranges)):
+            valid &= used_mask & masks[:, i] == 0
+            used_mask |= masks[:, i]
+        nb_reject += nb_trial - int(valid.sum())
+        _check_range_rejection(nb_reject, nb_simulation)
+        if not valid.any(): continue
+        holes = np.stack([ids[pick[valid]] for ids, pick in zip(hole_ids, picks)], axis=1)
+        used_mask = used_mask[valid]
+        shuffled = rng.permuted(np.broadcast_to(deck, (len(used_mask), len(deck))), axis=1)
+        blocked = (used_mask[:, None] >> shuffled) & 1
+        fill = np.take_along_axis(shuffled, np.argsort(blocked, axis=1, kind="stable")[:, :nb_fill], axis=1)
+        known_community = np.tile(np.asarray(community_ids, dtype=np.int64).reshape(1, -1), (len(used_mask), 1))
+        community = np.concatenate([known_community, fill], axis=1)
+        scores = eval_hand_ids_batch(holes, np.broadcast_to(community[:, None, :], holes.shape[:2] + (5,)))
+        winners = scores == scores.max(axis=1)[:, None]
+        equity += (winners / winners.sum(axis=1)[:, None].astype(float)).sum(axis=0)
+        nb_done += len(used_mask)
+    return [float(e) / nb_simulation for e in equity]
+
+def _draw_unused_ids_batch(rng, unused_ids, nb_trial, nb_draw):
+    deck = np.broadcast_to(np.asarray(unused_ids, dtype=np.int64), (nb_trial, len(unused_ids)))
+    return rng.permuted(deck, axis=1)[:, :nb_draw]
+
+# drawn holds the missing community cards followed by the opponents hole cards of each trial.
+# Returns whether each trial is won (or the share of the pot with split_ties).
+def _count_win_batch(nb_player, hole_ids, community_ids, drawn, split_ties=False):
+    nb_trial = drawn.shape[0]
+    nb_fill = 5 - len(community_ids)
+    known_community = np.tile(np.asarray(community_ids, dtype=np.int64).reshape(1, -1), (nb_trial, 1))
+    community = np.concatenate([known_community, drawn[:, :nb_fill]], axis=1)
+    my_score = eval_hand_ids_batch(np.tile(np.asarray(hole_ids, dtype=np.int64), (nb_trial, 1)), community)
+    opponents_hole = drawn[:, nb_fill:].reshape(nb_trial, nb_player - 1, 2)
+    opponents_community = np.broadcast_to(community[:, None, :], (nb_trial, nb_player - 1, 5))
+    opponents_score = eval_hand_ids_batch(opponents_hole, opponents_community)
+    best_score = opponents_score.max(axis=1)
+    if not split_ties:
+        return my_score >= best_score
+    nb_tie = (opponents_score == my_score[:, None]).sum(axis=1)
+    return np.where(my_score > best_score, 1.0, np.where(my_score == best_score, 1.0 / (1 + nb_tie), 0.0))
+
+def _check_numpy():
+    if np is None:
+        raise ImportError("numpy is required for the batch mode of card_utils")
+
+def _np_tables():
+    if not _NP_TABLES:
+        rank_keys, rank_flgs = HandRankTable.rank_flg_table()
+        _NP_TABLES.update({
+            "rank_key_of_mask": np.array(HandRankTable.rank_key_of_mask(), dtype=np.int64),
+            "flush_flg_of_mask": np.array(HandRankTable.flush_flg_of_mask(), dtype=np.int64),
+            "rank_keys": np.array(rank_keys, dtype=np.int64),
+            "rank_flgs": np.array(rank_flgs, dtype=np.int64),
+            "rank_of_id": np.array([0] + [Card.from_id(cid).rank for cid in range(1, 53)], dtype=np.int64)
+            })
+    return _NP_TABLES
+
+_NP_TABLES = {}
@@ -1,4 +1,4 @@
-from functools import reduce
+import random
 
 from pypokerengine.engine.table import Table
 from pypokerengine.engine.seats import Seats
@@ -18,6 +18,20 @@ def restore_game_state(round_state):
             "table": _restore_table(round_state)
             }
 
+class GameStateTemplate(object):
+    """Game state restored from round_state once
+
+    new_game_state() stamps out a fresh game state (see deepcopy_game_state)
+    without parsing round_state again. Use it when the same round_state is
+    restored many times (e.g. once per simulation).
+    """
+
+    def __init__(self, round_state):
+        self.game_state = restore_game_state(round_state)
+
+    def new_game_state(self):
+        return deepcopy_game_state(self.game_state)
+
 def attach_hole_card_from_deck(game_state, uuid):
     deepcopy = deepcopy_game_state(game_state)
     hole_card = deepcopy["table"].deck.draw_cards(2)
@@ -29,6 +43,35 @@ def replace_community_card_from_deck(game_state):
     community_card = deepcopy["table"].deck.draw_cards(card_num)
     return replace_community_card(deepcopy, community_card)
 
+# Deals hole cards to every player in one copy of game_state and one pass over the deck.
+# hole_cards ({uuid: [Card, Card]}) are attached to the players as known cards, and the
+# other players who have no hole card get random cards. fill_community_card=True also
+# deals community cards up to 5 (e.g. to evaluate hands at once, the emulator cannot
+# deal next streets on it). Cards held by anyone are removed from the deck, and the rest
+# of it is shuffled by rng (random.Random, numpy.random.Generator or the random module).
+def attach_hole_cards_from_deck(game_state, hole_cards=None, fill_community_card=False, rng=None):
+    deepcopy = deepcopy_game_state(game_state)
+    table = deepcopy["table"]
+    players = table.seats.players
+    players_by_uuid = _index_players_by_uuid(players)
+    for uuid, cards in (hole_cards or {}).items():
+        if uuid not in players_by_uuid:
+            raise Exception('The player whose uuid is "%s" is not found in passed game_state.' % uuid)
+        players_by_uuid[uuid].hole_card = cards
+    used_card_ids = set(table._community_card)
+    for player in players:
+        used_card_ids.update(player.hole_card_ids)
+    deck_ids = [card_id for card_id in table.deck.deck if card_id not in used_card_ids]
+    (random if rng is None else rng).shuffle(deck_ids)
+    for player in players:
+        if len(player.hole_card_ids) == 0:
+            player.hole_card_ids = [deck_ids.pop(), deck_ids.pop()]
+    if fill_community_card:
+        for _ in range(5 - len(table._community_card)):
+            table.add_community_card_id(deck_ids.pop())
+    table.deck.deck = deck_ids
+    return deepcopy
+
 _street_community_card_num = {
         Const.Street.PREFLOP: 0,
         Const.Street.FLOP: 3,
@@ -46,11 +89,11 @@ def attach_hole_card(game_state, uuid, hole_card):
 
 def replace_community_card(game_state, community_card):
     deepcopy = deepcopy_game_state(game_state)
-    deepcopy["table"]._community_card = community_card
+    deepcopy["table"]._community_card = [card.to_id() for card in community_card]
     return deepcopy
 
 def deepcopy_game_state(game_state):
-    tabledeepcopy = Table.deserialize(game_state["table"].serialize())
+    tabledeepcopy = game_state["table"].copy()
     return {
             "round_count": game_state["round_count"],
             "small_blind_amount": game_state["small_blind_amount"],
@@ -71,32 +114,40 @@ def _restore_table(round_state):
     table = Table()
     table.dealer_btn = round_state["dealer_btn"]
     table.set_blind_pos(round_state["small_blind_pos"], round_state["big_blind_pos"])
-    _restore_community_card_on_table(table, round_state["community_card"])
-    table.deck = _restore_deck(round_state["community_card"])
+    community_card_ids = [Card.from_str(str_card).to_id() for str_card in round_state["community_card"]]
+    _restore_community_card_on_table(table, community_card_ids)
+    table.deck = _restore_deck(community_card_ids)
     table.seats = _restore_seats(round_state["seats"], round_state["action_histories"])
     return table
 
-def _restore_community_card_on_table(table, card_data):
-    for str_card in card_data:
-        table.add_community_card(Card.from_str(str_card))
+def _restore_community_card_on_table(table, card_ids):
+    for card_id in card_ids:
+        table.add_community_card_id(card_id)
+
+def _restore_deck(exclude_card_ids):
+    exclude_card_ids = set(exclude_card_ids)
+    return Deck(deck_ids=[card_id for card_id in _all_card_ids if card_id not in exclude_card_ids])
 
-def _restore_deck(str_exclude_cards):
-    deck = Deck()
-    exclude_ids = [Card.to_id(Card.from_str(s)) for s in str_exclude_cards]
-    deck_cards = [Card.from_id(cid) for cid in range(1, 53) if cid not in exclude_ids]
-    deck.deck = deck_cards
-    return deck
+_all_card_ids = list(range(1, 53))
 
 def _restore_seats(seats_info, action_histories):
     players = [Player(info["uuid"], info["stack"], info["name"]) for info in seats_info]
     players_state = [info["state"] for info in seats_info]
-    _restore_action_histories_on_players(players, action_histories)
-    _restore_pay_info_on_players(players, players_state, action_histories)
+    players_by_uuid = _index_players_by_uuid(players)
+    _restore_action_histories_on_players(players, players_by_uuid, action_histories)
+    _restore_pay_info_on_players(players, players_by_uuid, players_state, action_histories)
     seats = Seats()
     seats.players = players
     return seats
 
-def _restore_action_histories_on_players(players, round_action_histories):
+# The first player of each uuid is used when some players have the same uuid
+def _index_players_by_uuid(players):
+    players_by_uuid = {}
+    for player in players:
+        players_by_uuid.setdefault(player.uuid, player)
+    return players_by_uuid
+
+def _restore_action_histories_on_players(players, players_by_uuid, round_action_histories):
     ordered_street_names = sorted(round_action_histories.keys(), key=lambda x:_street_flg_translator[x])
     current_street_name = ordered_street_names[-1]
     past_street_names = ordered_street_names[:-1]
@@ -107,27 +158,20 @@ def _restore_action_histories_on_players(players, round_action_histories):
         action_histories = round_action_histories[street_name]
         for player in players: player.round_action_histories[street_flg] = []
         for action_history in action_histories:
-            player = _find_user_by_uuid(players, action_history["uuid"])
-            player.round_action_histories[street_flg].append(action_history)
+            players_by_uuid[action_history["uuid"]].round_action_histories[street_flg].append(action_history)
 
     # resotre action_histories
     for action_history in round_action_histories[current_street_name]:
-        player = _find_user_by_uuid(players, action_history["uuid"])
-        player.action_histories.append(action_history)
+        players_by_uuid[action_history["uuid"]].action_histories.append(action_history)
 
-def _restore_pay_info_on_players(players, players_state, round_action_histories):
+def _restore_pay_info_on_players(players, players_by_uuid, players_state, round_action_histories):
     _restore_pay_info_status_on_players(players, players_state)
-    _restore_pay_info_amount_on_players(players, round_action_histories)
+    _restore_pay_info_amount_on_players(players_by_uuid, round_action_histories)
 
-def _restore_pay_info_amount_on_players(players, round_action_histories):
-    ordered_street_names = sorted(round_action_histories.keys(), key=lambda x:_street_flg_translator[x])
-    all_histories = reduce(lambda ary, key: ary + round_action_histories[key], ordered_street_names, [])
-    for action_history in all_histories:
-        player = _find_user_by_uuid(players, action_history["uuid"])
-        player.pay_info.amount += _fetch_pay_amount(action_history)
-
-def _find_user_by_uuid(players, uuid):
-    return [player for player in players if player.uuid==uuid][0]
+def _restore_pay_info_amount_on_players(players_by_uuid, round_action_histories):
+    for action_histories in round_action_histories.values():
+        for action_history in action_histories:
+            players_by_uuid[action_history["uuid"]].pay_info.amount += _fetch_pay_amount(action_history)
 
 def _fetch_pay_amount(action_history):
     action = action_history["action"]
@@ -0,0 +1,165 @@
+"""Fixed width numeric encoding of game_state and round_state
+
+A state is encoded into one record of observation_dtype(nb_player) seen from
+one player (the viewer, next_player by default). Fields in the order of the
+layout (P = nb_player, seats beyond the table are padded as folded with 0 chips):
+
+    street      int8        PokerConstants.Street (FINISHED = 5)
+    player      int8        seat of the viewer (-1 = no one is asked, e.g. finished round)
+    dealer_btn  int8        seat of the dealer button
+    small_blind float32     small blind amount
+    pot         float32     chips in the pot (main pot + side pots)
+    stacks      float32[P]  stack of each seat
+    paid        float32[P]  chips each seat paid in this round
+    status      int8[P]     0 = participating, 1 = allin, 2 = folded (PayInfo)
+    hole_cards  int8[2]     card ids (see Card.to_id) of the viewer (0 = unknown)
+    board       int8[5]     card ids of community cards (0 = not dealt)
+
+flatten_observations turns the records into a float32 matrix of
+observation_width(nb_player) columns in the same order.
+"""
+try:
+    import numpy as np
+except ImportError:  # numpy is needed by every encoder in this module
+    np = None
+
+from pypokerengine.engine.card import Card
+from pypokerengine.engine.pay_info import PayInfo
+from pypokerengine.engine.poker_constants import PokerConstants as Const
+
+def observation_dtype(nb_player):
+    _check_numpy()
+    return np.dtype([
+        ("street", np.int8),
+        ("player", np.int8),
+        ("dealer_btn", np.int8),
+        ("small_blind", np.float32),
+        ("pot", np.float32),
+        ("stacks", np.float32, (nb_player,)),
+        ("paid", np.float32, (nb_player,)),
+        ("status", np.int8, (nb_player,)),
+        ("hole_cards", np.int8, (2,)),
+        ("board", np.int8, (5,))
+        ])
+
+def observation_width(nb_player):
+    return 5 + 3 * nb_player + 7
+
+def encode_game_state(game_state, nb_player=None, player_pos=None):
+    nb_player = nb_player or len(game_state["table"].seats.players)
+    return encode_game_states([game_state], nb_player, player_pos)[0]
+
+# Encodes game states into out (or a new array) of observation_dtype(nb_player).
+# The engine objects are read into plain lists which are written field by field,
+# so no dict is built for each state. player_pos is the viewer seat of every
+# state (next_player of each state by default).
+def encode_game_states(game_states, nb_player, player_pos=None, out=None):
+    out = _prepare_out(out, len(game_states), nb_player)
+    columns = _gen_columns()
+    for game_state in game_states:
+        table = game_state["table"]
+        players = table.seats.players
+        viewer = _fetch_viewer(game_state["next_player"], player_pos)
+        seats = [(p.stack, p.pay_info.amount, p.pay_info.status) for p in players]
+        hole_card = players[viewer].hole_card_ids if viewer != -1 else []
+        _append_columns(columns, nb_player, game_state["street"], viewer, table.dealer_btn,
+                game_state["small_blind_amount"], None, seats, hole_card, table._community_card)
+    return _write_columns(out, columns)
+
+# round_state does not have hole cards. Pass the viewer's hole_card (e.g. ["CA", "D2"]) to encode them.
+def encode_round_state(round_state, hole_card=None, nb_player=None, player_pos=None):
+    nb_player = nb_player or len(round_state["seats"])
+    return encode_round_states([round_state], nb_player, [hole_card], player_pos)[0]
+
+# hole_cards is the list of hole_card (of the viewer) of each state
+def encode_round_states(round_states, nb_player, hole_cards=None, player_pos=None, out=None):
+    out = _prepare_out(out, len(round_states), nb_player)
+    columns = _gen_columns()
+    for idx, round_state in enumerate(round_states):
+        viewer = _fetch_viewer(round_state["next_player"], player_pos)
+        paid = _fetch_paid_amounts(round_state["action_histories"])
+        seats = [(seat["stack"], paid.get(seat["uuid"], 0), _status_flg[seat["state"]]) for seat in round_state["seats"]]
+        pot = round_state["pot"]
+        pot_amount = pot["main"]["amount"] + sum([side["amount"] for side in pot["side"]])
+        hole_card = hole_cards[idx] if hole_cards and hole_cards[idx] and viewer != -1 else []
+        _append_columns(columns, nb_player, _street_flg.get(round_state["street"], Const.Street.FINISHED),
+                viewer, round_state["dealer_btn"], round_state["small_blind_amount"], pot_amount, seats,
+                [Card.from_str(card).to_id() for card in hole_card],
+                [Card.from_str(card).to_id() for card in round_state["community_card"]])
+    return _write_columns(out, columns)
+
+def flatten_observations(observations):
+    _check_numpy()
+    from numpy.lib import recfunctions
+    return recfunctions.structured_to_unstructured(observations, dtype=np.float32)
+
+def _prepare_out(out, size, nb_player):
+    if out is None:
+        return np.zeros(size, dtype=observation_dtype(nb_player))
+    if len(out) < size:
+        raise ValueError("out has only %d records for %d states" % (len(out), size))
+    return out
+
+_FIELDS = ["street", "player", "dealer_btn", "small_blind", "pot", "stacks", "paid", "status", "hole_cards", "board"]
+
+def _gen_columns():
+    return [[] for _ in _FIELDS]
+
+# next_player is "not_found" (or None) when no one is asked. It is encoded as -1.
+def _fetch_viewer(next_player, player_pos):
+    viewer = next_player if player_pos is None else player_pos
+    return viewer if isinstance(viewer, int) else -1
+
+# pot=None sums the paid amounts of the seats
+def _append_columns(columns, nb_player, street, viewer, dealer_btn, small_blind, pot, seats, hole_card, board):
+    _check_player_num(len(seats), nb_player)
+    padding = [(0, 0, PayInfo.FOLDED)] * (nb_player - len(seats))
+    stacks, paid, status = zip(*(seats + padding))
+    values = [street, viewer, dealer_btn, small_blind, sum(paid) if pot is None else pot,
+            stacks, paid, status, (list(hole_card) + [0, 0])[:2], list(board) + [0] * (5 - len(board))]
+    for column, value in zip(columns, values):
+        column.append(value)
+
+def _write_columns(out, columns):
+    size = len(columns[0])
+    if size == 0: return out
+    for field, column in zip(_FIELDS, columns):
+        out[field][:size] = column
+    return out
+
+# chips each player paid in this round : sum of the last paid amount of each street and antes
+def _fetch_paid_amounts(action_histories):
+    paid = {}
+    for histories in action_histories.values():
+        street_paid = {}
+        for history in histories:
+            uuid, action = history["uuid"], history["action"]
+            if action == "ANTE":
+                paid[uuid] = paid.get(uuid, 0) + history["amount"]
+            elif action != "FOLD":
+                street_paid[uuid] = history["amount"]
+        for uuid, amount in street_paid.items():
+            paid[uuid] = paid.get(uuid, 0) + amount
+    return paid
+
+def _check_player_num(nb_seat, nb_player):
+    if nb_seat > nb_player:
+        raise ValueError("The state has %d seats but the encoder is for %d players" % (nb_seat, nb_player))
+
+def _check_numpy():
+    if np is None:
+        raise ImportError("numpy is required for observation_utils")
+
+_street_flg = {
+        "preflop": Const.Street.PREFLOP,
+        "flop": Const.Street.FLOP,
+        "turn": Const.Street.TURN,
+        "river": Const.Street.RIVER,
+        "showdown": Const.Street.SHOWDOWN
+        }
+
+_status_flg = {
+        "participating": PayInfo.PAY_TILL_END,
+        "allin": PayInfo.ALLIN,
+        "folded": PayInfo.FOLDED
+        }
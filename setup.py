@@ -10,6 +10,12 @@ setup(
     keywords = 'python poker emgine ai',
     url = 'https://github.com/ishikota/PyPokerEngine',
     packages = [pkg for pkg in find_packages() if pkg != "tests"],
+    package_data = {
+        "pypokerengine.utils": ["data/*.json"],
+    },
+    extras_require = {
+        "numpy": ["numpy"],
+    },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "License :: OSI Approved :: MIT License",
@@ -1,6 +1,8 @@
+import random
 from collections import OrderedDict
 from functools import reduce
 
+from mock import patch
 from nose.tools import raises
 from tests.base_unittest import BaseUnitTest
 from pypokerengine.api.emulator import Emulator, Event
@@ -25,6 +27,25 @@ class EmulatorTest(BaseUnitTest):
         self.eq(5, self.emu.game_rule["sb_amount"])
         self.eq(3, self.emu.game_rule["ante"])
 
+    def test_seeded_emulators_deal_the_same_cards(self):
+        def deal(emulator):
+            emulator.set_game_rule(3, 10, 5, 0)
+            players_info = { "uuid-%d" % i: { "name": "p%d" % i, "stack": 100 } for i in range(3) }
+            game_state = emulator.generate_initial_game_state(players_info)
+            game_state, _ = emulator.start_new_round(game_state, headless=True)
+            return [player.hole_card_ids for player in game_state["table"].seats.players]
+        self.eq(deal(Emulator(seed=5)), deal(Emulator(seed=5)))
+
+    def test_seeded_emulators_deal_the_same_cards_on_restored_state(self):
+        def deal(emulator, global_seed):
+            emulator.set_game_rule(2, 10, 5, 0)
+            game_state = restore_game_state(TwoPlayerSample.round_state)
+            game_state["street"] = Const.Street.FINISHED
+            random.seed(global_seed)
+            game_state, _ = emulator.start_new_round(game_state, headless=True)
+            return [player.hole_card_ids for player in game_state["table"].seats.players]
+        self.eq(deal(Emulator(seed=5), 1), deal(Emulator(seed=5), 2))
+
     def test_register_and_fetch_player(self):
         p1, p2 = FoldMan(), FoldMan()
         self.emu.register_player("uuid-1", p1)
@@ -199,7 +220,7 @@ class EmulatorTest(BaseUnitTest):
         p2 = TestPlayer([("call", 15), ("call", 65)])
         self.emu.register_player("tojrbxmkuzrarnniosuhct", p1)
         self.emu.register_player("pwtwlmfciymjdoljkhagxa", p2)
-        game_state["table"].deck.deck.append(Card.from_str("C7"))
+        game_state["table"].deck.deck += [Card.from_str("C7").to_id()]
 
         game_state, events = self.emu.run_until_round_finish(game_state)
         self.eq("event_new_street", events[0]["type"])
@@ -235,7 +256,7 @@ class EmulatorTest(BaseUnitTest):
         p3_acts = [("raise", 10)]
         players = [TestPlayer(acts) for acts in [p1_acts, p2_acts, p3_acts]]
         [self.emu.register_player(uuid, player) for uuid, player in zip(uuids, players)]
-        game_state["table"].deck.deck.append(Card.from_str("C7"))
+        game_state["table"].deck.deck += [Card.from_str("C7").to_id()]
         game_state, events = self.emu.run_until_game_finish(game_state)
         self.eq("event_game_finish", events[-1]["type"])
         self.eq(0, game_state["table"].seats.players[0].stack)
@@ -250,7 +271,7 @@ class EmulatorTest(BaseUnitTest):
         sb_amount, ante = 5, 7
         self.emu.set_game_rule(3, 10, sb_amount, ante)
         [self.emu.register_player(uuid, FoldMan()) for uuid in uuids]
-        game_state["table"].deck.deck.append(Card.from_str("C7"))
+        game_state["table"].deck.deck += [Card.from_str("C7").to_id()]
         game_state, events = self.emu.run_until_game_finish(game_state)
         self.eq("event_game_finish", events[-1]["type"])
         self.eq(10, game_state["round_count"])
@@ -258,6 +279,52 @@ class EmulatorTest(BaseUnitTest):
         self.eq(0, game_state["table"].seats.players[1].stack)
         self.eq(265, game_state["table"].seats.players[2].stack)
 
+    def test_run_until_game_finish_headless(self):
+        uuids = ["ruypwwoqwuwdnauiwpefsw", "sqmfwdkpcoagzqxpxnmxwm", "uxrdiwvctvilasinweqven"]
+        holecards = [[Card.from_str(s) for s in ss] for ss in [["C2","C3"],["HA","CA"],["D5","H6"]]]
+        game_state = restore_game_state(ThreePlayerGameStateSample.round_state)
+        game_state = reduce(lambda state, item: attach_hole_card(state, item[0], item[1]), zip(uuids, holecards), game_state)
+        self.emu.set_game_rule(3, 10, 5, 7)
+        p1_acts = [("fold",0), ("call", 10), ('call', 0), ('call', 10), ("fold",0)]
+        players = [TestPlayer(acts) for acts in [p1_acts, [], [("raise", 10)]]]
+        [self.emu.register_player(uuid, player) for uuid, player in zip(uuids, players)]
+        game_state["table"].deck.deck += [Card.from_str("C7").to_id()]
+        with patch('pypokerengine.engine.message_builder.MessageBuilder.build_game_update_message') as update_message,\
+             patch('pypokerengine.engine.message_builder.MessageBuilder.build_round_result_message') as result_message:
+            game_state, events = self.emu.run_until_game_finish(game_state, headless=True)
+            self.false(update_message.called)
+            self.false(result_message.called)
+        self.eq([], events)
+        self.eq([0, 0, 292], [p.stack for p in game_state["table"].seats.players])
+
+    def test_run_until_game_finish_headless_when_final_round(self):
+        uuids = ["ruypwwoqwuwdnauiwpefsw", "sqmfwdkpcoagzqxpxnmxwm", "uxrdiwvctvilasinweqven"]
+        holecards = [[Card.from_str(s) for s in ss] for ss in [["C2","C3"],["HA","CA"],["D5","H6"]]]
+        game_state = restore_game_state(ThreePlayerGameStateSample.round_state)
+        game_state = reduce(lambda state, item: attach_hole_card(state, item[0], item[1]), zip(uuids, holecards), game_state)
+        self.emu.set_game_rule(3, 10, 5, 7)
+        [self.emu.register_player(uuid, FoldMan()) for uuid in uuids]
+        game_state["table"].deck.deck += [Card.from_str("C7").to_id()]
+        game_state, events = self.emu.run_until_game_finish(game_state, headless=True)
+        self.eq([], events)
+        self.eq(10, game_state["round_count"])
+        self.eq([35, 0, 265], [p.stack for p in game_state["table"].seats.players])
+
+    def test_apply_action_headless(self):
+        game_state = restore_game_state(TwoPlayerSample.round_state)
+        game_state = attach_hole_card_from_deck(game_state, "tojrbxmkuzrarnniosuhct")
+        game_state = attach_hole_card_from_deck(game_state, "pwtwlmfciymjdoljkhagxa")
+        self.emu.set_game_rule(2, 4, 5, 0)
+        self.emu.register_player("tojrbxmkuzrarnniosuhct", FoldMan())
+        self.emu.register_player("pwtwlmfciymjdoljkhagxa", FoldMan())
+        game_state, events = self.emu.apply_action(game_state, "fold", headless=True)
+        self.eq([], events)
+        self.eq(Const.Street.FINISHED, game_state["street"])
+        game_state, events = self.emu.apply_action(game_state, "raise", 20, headless=True)
+        self.eq([], events)
+        self.eq(100, game_state["table"].seats.players[0].stack)
+        self.eq(70, game_state["table"].seats.players[1].stack)
+
     def test_last_round_judge(self):
         game_state = restore_game_state(TwoPlayerSample.round_state)
         self.emu.set_game_rule(2, 3, 5, 0)
@@ -269,6 +336,18 @@ class EmulatorTest(BaseUnitTest):
         game_state["table"].seats.players[0].stack = 0
         self.true(self.emu._is_last_round(game_state, self.emu.game_rule))
 
+    def test_public_game_finish_judges(self):
+        game_state = restore_game_state(TwoPlayerSample.round_state)
+        self.emu.set_game_rule(2, 3, 5, 0)
+        game_state["street"] = Const.Street.FINISHED
+        game_state["round_count"] = 2
+        self.false(self.emu.is_last_round(game_state))
+        self.false(self.emu.is_game_finished(game_state))
+        game_state["table"].seats.players[0].stack = 0
+        game_state["table"].seats.players[0].pay_info.update_to_fold()
+        self.true(self.emu.is_last_round(game_state))
+        self.true(self.emu.is_game_finished(game_state))
+
     def test_start_new_round(self):
         game_state = restore_game_state(TwoPlayerSample.round_state)
         game_state = attach_hole_card_from_deck(game_state, "tojrbxmkuzrarnniosuhct")
@@ -3,6 +3,9 @@ import pypokerengine.api.game as G
 from nose.tools import raises
 from tests.base_unittest import BaseUnitTest
 from examples.players.fold_man import FoldMan
+from examples.players.fish_player import FishPlayer
+from examples.players.random_player import RandomPlayer
+from pypokerengine.players import BasePokerPlayer
 
 class GameTest(BaseUnitTest):
 
@@ -51,8 +54,93 @@ class GameTest(BaseUnitTest):
             result = G.start_poker(config)
         self.assertIn("only 1 player", str(e.exception))
 
+    def test_start_poker_with_seed(self):
+        results = [G.start_poker(setup_fish_config(seed=3), verbose=0) for _ in range(2)]
+        self.eq(results[0]["players"], results[1]["players"])
+        self.eq(results[0]["action_log"], results[1]["action_log"])
+        seed_result = G.start_poker(setup_fish_config(), verbose=0, seed=3)
+        self.eq(results[0]["players"], seed_result["players"])
+
+    def test_replay_poker(self):
+        config = G.setup_config(5, 100, 5, seed=11)
+        [config.register_player(name, RandomPlayer()) for name in ["p1", "p2", "p3"]]
+        result = G.start_poker(config, verbose=0)
+        replay_config = G.setup_config(5, 100, 5, seed=11)
+        [replay_config.register_player(name, AskedError()) for name in ["p1", "p2", "p3"]]
+        replayed = G.replay_poker(replay_config, result["action_log"])
+        self.eq(result["players"], replayed["players"])
+
+    def test_replay_poker_with_wrong_action_log(self):
+        result = G.start_poker(setup_fish_config(seed=3), verbose=0)
+        action_log = result["action_log"]
+        for wrong_log in [action_log[:-1], action_log + action_log[-1:], action_log[1:]]:
+            with self.assertRaises(ValueError):
+                G.replay_poker(setup_fish_config(seed=3), wrong_log)
+
+    @raises(ValueError)
+    def test_replay_poker_without_seed(self):
+        G.replay_poker(setup_fish_config(), [])
+
+    def test_run_many(self):
+        results = {}
+        stats = G.run_many(setup_fold_man_config, 4, workers=1, callback=results.__setitem__)
+        self.eq([0, 1, 2, 3], sorted(results.keys()))
+        self.eq({ "p1": 10, "p2": -10 }, results[0]["stack_deltas"])
+        self.false("action_log" in results[0])
+        self.eq({ "n": 4, "mean": 10.0, "variance": 0.0 }, stats["p1"])
+        self.eq({ "n": 4, "mean": -10.0, "variance": 0.0 }, stats["p2"])
+
+    def test_run_many_on_workers(self):
+        serial = dict(G.imap_poker(setup_fish_config, 6, workers=1, seed=5, with_action_log=True))
+        parallel = dict(G.imap_poker(setup_fish_config, 6, workers=2, seed=5, with_action_log=True))
+        self.eq(serial, parallel)
+        replayed = G.replay_poker(setup_fish_config(), parallel[3]["action_log"], seed=parallel[3]["seed"])
+        self.eq(parallel[3]["players"], replayed["players"])
+
+    def test_run_many_with_random_players_is_reproducible(self):
+        stats = G.run_many(setup_random_config, 4, workers=1, seed=1)
+        self.eq(stats, G.run_many(setup_random_config, 4, workers=1, seed=1))
+        self.eq(stats, G.run_many(setup_random_config, 4, workers=2, seed=1))
+
+    @raises(ValueError)
+    def test_run_many_with_duplicated_names(self):
+        G.run_many(setup_same_name_config, 2, workers=1)
+
+    def test_run_many_stats(self):
+        stats = [0, 0.0, 0.0]
+        for value in [1, 2, 3, 10]: G._update_stats(stats, value)
+        self.eq({ "n": 4, "mean": 4.0, "variance": 50.0 / 3 }, G._summarize_stats(stats))
+
     @raises(TypeError)
     def test_register_player_when_invalid(self):
         config = G.setup_config(1, 100, 10)
         config.register_player("p1", "dummy")
 
+def setup_fold_man_config():
+    config = G.setup_config(1, 100, 10)
+    config.register_player("p1", FoldMan())
+    config.register_player("p2", FoldMan())
+    return config
+
+def setup_random_config():
+    config = G.setup_config(3, 100, 10)
+    config.register_player("p1", RandomPlayer())
+    config.register_player("p2", RandomPlayer())
+    return config
+
+def setup_same_name_config():
+    config = G.setup_config(1, 100, 10)
+    config.register_player("p1", FoldMan())
+    config.register_player("p1", FoldMan())
+    return config
+
+def setup_fish_config(seed=None):
+    config = G.setup_config(3, 100, 10, seed=seed)
+    config.register_player("p1", FishPlayer())
+    config.register_player("p2", FishPlayer())
+    return config
+
+class AskedError(BasePokerPlayer):
+
+    def declare_action(self, valid_actions, hole_card, round_state):
+        raise AssertionError("replay asked the player for an action")
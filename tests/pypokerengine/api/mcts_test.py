@@ -0,0 +1,92 @@
+from nose.tools import raises
+from tests.base_unittest import BaseUnitTest
+from tests.pypokerengine.utils.game_state_utils_test import TwoPlayerSample
+from pypokerengine.api.emulator import Emulator
+from pypokerengine.api.mcts import MCTS, gen_abstract_actions, call_rollout_policy,\
+        gen_player_rollout_policy, _gen_info_set_key
+from pypokerengine.engine.round_manager import RoundManager
+from pypokerengine.players import BasePokerPlayer
+from pypokerengine.utils.card_utils import gen_cards
+from pypokerengine.utils.game_state_utils import restore_game_state, attach_hole_card
+
+class MCTSTest(BaseUnitTest):
+
+    def setUp(self):
+        self.emulator = Emulator(seed=2)
+        self.emulator.set_game_rule(2, 1, 5, 0)
+        players_info = {
+                "uuid-1": { "name": "p1", "stack": 100 },
+                "uuid-2": { "name": "p2", "stack": 100 }
+                }
+        game_state = self.emulator.generate_initial_game_state(players_info)
+        self.game_state, _ = self.emulator.start_new_round(game_state, headless=True)
+
+    def test_gen_abstract_actions(self):
+        actions = gen_abstract_actions(self.game_state)
+        self.eq([("fold", 0), ("call", 10), ("raise", 15), ("raise", 30), ("raise", 100)], actions)
+        state, _ = RoundManager.apply_action(self.game_state, "call", 10, headless=True)
+        state, _ = RoundManager.apply_action(state, "call", 10, headless=True)
+        self.eq([("call", 0), ("raise", 10), ("raise", 20), ("raise", 90)], gen_abstract_actions(state))
+
+    def test_transposed_states_share_key(self):
+        state1, _ = RoundManager.apply_action(self.game_state, "raise", 20, headless=True)
+        state1, _ = RoundManager.apply_action(state1, "call", 20, headless=True)
+        state2, _ = RoundManager.apply_action(self.game_state, "call", 10, headless=True)
+        state2, _ = RoundManager.apply_action(state2, "raise", 20, headless=True)
+        state2, _ = RoundManager.apply_action(state2, "call", 20, headless=True)
+        self.eq(_gen_info_set_key(state1), _gen_info_set_key(state2))
+        self.true(_gen_info_set_key(state1) != _gen_info_set_key(self.game_state))
+
+    def test_search_by_iterations(self):
+        mcts = MCTS(seed=1)
+        action, amount = mcts.search_round_state(TwoPlayerSample.round_state, TwoPlayerSample.hole_card, iterations=300)
+        stats = mcts.action_stats()
+        self.eq(gen_abstract_actions(self._restore_sample()), [(stat[0], stat[1]) for stat in stats])
+        self.eq(300, sum([stat[2] for stat in stats]))
+        self.eq(max(stats, key=lambda stat: stat[2])[:2], (action, amount))
+        self.eq(0, stats[0][3])  # fold does not change the stack
+
+    def test_search_does_not_change_game_state(self):
+        game_state = self._restore_sample()
+        serial = game_state["table"].serialize()
+        MCTS(seed=1).search(game_state, iterations=50)
+        self.eq(serial, game_state["table"].serialize())
+
+    def test_search_with_same_seed(self):
+        mcts1, mcts2 = MCTS(seed=3), MCTS(seed=3)
+        mcts1.search(self._restore_sample(), iterations=100)
+        mcts2.search(self._restore_sample(), iterations=100)
+        self.eq(mcts1.action_stats(), mcts2.action_stats())
+
+    def test_search_by_time_limit(self):
+        mcts = MCTS(seed=1)
+        mcts.search(self._restore_sample(), time_limit=0.05)
+        self.true(sum([stat[2] for stat in mcts.action_stats()]) > 0)
+
+    def test_fold_hopeless_hand(self):
+        mcts = MCTS(rollout_policy=call_rollout_policy, seed=1)
+        self.eq(("fold", 0), mcts.search_round_state(TwoPlayerSample.round_state, ["C2", "D7"], iterations=500))
+
+    def test_player_rollout_policy(self):
+        self.emulator.register_player("uuid-1", CallPlayer())
+        self.emulator.register_player("uuid-2", CallPlayer())
+        policy = gen_player_rollout_policy(self.emulator)
+        self.eq(("call", 10), policy(self.game_state, gen_abstract_actions(self.game_state), None))
+
+    @raises(ValueError)
+    def test_search_without_budget(self):
+        MCTS().search(self._restore_sample())
+
+    @raises(ValueError)
+    def test_search_without_hole_card(self):
+        MCTS().search(restore_game_state(TwoPlayerSample.round_state), iterations=10)
+
+    def _restore_sample(self):
+        game_state = restore_game_state(TwoPlayerSample.round_state)
+        uuid = TwoPlayerSample.round_state["seats"][1]["uuid"]
+        return attach_hole_card(game_state, uuid, gen_cards(TwoPlayerSample.hole_card))
+
+class CallPlayer(BasePokerPlayer):
+
+    def declare_action(self, valid_actions, hole_card, round_state):
+        return valid_actions[1]["action"], valid_actions[1]["amount"]
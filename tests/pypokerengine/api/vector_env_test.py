@@ -0,0 +1,59 @@
+import unittest
+
+from nose.tools import raises
+from tests.base_unittest import BaseUnitTest
+import pypokerengine.api.vector_env as V
+from pypokerengine.api.vector_env import VectorEnv, FOLD, CALL, RAISE
+
+@unittest.skipIf(V.np is None, "numpy is not installed")
+class VectorEnvTest(BaseUnitTest):
+
+    def setUp(self):
+        self.env = VectorEnv(3, 2, max_round=2, initial_stack=100, small_blind_amount=5, seed=1)
+
+    def test_reset(self):
+        obs = self.env.reset()
+        self.eq((3, 2), obs["stacks"].shape)
+        self.eq([[90, 95]] * 3, obs["stacks"].tolist())
+        self.eq([[10, 5]] * 3, obs["paid"].tolist())
+        self.eq([15] * 3, obs["pot"].tolist())
+        self.eq([0] * 3, obs["street"].tolist())
+        self.eq([1] * 3, obs["player"].tolist())
+        self.eq([10] * 3, obs["call_amount"].tolist())
+        self.eq([[15, 100]] * 3, obs["raise_range"].tolist())
+        self.eq([[True, True, True]] * 3, obs["legal_actions"].tolist())
+        self.true(all(0 < card_id <= 52 for card_id in obs["hole_cards"].ravel()))
+        self.eq([[0] * 5] * 3, obs["board"].tolist())
+
+    def test_step(self):
+        self.env.reset()
+        obs, rewards, dones = self.env.step([FOLD, CALL, RAISE], amounts=[0, 0, 30])
+        self.eq([[5, -5], [0, 0], [0, 0]], rewards.tolist())
+        self.eq([False] * 3, dones.tolist())
+        self.eq([[100, 85], [90, 90], [90, 70]], obs["stacks"].tolist())
+        self.eq([0, 0, 0], obs["player"].tolist())
+        self.eq([10, 10, 30], obs["call_amount"].tolist())
+        obs, rewards, dones = self.env.step([FOLD, CALL, FOLD])
+        self.eq([[-5, 5], [0, 0], [-10, 10]], rewards.tolist())
+        self.eq([True, False, False], dones.tolist())
+        self.eq([[90, 95], [90, 90], [85, 100]], obs["stacks"].tolist())
+        self.eq([0, 1, 0], obs["street"].tolist())
+        self.true(all(card_id > 0 for card_id in obs["board"][1, :3]))
+
+    def test_raise_amount_is_clipped(self):
+        self.env.reset()
+        obs, _, _ = self.env.step([RAISE, RAISE, RAISE], amounts=[1, 50, 1000])
+        self.eq([[90, 85], [90, 50], [90, 0]], obs["stacks"].tolist())
+
+    def test_same_seed_deals_same_cards(self):
+        env = VectorEnv(3, 2, max_round=2, initial_stack=100, small_blind_amount=5, seed=1)
+        self.eq(self.env.reset()["hole_cards"].tolist(), env.reset()["hole_cards"].tolist())
+
+    @raises(ValueError)
+    def test_unknown_action(self):
+        self.env.reset()
+        self.env.step([FOLD, CALL, 5])
+
+    @raises(ValueError)
+    def test_too_small_initial_stack(self):
+        VectorEnv(3, 2, initial_stack=10, small_blind_amount=5)
@@ -149,6 +149,15 @@ class ActionCheckerTest(BaseUnitTest):
     self.eq({"action":"call", "amount":10}, legal_actions[1])
     self.eq({"action":"raise", "amount": { "min":-1, "max":-1} }, legal_actions[2])
 
+  def test_agree_amount_follows_new_histories(self):
+    players = self.__setup_blind_players()
+    self.eq(10, ActionChecker.agree_amount(players))
+    players[0].add_action_history(Const.Action.RAISE, 30, 20)
+    self.eq(30, ActionChecker.agree_amount(players))
+    self.eq({ "min": 50, "max": 100 }, ActionChecker.legal_actions(players, 1, 2.5)[2]["amount"])
+    players[0].action_histories = players[0].action_histories[:1]
+    self.eq(10, ActionChecker.agree_amount(players))
+
   def test_need_amount_after_ante(self):
     # situation => SB=$5 (players[0]), BB=$10 (players[1]), ANTE=$3
     players = [Player("uuid", 100, name="name") for _ in range(3)]
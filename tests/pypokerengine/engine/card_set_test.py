@@ -0,0 +1,51 @@
+from tests.base_unittest import BaseUnitTest
+from pypokerengine.engine.card import Card
+from pypokerengine.engine.card_set import CardSet
+
+class CardSetTest(BaseUnitTest):
+
+  def test_from_ids(self):
+    card_set = CardSet.from_ids([1, 29, 40])
+    self.eq(1 << 1 | 1 << 29 | 1 << 40, card_set.mask)
+    self.eq(3, len(card_set))
+    self.eq([1, 29, 40], card_set.to_ids())
+
+  def test_from_cards_and_str(self):
+    cards = [Card(Card.HEART, 3), Card(Card.CLUB, 1)]
+    self.eq(CardSet.from_ids([1, 29]), CardSet.from_cards(cards))
+    self.eq(CardSet.from_ids([1, 29]), CardSet.from_str(["H3", "CA"]))
+    self.eq(CardSet.from_ids([1, 29]), CardSet.from_str(["h3", "cA"]))
+
+  def test_full(self):
+    full = CardSet.full()
+    self.eq(52, full.size())
+    self.eq(list(range(1, 53)), full.to_ids())
+    self.eq([Card.from_id(cid) for cid in range(1, 53)], full.to_cards())
+
+  def test_set_operation(self):
+    a = CardSet.from_ids([1, 2, 3])
+    b = CardSet.from_ids([3, 4])
+    self.eq([1, 2, 3, 4], (a | b).to_ids())
+    self.eq([1, 2], (a - b).to_ids())
+    self.eq([3], (a & b).to_ids())
+    self.eq([1, 2, 3, 52], a.add(52).to_ids())
+    self.eq([1, 3], a.remove(2).to_ids())
+    self.eq([1, 2, 3], a.to_ids())
+
+  def test_contains(self):
+    card_set = CardSet.from_ids([12, 52])
+    self.true(12 in card_set)
+    self.true(52 in card_set)
+    self.false(13 in card_set)
+
+  def test_suit_masks(self):
+    card_set = CardSet.from_str(["CA", "CK", "D2", "SA"])
+    self.eq([1 | 1 << 12, 1 << 1, 0, 1], card_set.suit_masks())
+
+  def test_to_str(self):
+    card_set = CardSet.from_str(["SK", "CA", "HT"])
+    self.eq(["CA", "HT", "SK"], card_set.to_str())
+    self.eq("[CA, HT, SK]", str(card_set))
+
+  def test_hash(self):
+    self.eq(1, len(set([CardSet.from_ids([1, 2]), CardSet.from_ids([2, 1])])))
@@ -29,3 +29,8 @@ class CardTest(BaseUnitTest):
     self.eq(Card(Card.HEART, 10), Card.from_str("HT"))
     self.eq(Card(Card.SPADE, 9), Card.from_str("S9"))
     self.eq(Card(Card.DIAMOND, 12), Card.from_str("DQ"))
+
+  def test_cards_are_interned(self):
+    self.true(Card.from_id(29) is Card.from_id(29))
+    self.true(Card.from_str("H3") is Card.from_id(29))
+    self.false(hasattr(Card.from_id(29), "__dict__"))
@@ -1,3 +1,4 @@
+from mock import patch
 from tests.base_unittest import BaseUnitTest
 from pypokerengine.engine.card import Card
 from pypokerengine.engine.player import Player
@@ -6,6 +7,7 @@ from pypokerengine.engine.table import Table
 from pypokerengine.engine.seats import Seats
 from pypokerengine.engine.poker_constants import PokerConstants as Const
 from pypokerengine.engine.data_encoder import DataEncoder
+from pypokerengine.engine.game_evaluator import GameEvaluator
 from pypokerengine.engine.round_manager import RoundManager
 
 class DataEncoderTest(BaseUnitTest):
@@ -123,6 +125,64 @@ class DataEncoderTest(BaseUnitTest):
         self.eq(state["round_count"], hsh["round_count"])
         self.eq(state["small_blind_amount"], hsh["small_blind_amount"])
 
+    def test_encode_round_state_lazily(self):
+        state = setup_round_state()
+        with patch('pypokerengine.engine.data_encoder.DataEncoder.encode_pot', return_value="pot") as encode_pot:
+            round_state = DataEncoder.encode_round_state(state)
+            self.eq("flop", round_state["street"])
+            self.false(encode_pot.called)
+            self.eq("pot", round_state["pot"])
+            self.eq("pot", round_state["pot"])
+            self.eq(1, encode_pot.call_count)
+        self.eq(11, len(round_state))
+        self.eq(sorted(round_state.keys()), sorted(dict(round_state).keys()))
+
+    def test_encode_round_state_shares_payload_of_same_table_state(self):
+        state = setup_round_state()
+        first = DataEncoder.encode_round_state(state)
+        state["next_player"] = 0
+        second = DataEncoder.encode_round_state(state)
+        self.eq(0, second["next_player"])
+        self.true(first["action_histories"] is second["action_histories"])
+        self.true(first["seats"] is second["seats"])
+        lazy_histories = DataEncoder.encode_lazy_action_histories(state["table"])
+        self.true(first["action_histories"] is lazy_histories["action_histories"])
+
+    def test_encode_round_state_keeps_payload_on_each_table(self):
+        states = [setup_round_state(), setup_round_state()]
+        first = [DataEncoder.encode_round_state(state) for state in states]
+        second = [DataEncoder.encode_round_state(state) for state in states]
+        self.true(first[0]["seats"] is second[0]["seats"])
+        self.true(first[1]["seats"] is second[1]["seats"])
+        self.false(first[0]["seats"] is first[1]["seats"])
+        self.true(first[0]["seats"] is DataEncoder.encode_round_state(dict(states[0], table=states[0]["table"].copy()))["seats"])
+
+    def test_encoded_pot_shares_pot_structure_with_judge(self):
+        state = setup_round_state()
+        get_side_pots = GameEvaluator._GameEvaluator__get_side_pots
+        with patch.object(GameEvaluator, "_GameEvaluator__get_side_pots", wraps=get_side_pots) as get_side_pots,\
+                patch('pypokerengine.engine.hand_evaluator.HandEvaluator.eval_hand', return_value=0):
+            DataEncoder.encode_round_state(state)["pot"]
+            GameEvaluator.judge(state["table"])
+            self.eq(1, get_side_pots.call_count)
+
+    def test_encode_round_state_is_snapshot(self):
+        state = setup_round_state()
+        round_state = DataEncoder.encode_round_state(state)
+        player = state["table"].seats.players[0]
+        player.collect_bet(10)
+        player.add_action_history(Const.Action.CALL, 10)
+        self.eq(100, round_state["seats"][0]["stack"])
+        self.eq(2, len(round_state["action_histories"]["flop"]))
+        updated = DataEncoder.encode_round_state(state)
+        self.eq(90, updated["seats"][0]["stack"])
+        self.eq(3, len(updated["action_histories"]["flop"]))
+
+    def test_round_state_is_read_only(self):
+        round_state = DataEncoder.encode_round_state(setup_round_state())
+        with self.assertRaises(TypeError):
+            round_state["street"] = "river"
+
 def setup_player():
     player = setup_player_with_payinfo(0, "hoge", 50, PayInfo.FOLDED)
     player.add_holecard([Card.from_id(1), Card.from_id(2)])
@@ -1,7 +1,15 @@
+import random
+import unittest
+
 from tests.base_unittest import BaseUnitTest
 from pypokerengine.engine.card import Card
 from pypokerengine.engine.deck import Deck
 
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
 class DeckTest(BaseUnitTest):
 
   def setUp(self):
@@ -17,6 +25,11 @@ class DeckTest(BaseUnitTest):
     self.eq("SJ", str(cards[2]))
     self.eq(49, self.deck.size())
 
+  def test_draw_card_ids(self):
+    self.eq([52, 51, 50], self.deck.draw_card_ids(3))
+    self.eq(49, self.deck.size())
+    self.eq(49, self.deck.draw_card_id())
+
   def test_restore(self):
     self.deck.draw_cards(5)
     self.deck.restore()
@@ -30,6 +43,73 @@ class DeckTest(BaseUnitTest):
     self.eq(self.deck.cheat, restored.cheat)
     self.eq(self.deck.deck, restored.deck)
 
+  def test_copy_shares_cards_after_draw(self):
+    copied = self.deck.copy()
+    self.true(copied._cards is self.deck._cards)
+    self.eq(52, copied.draw_card_id())
+    self.eq(51, copied.size())
+    self.eq(52, self.deck.size())
+    self.eq(52, self.deck.draw_card_id())
+    self.true(copied._cards is self.deck._cards)
+
+  def test_copy_shares_cards_until_shuffle(self):
+    copied = self.deck.copy()
+    self.deck.shuffle()
+    self.eq(list(range(1, 53)), copied.deck)
+
+  def test_restore_without_allocation(self):
+    cards = self.deck._cards
+    self.deck.shuffle()
+    self.deck.draw_cards(5)
+    self.deck.restore()
+    self.true(self.deck._cards is cards)
+    self.eq(list(range(1, 53)), self.deck.deck)
+
+  def test_restore_of_shared_deck(self):
+    copied = self.deck.copy()
+    copied.shuffle()
+    copied.restore()
+    self.deck.restore()
+    self.false(copied._cards is self.deck._cards)
+    self.eq(list(range(1, 53)), copied.deck)
+
+  def test_draw_from_empty_deck(self):
+    self.deck.draw_cards(51)
+    self.eq([1], self.deck.draw_card_ids(1))
+    self.assertRaises(IndexError, self.deck.draw_card_id)
+    self.assertRaises(IndexError, self.deck.draw_card_ids, 2)
+
+  def test_shuffle_keeps_drawn_cards_out(self):
+    drawn = self.deck.draw_card_ids(5)
+    self.deck.shuffle()
+    self.eq(47, self.deck.size())
+    self.eq(sorted(self.deck.deck), list(range(1, 48)))
+    self.false(any(card_id in self.deck.deck for card_id in drawn))
+
+  def test_shuffle_by_seeded_rng(self):
+    decks = [Deck(rng=random.Random(7)) for _ in range(2)]
+    [deck.shuffle() for deck in decks]
+    self.eq(decks[0].deck, decks[1].deck)
+    self.false(decks[0].deck == list(range(1, 53)))
+
+  @unittest.skipIf(np is None, "numpy is not installed")
+  def test_shuffle_by_numpy_generator(self):
+    decks = [Deck(rng=np.random.default_rng(7)) for _ in range(2)]
+    [deck.shuffle() for deck in decks]
+    self.eq(decks[0].deck, decks[1].deck)
+    self.eq(list(range(1, 53)), sorted(decks[0].deck))
+
+  def test_snapshot_and_rollback(self):
+    self.deck.shuffle()
+    expected = self.deck.deck
+    snapshot = self.deck.snapshot()
+    self.deck.draw_cards(3)
+    self.deck.rollback(snapshot)
+    self.eq(expected, self.deck.deck)
+    self.deck.restore()
+    self.deck.rollback(snapshot)
+    self.eq(expected, self.deck.deck)
+
   def test_cheat_draw(self):
     cards = [Card.from_id(cid) for cid in [12, 15, 17]]
     cheat = Deck(cheat=True, cheat_card_ids=[12, 15, 17])
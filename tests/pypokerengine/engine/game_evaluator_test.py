@@ -79,21 +79,29 @@ class GameEvaluatorTest(BaseUnitTest):
       self.eq(0, prize_map[2])
 
 
+  def test_judge_evaluates_each_hand_once(self):
+    players = self.__setup_players_for_judge()
+    table = self.__setup_table(players)
+    with patch('pypokerengine.engine.hand_evaluator.HandEvaluator.eval_hand', side_effect=[1,2,0]) as eval_hand:
+      winner, hand_info, prize_map = GameEvaluator.judge(table)
+      self.eq(3, eval_hand.call_count)
+      self.eq([players[1]], winner)
+      self.eq(3, len(hand_info))
+      self.eq([40, 60, 0], [prize_map[i] for i in range(3)])
+
   def test_find_a_winner(self):
     mock_eval_hand_return = [0, 1, 0]
     dummy_players = self.__setup_players()
-    dummy_community = []
     with patch('pypokerengine.engine.hand_evaluator.HandEvaluator.eval_hand', side_effect=mock_eval_hand_return):
-      winner = GameEvaluator._GameEvaluator__find_winners_from(dummy_community, dummy_players)
+      winner, _, _ = GameEvaluator.judge(self.__setup_table(dummy_players))
       self.eq(1, len(winner))
       self.true(dummy_players[1] in winner)
 
   def test_find_winners(self):
     mock_eval_hand_return = [0, 1, 1]
     dummy_players = self.__setup_players()
-    dummy_community = []
     with patch('pypokerengine.engine.hand_evaluator.HandEvaluator.eval_hand', side_effect=mock_eval_hand_return):
-      winner = GameEvaluator._GameEvaluator__find_winners_from(dummy_community, dummy_players)
+      winner, _, _ = GameEvaluator.judge(self.__setup_table(dummy_players))
       self.eq(2, len(winner))
       self.true(dummy_players[1] in winner)
       self.true(dummy_players[2] in winner)
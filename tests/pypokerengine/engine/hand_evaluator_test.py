@@ -1,6 +1,8 @@
+import random
+
 from tests.base_unittest import BaseUnitTest
 from pypokerengine.engine.card import Card
-from pypokerengine.engine.hand_evaluator import HandEvaluator
+from pypokerengine.engine.hand_evaluator import HandEvaluator, HandRankTable
 
 class HandEvaluatorTest(BaseUnitTest):
 
@@ -242,3 +244,38 @@ class HandEvaluatorTest(BaseUnitTest):
     self.eq(14, HandEvaluator._HandEvaluator__mask_hole_high_rank(bit))
     self.eq(10, HandEvaluator._HandEvaluator__mask_hole_low_rank(bit))
 
+
+  def test_rank_table_agrees_with_rule_on_random_hands(self):
+    rand = random.Random(1234)
+    for _ in range(20000):
+      cards = [Card.from_id(cid) for cid in rand.sample(range(1, 53), 7)]
+      hole, community = cards[:2], cards[2:]
+      self.eq(HandEvaluator._eval_hand_by_rule(hole, community), HandEvaluator.eval_hand(hole, community))
+
+  def test_rank_table_agrees_with_rule_on_every_flush(self):
+    hole = [Card(Card.SPADE, 2), Card(Card.CLUB, 2)]
+    for mask in range(1 << 13):
+      if bin(mask).count("1") != 5: continue
+      community = [Card(Card.HEART, bit+1) for bit in range(13) if mask >> bit & 1]
+      self.eq(HandEvaluator._eval_hand_by_rule(hole, community), HandEvaluator.eval_hand(hole, community))
+
+  def test_rank_table_agrees_with_rule_on_short_community(self):
+    rand = random.Random(5678)
+    for nb_community in range(4):
+      for _ in range(500):
+        cards = [Card.from_id(cid) for cid in rand.sample(range(1, 53), 2 + nb_community)]
+        hole, community = cards[:2], cards[2:]
+        self.eq(HandEvaluator._eval_hand_by_rule(hole, community), HandEvaluator.eval_hand(hole, community))
+
+  def test_eval_hand_ids(self):
+    rand = random.Random(4321)
+    for _ in range(1000):
+      ids = rand.sample(range(1, 53), 7)
+      cards = [Card.from_id(cid) for cid in ids]
+      self.eq(HandEvaluator.eval_hand(cards[:2], cards[2:]), HandEvaluator.eval_hand_ids(ids[:2], ids[2:]))
+
+  def test_rank_flg_table(self):
+    keys, flgs = HandRankTable.rank_flg_table()
+    self.eq(49205, len(keys))
+    self.eq(sorted(keys), keys)
+    self.eq(len(keys), len(flgs))
@@ -1,3 +1,5 @@
+import json
+
 from tests.base_unittest import BaseUnitTest
 from pypokerengine.engine.player import Player
 from pypokerengine.engine.card import Card
@@ -85,6 +87,20 @@ class MessageBuilderTest(BaseUnitTest):
     self.eq(DataEncoder.encode_game_information(config, seats), msg["game_information"])
 
 
+  def test_messages_are_plain_dicts(self):
+    state = self.__setup_state()
+    messages = [
+        MessageBuilder.build_street_start_message(state),
+        MessageBuilder.build_ask_message(1, state),
+        MessageBuilder.build_game_update_message(1, "call", 10, state),
+        MessageBuilder.build_round_result_message(7, state["table"].seats.players[1:2], [], state)
+        ]
+    for message in messages:
+      msg = message["message"]
+      self.eq(dict, type(msg["round_state"]))
+      self.eq(msg, json.loads(json.dumps(msg)))
+    self.eq(dict, type(messages[1]["message"]["action_histories"]))
+
   def __setup_state(self):
     return {
         "street": 1,
@@ -28,6 +28,16 @@ class PlayerTest(BaseUnitTest):
     self.player.add_holecard([Card.from_id(cid) for cid in range(1,3)])
     self.player.add_holecard([Card.from_id(cid) for cid in range(1,3)])
 
+  def test_add_holecard_ids(self):
+    self.player.add_holecard_ids([29, 40])
+    self.eq([29, 40], self.player.hole_card_ids)
+    self.eq([Card.from_id(29), Card.from_id(40)], self.player.hole_card)
+
+  @raises(ValueError)
+  def test_add_holecard_ids_twice(self):
+    self.player.add_holecard_ids([29, 40])
+    self.player.add_holecard_ids([1, 2])
+
   def test_clear_holecard(self):
     self.player.add_holecard([Card.from_id(cid) for cid in range(1,3)])
     self.player.clear_holecard()
@@ -161,6 +171,30 @@ class PlayerTest(BaseUnitTest):
     self.player.add_action_history(Const.Action.BIG_BLIND, sb_amount=5)
     self.eq(10, self.player.paid_sum())
 
+  def test_paid_sum_follows_replaced_histories(self):
+    self.player.add_action_history(Const.Action.RAISE, 10, 5)
+    self.player.action_histories.append({ "action": "CALL", "amount": 20, "paid": 10, "uuid": "uuid" })
+    self.eq(20, self.player.paid_sum())
+    self.player.action_histories = self.player.action_histories[:1]
+    self.eq(10, self.player.paid_sum())
+    self.player.action_histories = []
+    self.eq(0, self.player.paid_sum())
+
+  def test_last_raise(self):
+    self.assertIsNone(self.player.last_raise())
+    self.player.add_action_history(Const.Action.BIG_BLIND, sb_amount=5)
+    self.eq("BIGBLIND", self.player.last_raise()["action"])
+    self.player.add_action_history(Const.Action.RAISE, 30, 20)
+    self.player.add_action_history(Const.Action.CALL, 40)
+    self.eq(30, self.player.last_raise()["amount"])
+    self.eq(40, self.player.paid_sum())
+    self.player.save_street_action_histories(Const.Street.PREFLOP)
+    self.assertIsNone(self.player.last_raise())
+
+
+  def test_no_instance_dict(self):
+    self.false(hasattr(self.player, "__dict__"))
+    self.false(hasattr(self.player.pay_info, "__dict__"))
 
   def test_serialization(self):
     player = self.__setup_player_for_serialization()
@@ -175,6 +209,20 @@ class PlayerTest(BaseUnitTest):
     self.eq(player.pay_info.amount, restored.pay_info.amount)
     self.eq(player.pay_info.status, restored.pay_info.status)
 
+  def test_copy(self):
+    player = self.__setup_player_for_serialization()
+    copied = player.copy()
+    self.eq(player.serialize(), copied.serialize())
+    self.true(copied.round_action_histories[Const.Street.PREFLOP] is player.round_action_histories[Const.Street.PREFLOP])
+    copied.add_action_history(Const.Action.CALL, 20)
+    copied.pay_info.update_by_pay(10)
+    copied.collect_bet(10)
+    copied.save_street_action_histories(Const.Street.TURN)
+    self.eq(3, len(player.action_histories))
+    self.eq(None, player.round_action_histories[Const.Street.TURN])
+    self.eq(player.stack, copied.stack + 10)
+    self.eq(player.pay_info.amount, copied.pay_info.amount - 10)
+
   def __setup_player_for_serialization(self):
     player = Player("uuid", 50, "hoge")
     player.add_holecard([Card.from_id(cid) for cid in range(1,3)])
@@ -1,3 +1,5 @@
+from copy import deepcopy
+from nose.tools import raises
 from tests.base_unittest import BaseUnitTest
 from mock import patch
 from pypokerengine.engine.round_manager import RoundManager
@@ -355,6 +357,89 @@ class RoundManagerTest(BaseUnitTest):
     self.eq(75, pot_amount(raised_state))
 
 
+  def test_apply_action_in_place(self):
+    state, _ = self.__start_round()
+    copied_state, copied_msgs = RoundManager.apply_action(state, "call", 10)
+    in_place_state, in_place_msgs = RoundManager.apply_action(state, "call", 10, in_place=True)
+    self.true(in_place_state is state)
+    self.eq(copied_msgs, in_place_msgs)
+    self.eq(copied_state["table"].serialize(), in_place_state["table"].serialize())
+    self.eq(copied_state["next_player"], in_place_state["next_player"])
+    self.eq(1, len(state["undo_log"]))
+
+  def test_apply_action_in_place_without_undo_record(self):
+    state, _ = self.__start_round()
+    copied_state, _ = RoundManager.apply_action(state, "call", 10)
+    in_place_state, _ = RoundManager.apply_action(state, "call", 10, in_place=True, headless=True, record_undo=False)
+    self.true(in_place_state is state)
+    self.eq(copied_state["table"].serialize(), in_place_state["table"].serialize())
+    self.false("undo_log" in state)
+
+  def test_undo_restores_every_action_until_showdown(self):
+    state, _ = self.__start_round()
+    actions = [("fold", 0), ("call", 10), ("call", 10)] + [("call", 0)] * 6
+    snapshots = []
+    for action, amount in actions:
+      snapshots.append(self.__snapshot(state))
+      state, _ = RoundManager.apply_action(state, action, amount, in_place=True)
+    self.eq(Const.Street.FINISHED, state["street"])
+    for snapshot in reversed(snapshots):
+      RoundManager.undo(state)
+      self.eq(snapshot, self.__snapshot(state))
+    self.eq([], state["undo_log"])
+
+  def test_undo_restores_allin_run_out(self):
+    state, _ = self.__start_round()
+    before = self.__snapshot(state)
+    state, _ = RoundManager.apply_action(state, "raise", 100, in_place=True)
+    state, _ = RoundManager.apply_action(state, "call", 100, in_place=True)
+    state, _ = RoundManager.apply_action(state, "call", 100, in_place=True)
+    self.eq(Const.Street.FINISHED, state["street"])
+    for _ in range(3): RoundManager.undo(state)
+    self.eq(before, self.__snapshot(state))
+    state, _ = RoundManager.apply_action(state, "fold", 0, in_place=True)
+    copied_state, _ = RoundManager.apply_action(self.__start_round()[0], "fold", 0)
+    self.eq(copied_state["table"].serialize(), state["table"].serialize())
+
+  def test_apply_action_does_not_change_original_state(self):
+    state, _ = self.__start_round()
+    state, _ = RoundManager.apply_action(state, "call", 10)
+    before = self.__snapshot(state)
+    RoundManager.apply_action(state, "raise", 30)
+    RoundManager.apply_action(state, "call", 10)
+    self.eq(before, self.__snapshot(state))
+
+  def test_undo_does_not_change_state_copied_after_action(self):
+    state, _ = self.__start_round()
+    state, _ = RoundManager.apply_action(state, "call", 10, in_place=True)
+    state, _ = RoundManager.apply_action(state, "call", 10, in_place=True)
+    state, _ = RoundManager.apply_action(state, "call", 10, in_place=True)
+    branch, _ = RoundManager.apply_action(state, "call", 0)
+    branch_snapshot = self.__snapshot(branch)
+    for _ in range(3): RoundManager.undo(state)
+    state, _ = RoundManager.apply_action(state, "fold", 0, in_place=True)
+    self.eq(branch_snapshot, self.__snapshot(branch))
+
+  @raises(ValueError)
+  def test_undo_without_action(self):
+    state, _ = self.__start_round()
+    RoundManager.undo(state)
+
+  def test_headless_mode(self):
+    actions = [("fold", 0), ("call", 10), ("call", 10)] + [("call", 0)] * 6
+    with patch('pypokerengine.engine.message_builder.MessageBuilder.build_ask_message') as ask_message:
+      state, msgs = self.__start_round(headless=True)
+      self.eq([], msgs)
+      for action, amount in actions:
+        state, msgs = RoundManager.apply_action(state, action, amount, headless=True)
+        self.eq([], msgs)
+      self.false(ask_message.called)
+    expected, _ = self.__start_round()
+    for action, amount in actions:
+      expected, _ = RoundManager.apply_action(expected, action, amount)
+    self.eq(Const.Street.FINISHED, state["street"])
+    self.eq(expected["table"].serialize(), state["table"].serialize())
+
   def test_deepcopy_state(self):
     table = self.__setup_table()
     original = RoundManager._RoundManager__gen_initial_state(2, 5, table)
@@ -363,12 +448,15 @@ class RoundManagerTest(BaseUnitTest):
     [check(key) for key in ["round_count", "small_blind_amount", "street", "next_player"]]
 
 
-  def __start_round(self):
+  def __snapshot(self, state):
+    return deepcopy((state["street"], state["next_player"], state["table"].serialize()))
+
+  def __start_round(self, headless=False):
     table = self.__setup_table()
     round_count = 1
     small_blind_amount = 5
     ante = 0
-    return RoundManager.start_new_round(round_count, small_blind_amount, ante, table)
+    return RoundManager.start_new_round(round_count, small_blind_amount, ante, table, headless=headless)
 
   def __setup_table(self):
     players = [Player("uuid%d" % i, 100) for i in range(3)]
@@ -1,6 +1,8 @@
+from mock import patch
 from tests.base_unittest import BaseUnitTest
 from pypokerengine.engine.player import Player
 from pypokerengine.engine.pay_info import PayInfo
+from pypokerengine.engine.table import Table
 from pypokerengine.engine.game_evaluator import GameEvaluator
 
 class SidepotTest(BaseUnitTest):
@@ -72,6 +74,49 @@ class SidepotTest(BaseUnitTest):
     self.__sidepot_check(players, pots[1], 9, ["B", "C", "D"])
     self.__sidepot_check(players, pots[2], 4, ["B", "D"])
 
+  """ A: $10(ALLIN), B: $10(ALLIN), C: $30(ALLIN), D: $40 """
+  def test_same_allin_amounts(self):
+    players = {
+        "A": self.__create_player_with_pay_info("A", 10, PayInfo.ALLIN),
+        "B": self.__create_player_with_pay_info("B", 10, PayInfo.ALLIN),
+        "C": self.__create_player_with_pay_info("C", 30, PayInfo.ALLIN),
+        "D": self.__create_player_with_pay_info("D", 40, PayInfo.PAY_TILL_END),
+    }
+    pots = GameEvaluator.create_pot(players.values())
+    self.eq(4, len(pots))
+    self.__sidepot_check(players, pots[0], 40, ["A", "B", "C", "D"])
+    self.__sidepot_check(players, pots[1], 0, ["A", "B", "C", "D"])
+    self.__sidepot_check(players, pots[2], 40, ["C", "D"])
+    self.__sidepot_check(players, pots[3], 10, ["D"])
+
+  def test_pot_structure_is_reused_for_same_pay_info(self):
+    table = self.__setup_table([("A", 5), ("B", 7)])
+    with patch.object(GameEvaluator, "_GameEvaluator__get_side_pots", wraps=GameEvaluator._GameEvaluator__get_side_pots) as get_side_pots:
+      pots = GameEvaluator.create_pot(table.seats.players, table)
+      copied = table.copy()
+      copied_pots = GameEvaluator.create_pot(copied.seats.players, copied)
+      self.eq(1, get_side_pots.call_count)
+      self.eq([pot["amount"] for pot in pots], [pot["amount"] for pot in copied_pots])
+      self.true(copied_pots[0]["eligibles"][0] is copied.seats.players[0])
+      copied.seats.players[1].pay_info.update_by_pay(3)
+      self.eq([10, 5, 0], [pot["amount"] for pot in GameEvaluator.create_pot(copied.seats.players, copied)])
+      self.eq(2, get_side_pots.call_count)
+
+  def test_pot_structure_is_kept_on_each_table(self):
+    tables = [self.__setup_table([("A", 5), ("B", 7)]), self.__setup_table([("A", 3), ("B", 9)])]
+    with patch.object(GameEvaluator, "_GameEvaluator__get_side_pots", wraps=GameEvaluator._GameEvaluator__get_side_pots) as get_side_pots:
+      for _ in range(3):
+        for table in tables:
+          GameEvaluator.create_pot(table.seats.players, table)
+      self.eq(2, get_side_pots.call_count)
+      GameEvaluator.create_pot(tables[0].seats.players)
+      self.eq(3, get_side_pots.call_count)
+
+  def __setup_table(self, pay_amounts):
+    table = Table()
+    for name, amount in pay_amounts:
+      table.seats.sitdown(self.__create_player_with_pay_info(name, amount, PayInfo.ALLIN))
+    return table
 
   def __create_player_with_pay_info(self, name, amount, status):
     player = Player("uuid", 100, name)
@@ -1,3 +1,5 @@
+import random
+
 from tests.base_unittest import BaseUnitTest
 from nose.tools import *
 
@@ -43,6 +45,13 @@ class TableTest(BaseUnitTest):
     self.eq(0, len(self.player.action_histories))
     self.eq(PayInfo.PAY_TILL_END, self.player.pay_info.status)
 
+  def test_community_card_ids(self):
+    table = Table()
+    table.add_community_card(Card.from_id(1))
+    table.add_community_card_id(40)
+    self.eq([1, 40], table.get_community_card_ids())
+    self.eq([Card.from_id(1), Card.from_id(40)], table.get_community_card())
+
   @raises(ValueError)
   def test_community_card_exceed_size(self):
     self.table.add_community_card(Card.from_id(1))
@@ -67,6 +76,15 @@ class TableTest(BaseUnitTest):
     self.eq(table._player_not_found, table.next_ask_waiting_player_pos(1))
     self.eq(table._player_not_found, table.next_ask_waiting_player_pos(2))
 
+  def test_deck_shuffled_by_table_rng(self):
+    tables = [Table(rng=random.Random(3)) for _ in range(2)]
+    for table in tables:
+      table.deck.shuffle()
+      table.reset()
+      table.deck.shuffle()
+    self.eq(tables[0].deck.deck, tables[1].deck.deck)
+    self.true(tables[0].copy().deck.rng is tables[0].deck.rng)
+
   def test_serialization(self):
     table = self.__setup_players_with_table()
     for card in table.deck.draw_cards(3):
@@ -82,6 +100,19 @@ class TableTest(BaseUnitTest):
     self.eq(1, restored.sb_pos())
     self.eq(2, restored.bb_pos())
 
+  def test_copy(self):
+    table = self.__setup_players_with_table()
+    table.add_community_card_id(3)
+    table.set_blind_pos(1, 2)
+    copied = table.copy()
+    self.eq(table.serialize(), copied.serialize())
+    copied.add_community_card_id(4)
+    copied.deck.draw_card_ids(2)
+    copied.seats.players[0].append_chip(10)
+    self.eq([3], table.get_community_card_ids())
+    self.eq(52, table.deck.size())
+    self.eq(100, table.seats.players[0].stack)
+
   def __setup_table(self):
     self.table = Table()
     for card in self.table.deck.draw_cards(5):
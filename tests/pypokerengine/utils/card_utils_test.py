@@ -1,9 +1,16 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
 import pypokerengine.utils.card_utils as U
 
 from mock import patch
+from nose.tools import raises
 from tests.base_unittest import BaseUnitTest
 from pypokerengine.engine.card import Card
 from pypokerengine.engine.deck import Deck
+from pypokerengine.engine.hand_evaluator import HandEvaluator
 
 class CardUtilsTest(BaseUnitTest):
 
@@ -19,21 +26,147 @@ class CardUtilsTest(BaseUnitTest):
         mock_return = community + [Card.from_str("D7")]
         with patch('pypokerengine.utils.card_utils._fill_community_card', side_effect=[mock_return]):
             U._montecarlo_simulation(3, my_cards, community)
-            U._fill_community_card.assert_called_with(community, used_card=my_cards+community)
+            U._fill_community_card.assert_called_with(community, used_card=my_cards+community, rng=random)
 
         mock_return = [U.gen_cards(a) for a in [["D7"], ["DK", "HK", "H8", "SA"]]]
         with patch('pypokerengine.utils.card_utils._pick_unused_card', side_effect=mock_return):
             self.eq(1, U._montecarlo_simulation(3, my_cards, community))
-            U._pick_unused_card.assert_called_with(4, Any(list))
+            U._pick_unused_card.assert_called_with(4, Any(list), random)
 
         mock_return = [U.gen_cards(a) for a in [["S7"], ["DK", "HK", "H8", "SA"]]]
         with patch('pypokerengine.utils.card_utils._pick_unused_card', side_effect=mock_return):
             self.eq(0, U._montecarlo_simulation(3, my_cards, community))
-            U._pick_unused_card.assert_called_with(4, Any(list))
+            U._pick_unused_card.assert_called_with(4, Any(list), random)
+
+    def test_estimate_hole_card_win_rate_with_seed(self):
+        hole = U.gen_cards(["SA", "HA"])
+        community = U.gen_cards(["D2", "C7", "S9"])
+        win_rate = U.estimate_hole_card_win_rate(300, 3, hole, community, rng=7)
+        self.eq(win_rate, U.estimate_hole_card_win_rate(300, 3, hole, community, rng=random.Random(7)))
+
+    def test_estimate_hole_card_win_rate_adaptive_stops_by_threshold(self):
+        with patch('pypokerengine.utils.card_utils._montecarlo_simulation', return_value=1) as simulation:
+            win_rate, interval, nb_trial = U.estimate_hole_card_win_rate_adaptive(1000, 2, U.gen_cards(["HA", "DA"]), threshold=0.5, preflop_table=False)
+            self.eq(1.0, win_rate)
+            self.eq(100, nb_trial)
+            self.eq(100, simulation.call_count)
+            self.true(0.5 < interval[0] and interval[1] == 1.0)
+
+    def test_estimate_hole_card_win_rate_adaptive_stops_by_width(self):
+        hole = U.gen_cards(["H7", "D8"])
+        community = U.gen_cards(["CA", "CK", "SQ"])
+        win_rate, (lower, upper), nb_trial = U.estimate_hole_card_win_rate_adaptive(10000, 2, hole, community, width=0.1, rng=1)
+        self.true(nb_trial < 10000)
+        self.true(upper - lower <= 0.1)
+        self.true(lower <= win_rate <= upper)
+        self.eq((win_rate, (lower, upper), nb_trial),
+                U.estimate_hole_card_win_rate_adaptive(10000, 2, hole, community, width=0.1, rng=1))
+
+    def test_estimate_hole_card_win_rate_adaptive_uses_preflop_table(self):
+        hole = U.gen_cards(["SA", "HA"])
+        win_rate = U.lookup_preflop_win_rate(3, hole)
+        with patch('pypokerengine.utils.card_utils._montecarlo_simulation', return_value=1) as simulation:
+            self.eq((win_rate, (win_rate, win_rate), 0), U.estimate_hole_card_win_rate_adaptive(1000, 3, hole))
+            self.false(simulation.called)
+            self.eq(1.0, U.estimate_hole_card_win_rate_adaptive(100, 3, hole, preflop_table=False)[0])
+
+    def test_estimate_hole_card_win_rate_adaptive_runs_up_to_max_simulation(self):
+        with patch('pypokerengine.utils.card_utils._montecarlo_simulation', side_effect=[1, 0] * 100) as simulation:
+            win_rate, _, nb_trial = U.estimate_hole_card_win_rate_adaptive(150, 2, U.gen_cards(["HA", "DA"]), threshold=0.5, preflop_table=False)
+            self.eq(0.5, round(win_rate, 1))
+            self.eq(150, nb_trial)
+
+    @unittest.skipIf(U.np is None, "numpy is not installed")
+    def test_estimate_hole_card_win_rate_adaptive_by_batch(self):
+        hole = U.gen_cards(["HA", "DA"])
+        win_rate, (lower, upper), nb_trial = U.estimate_hole_card_win_rate_adaptive(10000, 2, hole, threshold=0.5, batch=True, rng=1,
+                preflop_table=False)
+        self.eq(100, nb_trial)
+        self.true(0.5 < lower <= win_rate <= upper)
+
+    def test_estimate_hole_card_win_rate_parallel(self):
+        hole = U.gen_cards(["SA", "HA"])
+        community = U.gen_cards(["D2", "C7", "S9"])
+        single = U.estimate_hole_card_win_rate_parallel(1000, 3, hole, community, workers=1, seed=3, chunk_size=100)
+        multi = U.estimate_hole_card_win_rate_parallel(1000, 3, hole, community, workers=2, seed=3, chunk_size=100)
+        self.eq(single, multi)
+        self.true(0.68 < single < 0.80)
+
+    def test_estimate_hole_card_win_rate_follows_random_seed(self):
+        hole = U.gen_cards(["SA", "HA"])
+        community = U.gen_cards(["D2", "C7", "S9"])
+        rates = []
+        for _ in range(2):
+            random.seed(3)
+            rates.append(U.estimate_hole_card_win_rate(100, 3, hole, community))
+            rates.append(U.estimate_hole_card_win_rate_adaptive(300, 3, hole, community)[0])
+        self.eq(rates[:2], rates[2:])
+
+    def test_parallel_chunk_simulates_preflop(self):
+        hole_ids = [card.to_id() for card in U.gen_cards(["SA", "HA"])]
+        with patch('pypokerengine.utils.card_utils._montecarlo_simulation', side_effect=[1, 0, 1]) as simulation:
+            self.eq(2, U._simulate_chunk((3, 3, hole_ids, [], False, 1)))
+            self.eq(3, simulation.call_count)
+
+    @raises(ImportError)
+    def test_parallel_mode_without_concurrent_futures(self):
+        hole = U.gen_cards(["SA", "HA"])
+        with patch.dict("sys.modules", {"concurrent": None, "concurrent.futures": None}):
+            self.true(0 <= U.estimate_hole_card_win_rate(10, 2, hole) <= 1)
+            U.estimate_hole_card_win_rate_parallel(10, 2, hole, workers=3)
+
+    def test_hand_class(self):
+        self.eq("AA", U.hand_class(U.gen_cards(["SA", "HA"])))
+        self.eq("AKs", U.hand_class(U.gen_cards(["DK", "DA"])))
+        self.eq("T2o", U.hand_class(U.gen_cards(["C2", "HT"])))
+        classes = U.gen_hand_classes()
+        self.eq(169, len(set(classes)))
+        self.eq(["AA", "AKs", "AKo"], classes[:3])
+
+    def test_lookup_preflop_win_rate(self):
+        aa = U.lookup_preflop_win_rate(2, U.gen_cards(["SA", "HA"]))
+        self.true(0.8 < aa < 0.9)
+        self.true(aa > U.lookup_preflop_win_rate(2, U.gen_cards(["S7", "H2"])))
+        self.true(aa > U.lookup_preflop_win_rate(10, U.gen_cards(["SA", "HA"])))
+        self.eq(None, U.lookup_preflop_win_rate(11, U.gen_cards(["SA", "HA"])))
+
+    def test_estimate_hole_card_win_rate_uses_preflop_table(self):
+        hole = U.gen_cards(["SA", "HA"])
+        with patch('pypokerengine.utils.card_utils._montecarlo_simulation', return_value=1) as simulation:
+            self.eq(U.lookup_preflop_win_rate(3, hole), U.estimate_hole_card_win_rate(100, 3, hole))
+            self.false(simulation.called)
+            self.eq(1.0, U.estimate_hole_card_win_rate(100, 3, hole, preflop_table=False))
+            self.eq(1.0, U.estimate_hole_card_win_rate(100, 11, hole))
+
+    def test_gen_preflop_equity_table(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, "table.json")
+            table = U.gen_preflop_equity_table(10, nb_players=[2], seed=1, batch=False)
+            self.eq(["2"], list(table["win_rate"].keys()))
+            self.eq(169, len(table["win_rate"]["2"]))
+            U.save_preflop_equity_table(table, path)
+            self.eq(table, U.load_preflop_equity_table(path))
+            U.set_preflop_equity_table(table)
+            self.eq(table["win_rate"]["2"]["AA"], U.lookup_preflop_win_rate(2, U.gen_cards(["CA", "DA"])))
+            self.eq(None, U.lookup_preflop_win_rate(3, U.gen_cards(["CA", "DA"])))
+        finally:
+            U.set_preflop_equity_table(None)
+            shutil.rmtree(tmpdir)
+
+    def test_load_invalid_preflop_equity_table(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, "table.json")
+            U.save_preflop_equity_table({ "win_rate": {} }, path)
+            with self.assertRaises(ValueError):
+                U.load_preflop_equity_table(path)
+        finally:
+            shutil.rmtree(tmpdir)
 
     def test_gen_deck(self):
         deck = U.gen_deck()
-        self.eq(list(range(1, 53)), [card.to_id() for card in deck.deck])
+        self.eq(list(range(1, 53)), deck.deck)
 
     def test_gen_deck_without_some_card(self):
         expected = Deck(deck_ids=range(2, 52))
@@ -60,6 +193,162 @@ class CardUtilsTest(BaseUnitTest):
                 }
         self.eq(expected, U.evaluate_hand(hole, community))
 
+    @unittest.skipIf(U.np is None, "numpy is not installed")
+    def test_eval_hand_ids_batch(self):
+        rand = random.Random(1)
+        ids = U.np.array([rand.sample(range(1, 53), 7) for _ in range(5000)])
+        expected = [HandEvaluator.eval_hand_ids(row[:2], row[2:]) for row in ids.tolist()]
+        self.eq(expected, U.eval_hand_ids_batch(ids[:, :2], ids[:, 2:]).tolist())
+
+    @unittest.skipIf(U.np is None, "numpy is not installed")
+    def test_estimate_hole_card_win_rate_by_batch(self):
+        hole = U.gen_cards(["SA", "HA"])
+        community = U.gen_cards(["D2", "C7", "S9"])
+        win_rate = U.estimate_hole_card_win_rate(5000, 3, hole, community, batch=True, rng=1)
+        self.eq(win_rate, U.estimate_hole_card_win_rate(5000, 3, hole, community, batch=True, rng=1))
+        self.true(0.70 < win_rate < 0.78)
+        self.true(0.80 < U.estimate_hole_card_win_rate(5000, 2, hole, batch=True, rng=2, preflop_table=False) < 0.88)
+
+    @unittest.skipIf(U.np is None, "numpy is not installed")
+    def test_estimate_hole_card_win_rate_by_batch_on_river(self):
+        hole = U.gen_cards(["SA", "SK"])
+        community = U.gen_cards(["SQ", "SJ", "ST", "D2", "C3"])
+        self.eq(1.0, U.estimate_hole_card_win_rate(100, 4, hole, community, batch=True))
+
+    def test_calc_hole_card_equity_on_river(self):
+        hole = U.gen_cards(["SA", "SK"])
+        community = U.gen_cards(["SQ", "SJ", "ST", "D2", "C3"])
+        self.eq((1.0, 990), U.calc_hole_card_equity(2, hole, community))
+
+    def test_calc_hole_card_equity_split_tie(self):
+        # 3 hands (22) lose to us and 9 hands (23) tie with us on the royal flush board
+        hole = U.gen_cards(["C2", "D3"])
+        community = U.gen_cards(["SA", "SK", "SQ", "SJ", "ST"])
+        equity, nb_combination = U.calc_hole_card_equity(2, hole, community)
+        self.eq(990, nb_combination)
+        self.eq((3 + 9 * 0.5) / 990, equity)
+
+    def test_calc_hole_card_equity_multiway(self):
+        hole = U.gen_cards(["HA", "DA"])
+        community = U.gen_cards(["S2", "C7", "D9", "HK", "C4"])
+        equity, nb_combination = U.calc_hole_card_equity(3, hole, community)
+        self.eq(990 * 903 // 2, nb_combination)
+        self.true(0.79 < equity < 0.80)
+
+    def test_count_equity_combinations(self):
+        hole = U.gen_cards(["HA", "DA"])
+        self.eq(45540, U.count_equity_combinations(2, hole, U.gen_cards(["S2", "C7", "D9", "HK"])))
+        self.eq(990, U.count_equity_combinations(2, hole, U.gen_cards(["S2", "C7", "D9", "HK", "C4"])))
+        self.eq(2118760 * 990, U.count_equity_combinations(2, hole))
+
+    def test_estimate_hole_card_win_rate_exact(self):
+        hole = U.gen_cards(["HA", "DA"])
+        community = U.gen_cards(["S2", "C7", "D9", "HK", "C4"])
+        with patch('pypokerengine.utils.card_utils._montecarlo_simulation') as simulation:
+            win_rate = U.estimate_hole_card_win_rate(100, 2, hole, community, exact=True)
+            self.eq(U.calc_hole_card_equity(2, hole, community)[0], win_rate)
+            self.false(simulation.called)
+        with patch('pypokerengine.utils.card_utils._montecarlo_simulation', return_value=1) as simulation:
+            self.eq(1.0, U.estimate_hole_card_win_rate(100, 2, hole, community, exact=True, exact_budget=100))
+            self.eq(100, simulation.call_count)
+
+    def test_estimate_hole_card_win_rate_exact_fallback_splits_ties(self):
+        hole = U.gen_cards(["HA", "DA"])
+        community = U.gen_cards(["S2", "C7", "D9", "HK", "C4"])
+        with patch('pypokerengine.engine.hand_evaluator.HandEvaluator.eval_hand', return_value=0):
+            self.eq(1.0, U.estimate_hole_card_win_rate(100, 3, hole, community))
+            self.eq(0.333, round(U.estimate_hole_card_win_rate(100, 3, hole, community, exact=True, exact_budget=100), 3))
+
+    @unittest.skipIf(U.np is None, "numpy is not installed")
+    def test_estimate_hole_card_win_rate_exact_fallback_splits_ties_by_batch(self):
+        hole = U.gen_cards(["HA", "DA"])
+        community = U.gen_cards(["S2", "C7", "D9", "HK", "C4"])
+        tie_scores = lambda hole_ids, community_ids: U.np.zeros(hole_ids.shape[:-1], dtype=U.np.int64)
+        with patch('pypokerengine.utils.card_utils.eval_hand_ids_batch', side_effect=tie_scores):
+            self.eq(1.0, U.estimate_hole_card_win_rate(100, 3, hole, community, batch=True))
+            self.eq(0.333, round(U.estimate_hole_card_win_rate(100, 3, hole, community, batch=True, exact=True, exact_budget=100), 3))
+
+    def test_gen_hand_range(self):
+        self.eq(6, len(U.gen_hand_range(["AA"])))
+        self.eq(4, len(U.gen_hand_range(["AKs"])))
+        self.eq(12, len(U.gen_hand_range(["AKo"])))
+        self.eq(16, len(U.gen_hand_range(["AK"])))
+        self.eq({("CA", "CK"): 0.5, ("DA", "DK"): 0.5, ("HA", "HK"): 0.5, ("SA", "SK"): 0.5}, U.gen_hand_range(["AKs"], 0.5))
+
+    @raises(ValueError)
+    def test_gen_hand_range_with_unknown_class(self):
+        U.gen_hand_range(["A1"])
+
+    def test_calc_range_equity_exact(self):
+        community = U.gen_cards(["C2", "D7", "S9", "HK", "C4"])
+        self.eq([1.0, 0.0], U.calc_range_equity([{("SA", "HA"): 1}, {("SQ", "HQ"): 1}], community))
+        self.eq([0.5, 0.5], U.calc_range_equity([{("SA", "HA"): 1}, {("DA", "CA"): 1}], community))
+
+    def test_calc_range_equity_renormalizes_blocked_combos(self):
+        community = U.gen_cards(["C2", "D7", "S9", "HK", "C4"])
+        hand_range = {("SK", "DK"): 3, ("SQ", "HQ"): 1, ("C2", "H2"): 100}
+        self.eq([0.25, 0.75], U.calc_range_equity([{("SA", "HA"): 1}, hand_range], community))
+        hand_range = {("SK", "DK"): 3, ("SQ", "HQ"): 1, ("SA", "SJ"): 100}
+        self.eq([0.25, 0.75], U.calc_range_equity([{("SA", "HA"): 1}, hand_range], community))
+        self.eq([1.0, 0.0], U.calc_range_equity([{("SA", "HA"): 1}, hand_range], community, dead_card=U.gen_cards(["DK"])))
+
+    def test_calc_range_equity_by_simulation(self):
+        hand_ranges = [{("SA", "HA"): 1}, {("SK", "HK"): 1}]
+        equity = U.calc_range_equity(hand_ranges, nb_simulation=3000, exact_budget=0, batch=False, rng=1)
+        self.eq(1.0, round(sum(equity), 6))
+        self.true(0.78 < equity[0] < 0.86)
+        self.eq(equity, U.calc_range_equity(hand_ranges, nb_simulation=3000, exact_budget=0, batch=False, rng=1))
+
+    @unittest.skipIf(U.np is None, "numpy is not installed")
+    def test_calc_range_equity_by_batch(self):
+        community = U.gen_cards(["C2", "D7", "S9", "HQ"])
+        hand_ranges = [U.gen_hand_range(["AA", "KK"]), U.gen_hand_range(["QQ", "AK"])]
+        exact = U.calc_range_equity(hand_ranges, community, exact_budget=10 ** 6)
+        equity = U.calc_range_equity(hand_ranges, community, nb_simulation=20000, exact_budget=0, batch=True, rng=1)
+        self.eq(1.0, round(sum(equity), 6))
+        self.true(abs(exact[0] - equity[0]) < 0.02)
+
+    @raises(ValueError)
+    def test_calc_range_equity_with_incompatible_ranges(self):
+        U.calc_range_equity([{("SA", "HA"): 1}, {("SA", "HA"): 1}], nb_simulation=10, exact_budget=0, batch=False)
+
+    @raises(ValueError)
+    def test_calc_range_equity_with_blocked_range(self):
+        U.calc_range_equity([{("SA", "HA"): 1}, {("SK", "HK"): 1}], U.gen_cards(["SK", "C2", "C3"]))
+
+    def test_gen_canonical_key(self):
+        key = U.gen_canonical_key(U.gen_cards(["HA", "HK"]), U.gen_cards(["H2", "D7", "S9"]))
+        self.eq((("CA", "CK"), ("C2", "D7", "H9")), key)
+        self.eq(key, U.gen_canonical_key(U.gen_cards(["SK", "SA"]), U.gen_cards(["C9", "S2", "H7"])))
+        self.eq((("CA", "DA"), ()), U.gen_canonical_key(U.gen_cards(["SA", "HA"])))
+        self.true(key != U.gen_canonical_key(U.gen_cards(["HA", "HK"]), U.gen_cards(["D2", "D7", "S9"])))
+
+    def test_equity_cache(self):
+        cache = U.EquityCache(maxsize=2)
+        self.eq(None, cache.get("a"))
+        cache.put("a", 0.1)
+        cache.put("b", 0.2)
+        self.eq(0.1, cache.get("a"))
+        cache.put("c", 0.3)
+        self.eq(None, cache.get("b"))
+        self.eq(0.3, cache.get("c"))
+        self.eq({"hits": 2, "misses": 2, "evictions": 1, "size": 2, "maxsize": 2}, cache.stats())
+        cache.clear()
+        self.eq({"hits": 0, "misses": 0, "evictions": 0, "size": 0, "maxsize": 2}, cache.stats())
+
+    def test_estimate_hole_card_win_rate_with_cache(self):
+        cache = U.EquityCache()
+        community = U.gen_cards(["H2", "D7", "S9"])
+        with patch('pypokerengine.utils.card_utils._montecarlo_simulation', return_value=1) as simulation:
+            self.eq(1.0, U.estimate_hole_card_win_rate(10, 2, U.gen_cards(["HA", "HK"]), community, cache=cache))
+            self.eq(1.0, U.estimate_hole_card_win_rate(10, 2, U.gen_cards(["SA", "SK"]), U.gen_cards(["S2", "D7", "H9"]), cache=cache))
+            self.eq(10, simulation.call_count)
+            U.estimate_hole_card_win_rate(20, 2, U.gen_cards(["HA", "HK"]), community, cache=cache)
+            U.estimate_hole_card_win_rate(10, 3, U.gen_cards(["HA", "HK"]), community, cache=cache)
+            self.eq(40, simulation.call_count)
+        self.eq(1, cache.hits)
+        self.eq(3, cache.misses)
+
 def Any(cls):
     class Any(cls):
         def __eq__(self, other):
@@ -2,7 +2,9 @@ from nose.tools import raises
 from tests.base_unittest import BaseUnitTest
 from pypokerengine.utils.game_state_utils import restore_game_state,\
         attach_hole_card, replace_community_card,\
-        attach_hole_card_from_deck, replace_community_card_from_deck
+        attach_hole_card_from_deck, replace_community_card_from_deck, GameStateTemplate,\
+        attach_hole_cards_from_deck
+import random
 from pypokerengine.engine.card import Card
 from pypokerengine.engine.poker_constants import PokerConstants as Const
 
@@ -16,6 +18,40 @@ class GameStateUtils(BaseUnitTest):
         self.eq(44, processed2["table"].deck.size())
         self.eq(48, game_state["table"].deck.size())
 
+    def test_attach_hole_cards_from_deck(self):
+        game_state = restore_game_state(ThreePlayerGameStateSample.round_state)
+        my_hole_card = [Card.from_str(s) for s in ["CA", "S3"]]
+        processed = attach_hole_cards_from_deck(game_state, {"ruypwwoqwuwdnauiwpefsw": my_hole_card})
+        players = processed["table"].seats.players
+        self.eq(my_hole_card, players[0].hole_card)
+        self.eq([2, 2], [len(player.hole_card) for player in players[1:]])
+        self.eq(42, processed["table"].deck.size())
+        dealt_ids = processed["table"]._community_card + processed["table"].deck.deck
+        for player in players:
+            dealt_ids += player.hole_card_ids
+        self.eq(list(range(1, 53)), sorted(dealt_ids))
+        self.eq([], game_state["table"].seats.players[1].hole_card)
+        self.eq(48, game_state["table"].deck.size())
+
+    def test_attach_hole_cards_from_deck_with_community_card(self):
+        game_state = restore_game_state(ThreePlayerGameStateSample.round_state)
+        processed = attach_hole_cards_from_deck(game_state, fill_community_card=True, rng=random.Random(1))
+        self.eq(5, len(processed["table"].get_community_card()))
+        self.eq(['HJ', 'C8', 'D2', 'H4'], [str(card) for card in processed["table"].get_community_card()[:4]])
+        self.eq(41, processed["table"].deck.size())
+        self.eq(4, len(game_state["table"].get_community_card()))
+
+    def test_attach_hole_cards_from_deck_with_same_rng_seed(self):
+        game_state = restore_game_state(TwoPlayerSample.round_state)
+        processed1 = attach_hole_cards_from_deck(game_state, rng=random.Random(3))
+        processed2 = attach_hole_cards_from_deck(game_state, rng=random.Random(3))
+        self.eq(processed1["table"].serialize(), processed2["table"].serialize())
+
+    @raises(Exception)
+    def test_attach_hole_cards_from_deck_when_uuid_is_wrong(self):
+        game_state = restore_game_state(TwoPlayerSample.round_state)
+        attach_hole_cards_from_deck(game_state, {"hoge": [Card.from_str("CA"), Card.from_str("S3")]})
+
     def test_replace_community_card_from_deck(self):
         origianl = restore_game_state(TwoPlayerSample.round_state)
 
@@ -116,6 +152,18 @@ class GameStateUtils(BaseUnitTest):
         self.eq(40, players[0].pay_info.amount)
         self.eq(25, players[1].pay_info.amount)
 
+    def test_game_state_template(self):
+        template = GameStateTemplate(ThreePlayerGameStateSample.round_state)
+        restored = restore_game_state(ThreePlayerGameStateSample.round_state)
+        game_state = template.new_game_state()
+        self.eq(restored["table"].serialize(), game_state["table"].serialize())
+        game_state["table"].deck.shuffle()
+        game_state = attach_hole_card_from_deck(game_state, "ruypwwoqwuwdnauiwpefsw")
+        game_state["table"].seats.players[0].pay_info.update_by_pay(10)
+        fresh = template.new_game_state()
+        self.eq(restored["table"].serialize(), fresh["table"].serialize())
+        self.eq(60, fresh["table"].seats.players[0].pay_info.amount)
+
     def _assert_player(self, expected_data, player):
         self.eq(expected_data[0], player.name)
         self.eq(expected_data[1], player.uuid)
@@ -130,7 +178,7 @@ class GameStateUtils(BaseUnitTest):
     def _assert_deck(self, deck, exclude_cards):
         self.eq(52-len(exclude_cards), deck.size())
         for card in exclude_cards:
-            self.assertNotIn(card, deck.deck)
+            self.assertNotIn(card.to_id(), deck.deck)
 
 class TwoPlayerSample:
     valid_actions = [{'action': 'fold', 'amount': 0}, {'action': 'call', 'amount': 15}, {'action': 'raise', 'amount': {'max': 80, 'min': 30}}]
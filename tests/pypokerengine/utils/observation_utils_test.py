@@ -0,0 +1,87 @@
+import unittest
+from collections import OrderedDict
+
+from nose.tools import raises
+from tests.base_unittest import BaseUnitTest
+from tests.pypokerengine.utils.game_state_utils_test import TwoPlayerSample
+import pypokerengine.utils.observation_utils as O
+from pypokerengine.api.emulator import Emulator
+from pypokerengine.utils.game_state_utils import restore_game_state, attach_hole_card
+from pypokerengine.utils.card_utils import gen_cards
+
+@unittest.skipIf(O.np is None, "numpy is not installed")
+class ObservationUtilsTest(BaseUnitTest):
+
+    def test_encode_round_state(self):
+        obs = O.encode_round_state(TwoPlayerSample.round_state, TwoPlayerSample.hole_card)
+        self.eq(2, obs["street"])
+        self.eq(1, obs["player"])
+        self.eq(0, obs["dealer_btn"])
+        self.eq(5, obs["small_blind"])
+        self.eq(55, obs["pot"])
+        self.eq([65, 80], obs["stacks"].tolist())
+        self.eq([35, 20], obs["paid"].tolist())
+        self.eq([0, 0], obs["status"].tolist())
+        self.eq([1, 42], obs["hole_cards"].tolist())
+        self.eq([18, 22, 32, 13, 0], obs["board"].tolist())
+
+    def test_encode_round_state_with_padding(self):
+        obs = O.encode_round_state(TwoPlayerSample.round_state, nb_player=4)
+        self.eq([65, 80, 0, 0], obs["stacks"].tolist())
+        self.eq([0, 0, 2, 2], obs["status"].tolist())
+        self.eq([0, 0], obs["hole_cards"].tolist())
+
+    def test_encode_game_state_agrees_with_round_state(self):
+        game_state = restore_game_state(TwoPlayerSample.round_state)
+        uuid = TwoPlayerSample.round_state["seats"][1]["uuid"]
+        game_state = attach_hole_card(game_state, uuid, gen_cards(TwoPlayerSample.hole_card))
+        expected = O.encode_round_states([TwoPlayerSample.round_state], 2, [TwoPlayerSample.hole_card])
+        encoded = O.encode_game_states([game_state], 2)
+        self.eq(O.flatten_observations(expected).tolist(), O.flatten_observations(encoded).tolist())
+        self.eq(35, O.encode_game_state(game_state)["paid"][0])
+
+    def test_encode_game_states_into_out(self):
+        game_state = restore_game_state(TwoPlayerSample.round_state)
+        out = O.np.zeros(3, dtype=O.observation_dtype(3))
+        encoded = O.encode_game_states([game_state, game_state], 3, player_pos=0, out=out)
+        self.true(encoded is out)
+        self.eq([0, 0, 0], out["player"].tolist())
+        self.eq([[65, 80, 0]] * 2 + [[0, 0, 0]], out["stacks"].tolist())
+
+    def test_encode_finished_round(self):
+        emulator = Emulator(seed=2)
+        emulator.set_game_rule(2, 1, 5, 0)
+        players_info = OrderedDict([
+            ("uuid-1", { "name": "p1", "stack": 100 }),
+            ("uuid-2", { "name": "p2", "stack": 100 })
+            ])
+        game_state, _ = emulator.start_new_round(emulator.generate_initial_game_state(players_info))
+        game_state, _ = emulator.apply_action(game_state, "raise", 100)
+        game_state, events = emulator.apply_action(game_state, "call", 100)
+        self.eq("not_found", game_state["next_player"])
+        round_state = events[-2]["round_state"]
+        self.eq("not_found", round_state["next_player"])
+        game_obs = O.encode_game_state(game_state)
+        round_obs = O.encode_round_state(round_state, ["CA", "S3"])
+        self.eq([5, 4], [game_obs["street"], round_obs["street"]])
+        for obs in [game_obs, round_obs]:
+            self.eq(-1, obs["player"])
+            self.eq([0, 0], obs["hole_cards"].tolist())
+            self.eq(200, sum(obs["stacks"].tolist()))
+
+    def test_flatten_observations(self):
+        obs = O.encode_round_states([TwoPlayerSample.round_state] * 2, 2, [TwoPlayerSample.hole_card, None])
+        flat = O.flatten_observations(obs)
+        self.eq((2, O.observation_width(2)), flat.shape)
+        self.eq("float32", flat.dtype.name)
+        self.eq([2, 1, 0, 5, 55, 65, 80, 35, 20, 0, 0, 1, 42, 18, 22, 32, 13, 0], flat[0].tolist())
+        self.eq([0, 0], flat[1, 11:13].tolist())
+
+    @raises(ValueError)
+    def test_too_many_seats(self):
+        O.encode_round_state(TwoPlayerSample.round_state, nb_player=1)
+
+    @raises(ValueError)
+    def test_too_small_out(self):
+        out = O.np.zeros(1, dtype=O.observation_dtype(2))
+        O.encode_round_states([TwoPlayerSample.round_state] * 2, 2, out=out)